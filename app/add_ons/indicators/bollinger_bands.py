@@ -1,6 +1,11 @@
+import copy
+
+import numpy as np
 import pyqtgraph as pg
 
 from utils.indicators_utils import Indicator, InputField, ChoiceField
+from libs.engine.indicators import get_bands
+from utils.rolling import RollingWindowState
 
 
 class BollingerBands(Indicator):
@@ -9,8 +14,11 @@ class BollingerBands(Indicator):
 
         self.name = "Bollinger Bands"
         self.description = ""
+        self.strategy_name = "bollinger"
+        self.strategy_fields = {"Length": "window"}
 
         self.g_filler = None
+        self._band_plots = None
 
         # Define and register all customisable settings
         field_input = ChoiceField(
@@ -32,30 +40,66 @@ class BollingerBands(Indicator):
             field_filler,
         )
 
-    def create_indicator(self, graph_view, *args, **kwargs):
-        super(BollingerBands, self).create_indicator(graph_view)
+    @classmethod
+    def compute(cls, values, parameters):
+        source = values[parameters["Input"]]
 
-        # Get values
-        values = graph_view.values
+        # Calculate, the last bar may change until the close, it is not
+        # kept in the state
+        committed = max(len(source) - 1, 0)
+        state = RollingWindowState(window=parameters["Length"])
+        middler, upper, lower = get_bands(
+            *state.update(source, commit=committed)
+        )
+        return {
+            "middle": middler,
+            "upper": upper,
+            "lower": lower,
+            "state": state,
+            "committed": committed,
+        }
+
+    @classmethod
+    def compute_update(cls, values, parameters, previous):
+        source = values[parameters["Input"]]
+
+        # Calculate the bars which are not in the state
+        committed = previous["committed"]
+        commit = max(len(source) - 1, 0)
+        state = copy.deepcopy(previous["state"])
+        bands = get_bands(*state.update(source, commit=commit))
+        results = {
+            name: np.concatenate((previous[name][:committed], band))
+            for name, band in zip(("middle", "upper", "lower"), bands)
+        }
+        results.update(state=state, committed=committed + commit)
+        return results
+
+    def render(self, graph_view, results):
+        if self._band_plots is None:
+            self._create_plots(graph_view)
+
+        # Draw or extend the plots, the filler follows the upper and lower
+        # plots
+        for plot, name in zip(self._band_plots, ("middle", "upper", "lower")):
+            plot.setData(x=graph_view.dataset.x, y=results[name])
+
+    def _create_plots(self, graph_view):
+        """Create the plots of the bands on the quotation
+
+        :param graph_view: The graph view
+        :type graph_view: GraphView
+        """
         quotation_plot = graph_view.g_quotation
 
         # Retrive settings
-        field_input = self.get_field("Input")
-        field_length = self.get_field("Length")
         field_middle = self.get_field("Middle")
         field_upper = self.get_field("Upper")
         field_lower = self.get_field("Lower")
         field_filler = self.get_field("Fill Between")
 
-        # Calculate
-        middler, upper, lower = bollinger_bands(
-            values, window=field_length.value, source=field_input.current
-        )
-
         # Create plots
         middler_plot = quotation_plot.plot(
-            x=[x.timestamp() for x in values.index],
-            y=middler,
             pen=pg.mkPen(
                 color=field_middle.color,
                 width=field_middle.width,
@@ -64,8 +108,6 @@ class BollingerBands(Indicator):
         )
 
         upper_plot = quotation_plot.plot(
-            x=[x.timestamp() for x in values.index],
-            y=upper,
             pen=pg.mkPen(
                 color=field_upper.color,
                 width=field_upper.width,
@@ -74,8 +116,6 @@ class BollingerBands(Indicator):
         )
 
         lower_plot = quotation_plot.plot(
-            x=[x.timestamp() for x in values.index],
-            y=lower,
             pen=pg.mkPen(
                 color=field_lower.color,
                 width=field_lower.width,
@@ -93,18 +133,11 @@ class BollingerBands(Indicator):
 
         # Register all plots in order to delete them later
         self.register_plots(lower_plot, middler_plot, upper_plot)
+        self._band_plots = (middler_plot, upper_plot, lower_plot)
 
     def remove_indicator(self, graph_view, *args, **kwargs):
         super(BollingerBands, self).remove_indicator(graph_view)
-        self.g_filler.setBrush(None)
+        if self.g_filler is not None:
+            self.g_filler.setBrush(None)
         self.g_filler = None
-
-
-def bollinger_bands(values, window=20, source="Close"):
-    middle_band = values[source].rolling(window=window).mean()
-    standard_deviation = values[source].rolling(window=window).std()
-
-    upper_band = middle_band + standard_deviation * 2
-    lower_band = middle_band - standard_deviation * 2
-
-    return middle_band.values, upper_band.values, lower_band.values
+        self._band_plots = None
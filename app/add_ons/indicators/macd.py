@@ -1,7 +1,10 @@
+import copy
+
 import numpy as np
 import pyqtgraph as pg
 
 from libs.graph.bargraph import BarGraphItem
+from libs.engine.indicators import MacdState, buy_sell_macd, get_last_side
 from utils.indicators_utils import Indicator, InputField, ChoiceField
 
 from PySide2 import QtCore, QtGui
@@ -13,8 +16,17 @@ class MACD(Indicator):
 
         self.name = "MACD"
         self.description = ""
+        self.strategy_name = "macd"
+        self.strategy_fields = {
+            "EMA": "w_ema",
+            "EMA Low": "w_low",
+            "EMA Fast": "w_fast",
+        }
 
         self.g_macd = None
+        self._bars = None
+        self._line_plots = None
+        self._signal_plots = None
 
         # Define and register all customisable settings
         field_input = ChoiceField(
@@ -54,13 +66,107 @@ class MACD(Indicator):
             field_sell,
         )
 
-    def create_indicator(self, graph_view, *args, **kwargs):
-        super(MACD, self).create_indicator(self, graph_view)
-
-        # Get values
-        values = graph_view.values
-        self.quotation_plot = graph_view.g_quotation
-
+    @classmethod
+    def compute(cls, values, parameters):
+        source = values[parameters["Input"]]
+        close = values["Close"]
+
+        # Calculations, the last bar may change until the close, it is not
+        # kept in the states
+        committed = max(len(source) - 1, 0)
+        state = cls._create_state(parameters)
+        macd, ema = state.update(source, commit=committed)
+
+        # The strategy is computed on the close whatever the input
+        strategy_state = cls._create_state(parameters)
+        strategy_macd, signal = strategy_state.update(close, commit=committed)
+        buy, sell = buy_sell_macd(
+            {"Close": close, "MACD": strategy_macd, "Signal": signal}
+        )
+        return {
+            "ema": ema,
+            "macd": macd,
+            "histogram": macd - ema,
+            "strategy_macd": strategy_macd,
+            "signal": signal,
+            "buy": buy,
+            "sell": sell,
+            "state": state,
+            "strategy_state": strategy_state,
+            "committed": committed,
+        }
+
+    @classmethod
+    def compute_update(cls, values, parameters, previous):
+        source = values[parameters["Input"]]
+        close = values["Close"]
+
+        # Calculate the bars which are not in the states
+        committed = previous["committed"]
+        commit = max(len(source) - 1, 0)
+        state = copy.deepcopy(previous["state"])
+        macd, ema = state.update(source, commit=commit)
+        strategy_state = copy.deepcopy(previous["strategy_state"])
+        strategy_macd, signal = strategy_state.update(close, commit=commit)
+
+        # A crossover depends on the side of the MACD before the new bars
+        buy, sell = buy_sell_macd(
+            {"Close": close, "MACD": strategy_macd, "Signal": signal},
+            previous=get_last_side(
+                previous["strategy_macd"][:committed],
+                previous["signal"][:committed],
+            ),
+        )
+        news = {
+            "ema": ema,
+            "macd": macd,
+            "histogram": macd - ema,
+            "strategy_macd": strategy_macd,
+            "signal": signal,
+            "buy": buy,
+            "sell": sell,
+        }
+        results = {
+            name: np.concatenate((previous[name][:committed], new))
+            for name, new in news.items()
+        }
+        results.update(
+            state=state,
+            strategy_state=strategy_state,
+            committed=committed + commit,
+        )
+        return results
+
+    def render(self, graph_view, results):
+        x = graph_view.dataset.x
+        if self.g_macd is None:
+            self._create_plots(graph_view)
+
+        # Draw or extend the plots
+        if self._bars is None:
+            field_up = self.get_field("Upper")
+            field_low = self.get_field("Lower")
+            self._bars = BarGraphItem(
+                x=x,
+                height=results["histogram"],
+                up_color=field_up.color,
+                down_color=field_low.color,
+            )
+            self.g_macd.addItem(self._bars)
+        else:
+            self._bars.set_data(x=x, height=results["histogram"])
+        for plot, name in zip(self._line_plots, ("ema", "macd")):
+            plot.setData(x=x, y=results[name])
+        for plot, name in zip(self._signal_plots, ("buy", "sell")):
+            plot.setData(x=x, y=results[name])
+
+    def _create_plots(self, graph_view):
+        """Create the plot of the MACD, below the quotation, and the plots
+        of the strategy on the quotation
+
+        :param graph_view: The graph view
+        :type graph_view: GraphView
+        """
         # Init plot
         self.g_macd = graph_view.addPlot(
             row=2, col=0, width=1, title="<b>{name}</b>".format(name=self.name)
@@ -70,93 +176,72 @@ class MACD(Indicator):
         self.g_macd.setXLink("Quotation")
 
         # Retrive settings
-        field_input = self.get_field("Input")
-        field_up = self.get_field("Upper")
-        field_low = self.get_field("Lower")
         field_ema = self.get_field("EMA")
         field_macd = self.get_field("MACD")
-        field_emaslow = self.get_field("EMA Low")
-        field_emafast = self.get_field("EMA Fast")
-
-        # Calculations
-        macd_line, signal_line, macd = get_macd(
-            values=values[field_input.current].values,
-            w_low=field_emaslow.value,
-            w_fast=field_emafast.value,
-        )
-        ema = exp_moving_average(macd, w=field_ema.value)
-        macd_bar = macd - ema
-
-        bars = BarGraphItem(
-            x=[x.timestamp() for x in values.index],
-            height=macd_bar,
-            up_color=field_up.color,
-            down_color=field_low.color,
-        )
-        self.g_macd.addItem(bars)
 
-        self.g_macd.plot(
-            x=[x.timestamp() for x in values.index],
-            y=ema,
+        ema_plot = self.g_macd.plot(
             pen=pg.mkPen(
                 field_ema.color,
                 width=field_ema.width,
                 style=field_ema.line_style,
             ),
         )
-        self.g_macd.plot(
-            x=[x.timestamp() for x in values.index],
-            y=macd,
+        macd_plot = self.g_macd.plot(
             pen=pg.mkPen(
                 field_macd.color,
                 width=field_macd.width,
                 style=field_macd.line_style,
             ),
         )
+        self._line_plots = (ema_plot, macd_plot)
         self.set_time_x_axis(self.g_macd)
 
         # Draw MACD stategy
-        self.strat_macd(values)
+        self.strat_macd(graph_view.g_quotation)
 
     def remove_indicator(self, graph_view, *args, **kwargs):
         super(MACD, self).remove_indicator(graph_view)
-        graph_view.removeItem(self.g_macd)
+        if self.g_macd is not None:
+            graph_view.removeItem(self.g_macd)
         self.g_macd = None
+        self._bars = None
+        self._line_plots = None
+        self._signal_plots = None
+
+    @staticmethod
+    def _create_state(parameters):
+        """Create the streaming state of a MACD with the given settings
+
+        :param parameters: The values of the fields
+        :type parameters: dict
+        :return: The state
+        :rtype: MacdState
+        """
+        return MacdState(
+            w_ema=parameters["EMA"],
+            w_low=parameters["EMA Low"],
+            w_fast=parameters["EMA Fast"],
+        )
 
-    def strat_macd(self, values):
-        """Draw the strategy on the quotation plot
+    def strat_macd(self, quotation_plot):
+        """Create the plots of the strategy on the quotation plot
 
-        :param values: values from the graph
-        :type values: pd.Dataframe
+        :param quotation_plot: The quotation plot
+        :type quotation_plot: pg.PlotItem
         """
         # Retrive settings
         field_buy = self.get_field("Buy indicator")
         field_sell = self.get_field("Sell indicator")
-        field_emaslow = self.get_field("EMA Low")
-        field_emafast = self.get_field("EMA Fast")
-        field_ema = self.get_field("EMA")
-
-        # Calculations
-        buy_sell = MACD_strategy(
-            values=values,
-            w_ema=field_ema.value,
-            w_low=field_emaslow.value,
-            w_fast=field_emafast.value,
-        )
 
         # Draw plots
-        buy_plot = self.quotation_plot.plot(
-            x=[x.timestamp() for x in values.index],
-            y=buy_sell["Buy"],
+        buy_plot = quotation_plot.plot(
             pen=None,
             symbolBrush=field_buy.color,
             symbol="t",
             symbolSize=field_buy.width,
             name="sell",
         )
-        sell_plot = self.quotation_plot.plot(
-            x=[x.timestamp() for x in values.index],
-            y=buy_sell["Sell"],
+        sell_plot = quotation_plot.plot(
             pen=None,
             symbolBrush=field_sell.color,
             symbol="t1",
@@ -166,6 +251,7 @@ class MACD(Indicator):
 
         # Registers plots in order to delete them later
         self.register_plots(buy_plot, sell_plot)
+        self._signal_plots = (buy_plot, sell_plot)
 
     def set_time_x_axis(self, widget):
         """Set the time on the X axis
@@ -174,65 +260,3 @@ class MACD(Indicator):
         :type widget: Plot
         """
         widget.setAxisItems({"bottom": pg.DateAxisItem(orientation="bottom")})
-
-
-def exp_moving_average(values, w):
-    weights = np.exp(np.linspace(-1.0, 0.0, w))
-    weights /= weights.sum()
-    a = np.convolve(values, weights, mode="full")[: len(values)]
-    a[:w] = a[w]
-    return a
-
-
-def get_macd(values, w_low=12, w_fast=26):
-    emaslow = exp_moving_average(values, w=w_low)
-    emafast = exp_moving_average(values, w=w_fast)
-    return emaslow, emafast, emaslow - emafast
-
-
-def MACD_strategy(values, w_ema=9, w_low=12, w_fast=26):
-    short_EMA = exp_moving_average(values["Close"], w=w_low)
-    long_EMA = exp_moving_average(values["Close"], w=w_fast)
-    macd = short_EMA - long_EMA
-    signal = exp_moving_average(macd, w=w_ema)
-    values["MACD"] = macd
-    values["Signal"] = signal
-    retournement = buy_sell_macd(values)
-    values["Buy"] = retournement[0]
-    values["Sell"] = retournement[1]
-    return values
-
-
-def buy_sell_macd(values, offset=0.01):
-    offset_up = 1 + offset
-    offset_down = 1 - offset
-    buy = []
-    sell = []
-    # if 2 lines cross Flag change
-    flag = -1
-    ema200 = values["Close"].ewm(com=200).mean()
-
-    for i in range(0, len(values)):
-        if (
-            values["MACD"][i] > values["Signal"][i]
-        ):  # and values['close'][i] > ema200[i]:
-            sell.append(np.nan)
-            if flag != 1:
-                buy.append(values["Close"][i] * offset_up)
-                flag = 1
-            else:
-                buy.append(np.nan)
-
-        elif (
-            values["MACD"][i] < values["Signal"][i]
-        ):  # and values['close'][i] < ema200[i]:
-            buy.append(np.nan)
-            if flag != 0:
-                sell.append(values["Close"][i] * offset_down)
-                flag = 0
-            else:
-                sell.append(np.nan)
-        else:
-            buy.append(np.nan)
-            sell.append(np.nan)
-    return (buy, sell)
@@ -1,7 +1,10 @@
+import copy
+
 import numpy as np
 import pyqtgraph as pg
 
 from utils.indicators_utils import Indicator, InputField, ChoiceField
+from utils.rolling import EwmState
 
 
 class MMA(Indicator):
@@ -10,6 +13,10 @@ class MMA(Indicator):
 
         self.name = "Moving Average (3, 5, 8, 10, 12, 15)"
         self.description = "Multiple Moving Average (MMA)"
+        self.strategy_name = "mma"
+        self.strategy_fields = {"Trader MMA 1": "fast", "Trader MMA 6": "slow"}
+
+        self._average_plots = None
 
         # Define and register all customisable settings
         field_input = ChoiceField(
@@ -36,30 +43,20 @@ class MMA(Indicator):
         )
         self.register_fields(line1, line2, line3, line4, line5, line6)
 
-    def create_indicator(self, graph_view, *args, **kwargs):
-        super(MMA, self).create_indicator(self, graph_view)
+    @classmethod
+    def compute(cls, values, parameters):
+        return compute_moving_averages(values, parameters)
 
-        # Get values
-        values = graph_view.values
-        quotation_plot = graph_view.g_quotation
+    @classmethod
+    def compute_update(cls, values, parameters, previous):
+        return update_moving_averages(values, parameters, previous)
 
-        # Get field
-        field_input = self.get_field("Input")
+    def render(self, graph_view, results):
+        render_moving_averages(self, graph_view, results)
 
-        for field in self.fields:
-            if not isinstance(field, InputField):
-                # Escape ChoiceFields
-                continue
-            mva = values[field_input.current].ewm(com=field.value).mean()
-            plot = quotation_plot.plot(
-                x=[x.timestamp() for x in values.index],
-                y=mva,
-                connect="finite",
-                pen=pg.mkPen(
-                    field.color, width=field.width, style=field.line_style
-                ),
-            )
-            self.register_plot(plot=plot)
+    def remove_indicator(self, graph_view, *args, **kwargs):
+        super(MMA, self).remove_indicator(graph_view)
+        self._average_plots = None
 
 
 class GuppyMMA(Indicator):
@@ -68,6 +65,13 @@ class GuppyMMA(Indicator):
 
         self.name = "Guppy (3, 5, 8, 10, 12, 15) and (30, 35, 40, 45, 50, 60)"
         self.description = "Guppy Multiple Moving Average (GMMA)"
+        self.strategy_name = "mma"
+        self.strategy_fields = {
+            "Trader EMA 1": "fast",
+            "Investor EMA 1": "slow",
+        }
+
+        self._average_plots = None
 
         # Define and register all customisable settings
         field_input = ChoiceField(
@@ -114,31 +118,113 @@ class GuppyMMA(Indicator):
         )
         self.register_fields(line7, line8, line9, line10, line11, line12)
 
-    def create_indicator(self, graph_view, *args, **kwargs):
-        super(GuppyMMA, self).create_indicator(self, graph_view)
+    @classmethod
+    def compute(cls, values, parameters):
+        # TODO need pass this to EMA instead of MMA
+        return compute_moving_averages(values, parameters)
+
+    @classmethod
+    def compute_update(cls, values, parameters, previous):
+        return update_moving_averages(values, parameters, previous)
+
+    def render(self, graph_view, results):
+        render_moving_averages(self, graph_view, results)
+
+    def remove_indicator(self, graph_view, *args, **kwargs):
+        super(GuppyMMA, self).remove_indicator(graph_view)
+        self._average_plots = None
 
-        # Get values
-        values = graph_view.values
-        quotation_plot = graph_view.g_quotation
 
-        # Get field
-        field_input = self.get_field("Input")
+def compute_moving_averages(values, parameters):
+    """Compute the moving average of each InputField of the indicator, the
+    state of each average is kept for the next updates
 
-        for field in self.fields:
+    :param values: The columns of the quotation
+    :type values: dict of np.array
+    :param parameters: The values of the fields, the center of mass of each
+    average by the name of its field
+    :type parameters: dict
+    :return: The averages, one row per field, and their states
+    :rtype: dict
+    """
+    source = values[parameters["Input"]]
+    # The last bar may change until the close, it is not kept in states
+    committed = max(len(source) - 1, 0)
+
+    states = []
+    averages = []
+    for name, com in parameters.items():
+        if name == "Input":
+            # Escape ChoiceFields
+            continue
+        state = EwmState(com=com)
+        averages.append(state.update(source, commit=committed))
+        states.append(state)
+    return {
+        "averages": np.array(averages).reshape(len(averages), len(source)),
+        "states": states,
+        "committed": committed,
+    }
+
+
+def update_moving_averages(values, parameters, previous):
+    """Compute the moving averages for the bars which are not in their
+    states
+
+    :param values: The columns of the quotation, from the committed position
+    :type values: dict of np.array
+    :param parameters: The values of the fields
+    :type parameters: dict
+    :param previous: The results of the previous compute
+    :type previous: dict
+    :return: The averages, one row per field, and their states
+    :rtype: dict
+    """
+    source = values[parameters["Input"]]
+    committed = previous["committed"]
+    commit = max(len(source) - 1, 0)
+
+    states = copy.deepcopy(previous["states"])
+    averages = [state.update(source, commit=commit) for state in states]
+    averages = np.array(averages).reshape(len(states), len(source))
+    return {
+        "averages": np.concatenate(
+            (previous["averages"][:, :committed], averages), axis=1
+        ),
+        "states": states,
+        "committed": committed + commit,
+    }
+
+
+def render_moving_averages(indicator, graph_view, results):
+    """Draw the moving average of each InputField of the indicator, or
+    extend the plots with setData
+
+    :param indicator: The indicator
+    :type indicator: MMA or GuppyMMA
+    :param graph_view: The graph view
+    :type graph_view: GraphView
+    :param results: The results of compute_moving_averages
+    :type results: dict
+    """
+    if indicator._average_plots is None:
+        indicator._average_plots = []
+        for field in indicator.fields:
             if not isinstance(field, InputField):
                 # Escape ChoiceFields
                 continue
-            # TODO need pass this to EMA instead of MMA
-            mva = values[field_input.current].ewm(com=field.value).mean()
-            plot = quotation_plot.plot(
-                x=[x.timestamp() for x in values.index],
-                y=mva,
+            plot = graph_view.g_quotation.plot(
                 connect="finite",
                 pen=pg.mkPen(
                     field.color, width=field.width, style=field.line_style
                 ),
             )
-            self.register_plot(plot=plot)
+            indicator.register_plot(plot=plot)
+            indicator._average_plots.append(plot)
+
+    x = graph_view.dataset.x
+    for plot, mva in zip(indicator._average_plots, results["averages"]):
+        plot.setData(x=x, y=mva)
 
 
 def rolling_mean(values, length):
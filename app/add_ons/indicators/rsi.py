@@ -1,9 +1,12 @@
+import copy
+
+import numpy as np
 import pyqtgraph as pg
-import pandas as pd
 
 from PySide2 import QtCore
 
 from utils.indicators_utils import Indicator, InputField, ChoiceField
+from libs.engine.indicators import RsiState
 
 
 class RSI(Indicator):
@@ -12,8 +15,11 @@ class RSI(Indicator):
 
         self.name = "RSI"
         self.description = "RSI 14d (Relative Strength Index 14 days)"
+        self.strategy_name = "rsi"
+        self.strategy_fields = {"RSI": "length"}
 
         self.g_rsi = None
+        self._rsi_plot = None
 
         # Define and register all customisable settings
         field_input = ChoiceField(
@@ -30,24 +36,50 @@ class RSI(Indicator):
         )
         self.register_fields(field_input, field_up, field_down, field_rsi)
 
-    def create_indicator(self, graph_view, *args, **kwargs):
-        super(RSI, self).create_indicator(graph_view)
-
-        # Get values
-        values = graph_view.values
-        quotation_plot = graph_view.g_quotation
-
+    @classmethod
+    def compute(cls, values, parameters):
+        source = values[parameters["Input"]]
+
+        # The last bar may change until the close, it is not kept in the
+        # state
+        committed = max(len(source) - 1, 0)
+        state = RsiState(length=parameters["RSI"])
+        rsi = state.update(source, commit=committed)
+        return {"rsi": rsi, "state": state, "committed": committed}
+
+    @classmethod
+    def compute_update(cls, values, parameters, previous):
+        source = values[parameters["Input"]]
+
+        # Calculation of the bars which are not in the state
+        committed = previous["committed"]
+        commit = max(len(source) - 1, 0)
+        state = copy.deepcopy(previous["state"])
+        rsi = state.update(source, commit=commit)
+        return {
+            "rsi": np.concatenate((previous["rsi"][:committed], rsi)),
+            "state": state,
+            "committed": committed + commit,
+        }
+
+    def render(self, graph_view, results):
+        if self.g_rsi is None:
+            self._create_plots(graph_view)
+
+        # Draw or extend the plot
+        self._rsi_plot.setData(x=graph_view.dataset.x, y=results["rsi"])
+
+    def _create_plots(self, graph_view):
+        """Create the plot of the RSI, below the quotation
+
+        :param graph_view: The graph view
+        :type graph_view: GraphView
+        """
         # Retrive settings
-        field_input = self.get_field("Input")
         field_up = self.get_field("Up")
         field_down = self.get_field("Down")
         field_rsi = self.get_field("RSI")
 
-        # Calculation
-        rsi = get_rsi(
-            values=values[field_input.current].values, length=field_rsi.value
-        )
-
         # Draw plots
         self.g_rsi = graph_view.addPlot(
             row=1, col=0, width=1, title="<b>{name}</b>".format(name=self.name)
@@ -56,9 +88,7 @@ class RSI(Indicator):
         self.g_rsi.setMaximumHeight(150)
         self.g_rsi.setXLink("Quotation")
 
-        plot = self.g_rsi.plot(
-            x=[x.timestamp() for x in values.index],
-            y=rsi,
+        self._rsi_plot = self.g_rsi.plot(
             connect="finite",
             pen=pg.mkPen(
                 field_rsi.color,
@@ -68,13 +98,13 @@ class RSI(Indicator):
         )
 
         # Draw overbought and oversold
-        line_up = self.g_rsi.addLine(
+        self.g_rsi.addLine(
             y=70,
             pen=pg.mkPen(
                 field_up.color, width=field_up.width, style=field_up.line_style
             ),
         )
-        line_down = self.g_rsi.addLine(
+        self.g_rsi.addLine(
             y=30,
             pen=pg.mkPen(
                 field_down.color,
@@ -86,8 +116,10 @@ class RSI(Indicator):
 
     def remove_indicator(self, graph_view, *args, **kwargs):
         super(RSI, self).remove_indicator(graph_view)
-        graph_view.removeItem(self.g_rsi)
+        if self.g_rsi is not None:
+            graph_view.removeItem(self.g_rsi)
         self.g_rsi = None
+        self._rsi_plot = None
 
     def set_time_x_axis(self, widget):
         """Set the time on the X axis
@@ -96,14 +128,3 @@ class RSI(Indicator):
         :type widget: Plot
         """
         widget.setAxisItems({"bottom": pg.DateAxisItem(orientation="bottom")})
-
-
-def get_rsi(values, length=14):
-    """Relative strength index"""
-    # Approximate; good enough
-    gain = pd.Series(values).diff()
-    loss = gain.copy()
-    gain[gain < 0] = 0
-    loss[loss > 0] = 0
-    rs = gain.ewm(length).mean() / loss.abs().ewm(length).mean()
-    return (100 - 100 / (1 + rs)).to_numpy()
@@ -1,146 +1,42 @@
 import pyqtgraph as pg
 import numpy as np
-from pprint import pprint
-from scipy import signal
-from statistics import mean
 
-from libs.indicators_widget import Indicator
+from libs.engine.indicators import get_resistances, get_supports
+from utils.indicators_utils import Indicator
 
 
 class Support_Resistances(Indicator):
+
+    inputs = ("Close",)
+
     def __init__(self):
         super(Support_Resistances, self).__init__()
 
         self.name = "Support & Resistances"
         self.description = ""
 
-    def create_indicator(self, graph_view, *args, **kwargs):
-        # Get values
-        values = graph_view.values
-        quotation_plot = graph_view.g_quotation
-
-        # zigzag = zig_zag(values=values["close"].values)
-
-        supports = get_supports(values=values["Close"].values)
-        resistances = get_resistances(values=values["Close"].values)
-
-        for sup in supports:
-            quotation_plot.addLine(y=sup, pen=pg.mkPen("g", width=1))
-
-        for res in resistances:
-            quotation_plot.addLine(y=res, pen=pg.mkPen("r", width=1))
-
-
-def _peaks_detection(values, rounded=3, direction="up"):
-    """Peak detection for the given data.
+        self._lines = []
 
-    :param values: All values to analyse
-    :type values: np.array
-    :param rounded: round values of peaks with n digits, defaults to 3
-    :type rounded: int, optional
-    :param direction: The direction is use to find peaks.
-    Two available choices: (up or down), defaults to "up"
-    :type direction: str, optional
-    :return: The list of peaks founded
-    :rtype: list
-    """
-    data = np.copy(values)
-    if direction == "down":
-        data = -data
-    peaks, _ = signal.find_peaks(data, height=min(data))
-    if rounded:
-        peaks = [abs(round(data[val], rounded)) for val in peaks]
-    return peaks
+    @classmethod
+    def compute(cls, values, parameters):
+        return {
+            "supports": np.asarray(get_supports(values=values["Close"])),
+            "resistances": np.asarray(get_resistances(values=values["Close"])),
+        }
 
+    def render(self, graph_view, results):
+        quotation_plot = graph_view.g_quotation
 
-def get_resistances(values, closest=2):
-    """Get resistances in values
-
-    :param values: Values to analyse
-    :type values: np.array
-    :param closest: The value for grouping. It represent the max difference
-    between values in order to be considering inside the same
-    bucket, more the value is small, more the result will be precises.
-    defaults to 2
-    :type closest: int, optional
-    :return: list of values which represents resistances
-    :rtype: list
-    """
-    return _get_support_resistances(
-        values=values, direction="up", closest=closest
-    )
-
-
-def get_supports(values, closest=2):
-    """Get supports in values
-
-    :param values: Values to analyse
-    :type values: np.array
-    :param closest: The value for grouping. It represent the max difference
-    between values in order to be considering inside the same
-    bucket, more the value is small, more the result will be precises.
-    defaults to 2
-    :type closest: int, optional
-    :return: list of values which represents supports
-    :rtype: list
-    """
-    return _get_support_resistances(
-        values=values, direction="down", closest=closest
-    )
-
-
-def _get_support_resistances(values, direction, closest=2):
-    """Private function which found all supports and resistances
-
-    :param values: values to analyse
-    :type values: np.array
-    :param direction: The direction (up for resistances, down for supports)
-    :type direction: str
-    :param closest: closest is the maximun value difference between two values
-    in order to be considering in the same bucket, default to 2
-    :type closest: int, optional
-    :return: The list of support or resistances
-    :rtype: list
-    """
-    result = []
-    # Find peaks
-    peaks = _peaks_detection(values=values, direction=direction)
-    # Group by nearest values
-    peaks_grouped = group_values_nearest(values=peaks, closest=closest)
-    # Mean all groups in order to have an only one value for each group
-    for val in peaks_grouped:
-        if not val:
-            continue
-        if len(val) < 3:  # need 3 values to confirm resistance
-            continue
-        result.append(mean(val))
-    return result
-
+        for sup in results["supports"]:
+            line = quotation_plot.addLine(y=sup, pen=pg.mkPen("g", width=1))
+            self._lines.append(line)
 
-def group_values_nearest(values, closest=2):
-    """Group given values together under multiple buckets.
+        for res in results["resistances"]:
+            line = quotation_plot.addLine(y=res, pen=pg.mkPen("r", width=1))
+            self._lines.append(line)
 
-    :param values: values to group
-    :type values: list
-    :param closest: closest is the maximun value difference between two values
-    in order to be considering in the same bucket, defaults to 2
-    :type closest: int, optional
-    :return: The list of the grouping (list of list)
-    :rtype: list    s
-    """
-    values.sort()
-    il = []
-    ol = []
-    for k, v in enumerate(values):
-        if k <= 0:
-            continue
-        if abs(values[k] - values[k - 1]) < closest:
-            if values[k - 1] not in il:
-                il.append(values[k - 1])
-            if values[k] not in il:
-                il.append(values[k])
-        else:
-            ol.append(list(il))
-            il = []
-    ol.append(list(il))
-    return ol
+    def remove_indicator(self, graph_view, *args, **kwargs):
+        super(Support_Resistances, self).remove_indicator(graph_view)
+        for line in self._lines:
+            graph_view.g_quotation.removeItem(line)
+        self._lines = []
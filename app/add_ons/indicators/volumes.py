@@ -18,6 +18,9 @@ class NonScientific(pg.AxisItem):
 
 
 class Volumes(Indicator):
+
+    inputs = ("Volume",)
+
     def __init__(self):
         super(Volumes, self).__init__()
 
@@ -25,6 +28,7 @@ class Volumes(Indicator):
         self.description = ""
 
         self.g_volume = None
+        self._bars = None
 
         # Define and register all customisable settings
         field_up = InputField(
@@ -35,12 +39,25 @@ class Volumes(Indicator):
         )
         self.register_fields(field_up, field_low)
 
-    def create_indicator(self, graph_view, *args, **kwargs):
-        super(Volumes, self).create_indicator(graph_view)
-
-        # Get values
-        values = graph_view.values
-        quotation_plot = graph_view.g_quotation
+    @classmethod
+    def compute(cls, values, parameters):
+        volume = values["Volume"]
+        return {"volume": volume, "committed": max(len(volume) - 1, 0)}
+
+    @classmethod
+    def compute_update(cls, values, parameters, previous):
+        volume = values["Volume"]
+        committed = previous["committed"]
+        return {
+            "volume": np.concatenate((previous["volume"][:committed], volume)),
+            "committed": committed + max(len(volume) - 1, 0),
+        }
+
+    def render(self, graph_view, results):
+        x = graph_view.dataset.x
+        if self._bars is not None:
+            self._bars.set_data(x=x, height=results["volume"])
+            return
 
         # Retrive settings
         field_up = self.get_field("Upper")
@@ -56,20 +73,23 @@ class Volumes(Indicator):
         self.g_volume.setLimits(yMin=0)
 
         bars = BarGraphItem(
-            x=[x.timestamp() for x in values.index],
-            height=values["Volume"].values,
+            x=x,
+            height=results["volume"],
             up_color=field_up.color,
             down_color=field_low.color,
             previous_offset=True,
         )
         self.g_volume.addItem(bars)
+        self._bars = bars
 
         self.set_time_x_axis(self.g_volume)
 
     def remove_indicator(self, graph_view, *args, **kwargs):
         super(Volumes, self).remove_indicator(graph_view)
-        graph_view.removeItem(self.g_volume)
+        if self.g_volume is not None:
+            graph_view.removeItem(self.g_volume)
         self.g_volume = None
+        self._bars = None
 
     def set_time_x_axis(self, widget):
         """Set the time on the X axis
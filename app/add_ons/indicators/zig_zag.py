@@ -1,8 +1,7 @@
 import pyqtgraph as pg
 import numpy as np
 
-from scipy import signal
-
+from libs.engine.indicators import zig_zag
 from utils.indicators_utils import Indicator, InputField, ChoiceField
 
 
@@ -20,24 +19,19 @@ class ZigZag(Indicator):
         field_zigzag = InputField("ZigZag", color=(33, 150, 243), width=2.5)
         self.register_fields(field_input, field_zigzag)
 
-    def create_indicator(self, graph_view, *args, **kwargs):
-        super(ZigZag, self).create_indicator(graph_view)
-
-        # Get values
-        values = graph_view.values
-        quotation_plot = graph_view.g_quotation
+    @classmethod
+    def compute(cls, values, parameters):
+        source = values[parameters["Input"]]
+        peaks = zig_zag(values=source)
+        return {"peaks": peaks, "values": source[peaks]}
 
-        # Retrive settings
-        field_input = self.get_field("Input")
+    def render(self, graph_view, results):
         field_zigzag = self.get_field("ZigZag")
 
-        # Calculation
-        zigzag = zig_zag(values=values[field_input.current].values)
-
         # Draw plot
-        plot = quotation_plot.plot(
-            x=[x.timestamp() for x in values.index[zigzag]],
-            y=values[field_input.current].values[zigzag],
+        plot = graph_view.g_quotation.plot(
+            x=graph_view.dataset.x[results["peaks"]],
+            y=results["values"],
             pen=pg.mkPen(
                 field_zigzag.color,
                 width=field_zigzag.width,
@@ -45,14 +39,3 @@ class ZigZag(Indicator):
             ),
         )
         self.register_plot(plot)
-
-
-def zig_zag(values, distance=2.1):
-    peaks_up, _ = signal.find_peaks(values, prominence=1, distance=distance)
-    peaks_down, _ = signal.find_peaks(-values, prominence=1, distance=distance)
-
-    indexes = [i for i in peaks_up]
-    indexes.extend([i for i in peaks_down])
-    indexes.sort()
-
-    return np.asarray(indexes)
@@ -0,0 +1,91 @@
+"""Benchmark of the vectorised backtest of the strategies.
+
+A strategy is backtested on random histories of daily bars, a single
+ticker and many tickers at once (tickers x dates):
+
+    python benchmarks/backtest.py
+    python benchmarks/backtest.py --years 20 --tickers 1000 --strategy rsi
+"""
+
+import os
+import sys
+import timeit
+import argparse
+
+import numpy as np
+
+APP_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_PATH)
+
+from libs.engine import strategies
+
+
+def benchmark(strategy, years, tickers, number=5):
+    """Backtest the strategy on random values and print the timings
+
+    :param strategy: The name of the strategy
+    :type strategy: str
+    :param years: The number of years of daily bars
+    :type years: int
+    :param tickers: The number of tickers of the second run
+    :type tickers: int
+    :param number: Number of runs, defaults to 5
+    :type number: int, optional
+    """
+    size = years * 252
+    close = np.exp(np.cumsum(np.random.randn(tickers, size) * 0.02, axis=1))
+    close *= 100.0
+
+    single = {"Close": close[0]}
+    one = min(
+        timeit.repeat(
+            lambda: strategies.run_strategy(strategy, single).summary(),
+            number=1,
+            repeat=number,
+        )
+    )
+    many = {"Close": close}
+    all_tickers = min(
+        timeit.repeat(
+            lambda: strategies.run_strategy(strategy, many).summary(),
+            number=1,
+            repeat=number,
+        )
+    )
+    result = strategies.run_strategy(strategy, single)
+    print(
+        "{strategy}, {size} bars: 1 ticker {one:.2f} ms "
+        "({trades} trades), {tickers} tickers {many:.1f} ms".format(
+            strategy=strategy,
+            size=size,
+            one=one * 1000,
+            trades=len(result.get_trades()),
+            tickers=tickers,
+            many=all_tickers * 1000,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--strategy",
+        nargs="*",
+        default=sorted(strategies.STRATEGIES),
+        choices=sorted(strategies.STRATEGIES),
+        help="Strategies to backtest",
+    )
+    parser.add_argument(
+        "--years", type=int, default=10, help="Years of daily bars"
+    )
+    parser.add_argument(
+        "--tickers", type=int, default=500, help="Number of tickers"
+    )
+    args = parser.parse_args()
+
+    for strategy in args.strategy:
+        benchmark(strategy, args.years, args.tickers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark of the exponential moving average used by the indicators.
+
+The recursive kernel of utils.rolling (scipy.signal.lfilter) is compared
+with the former convolution of macd.exp_moving_average, and with the
+streaming state fed one new value at a time:
+
+    python benchmarks/ema.py
+    python benchmarks/ema.py --sizes 1000 1000000 --window 26
+"""
+
+import os
+import sys
+import timeit
+import argparse
+
+import numpy as np
+
+APP_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_PATH)
+
+from utils import rolling
+
+
+def legacy_exp_moving_average(values, w):
+    """The former implementation of macd.exp_moving_average
+
+    :param values: The values
+    :type values: np.array
+    :param w: The window
+    :type w: int
+    :return: The moving average
+    :rtype: np.array
+    """
+    weights = np.exp(np.linspace(-1.0, 0.0, w))
+    weights /= weights.sum()
+    a = np.convolve(values, weights, mode="full")[: len(values)]
+    a[:w] = a[w]
+    return a
+
+
+def streaming(values, w, chunk=1):
+    """Feed the streaming state with chunks of values
+
+    :param values: The values
+    :type values: np.array
+    :param w: The span
+    :type w: int
+    :param chunk: The number of values of each chunk, defaults to 1
+    :type chunk: int, optional
+    """
+    state = rolling.EwmState(span=w)
+    for start in range(0, len(values), chunk):
+        state.update(values[start : start + chunk])
+
+
+def benchmark(size, w, number=5):
+    """Run the implementations on random values and print their timings
+
+    :param size: The number of values
+    :type size: int
+    :param w: The window of the average
+    :type w: int
+    :param number: Number of runs, defaults to 5
+    :type number: int, optional
+    """
+    values = np.cumsum(np.random.randn(size)) + 100.0
+
+    legacy = min(
+        timeit.repeat(
+            lambda: legacy_exp_moving_average(values, w),
+            number=1,
+            repeat=number,
+        )
+    )
+    current = min(
+        timeit.repeat(
+            lambda: rolling.ema(values, span=w), number=1, repeat=number
+        )
+    )
+    # One value at a time, as the live mode does, on the last 1000 values
+    tail = values[-1000:]
+    stream = min(
+        timeit.repeat(lambda: streaming(tail, w), number=1, repeat=number)
+    )
+    print(
+        "{size:>9} values: convolution {legacy:9.3f} ms, "
+        "recursive {current:9.3f} ms, x{ratio:.1f}, "
+        "streaming {stream:.1f} us/value".format(
+            size=size,
+            legacy=legacy * 1000,
+            current=current * 1000,
+            ratio=legacy / current,
+            stream=stream / len(tail) * 1e6,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        nargs="*",
+        type=int,
+        default=[1000, 10000, 100000, 1000000],
+        help="Number of values",
+    )
+    parser.add_argument(
+        "--window", type=int, default=26, help="Window of the average"
+    )
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        benchmark(size, args.window)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Benchmark of the extraction of the JSON embedded in Yahoo Finance pages.
+
+The current stock_info extractor is compared with the former implementation
+(split the page on markers, json.loads, json.dumps, regex and json.loads
+again) on saved pages:
+
+    python benchmarks/parse_json.py page1.html page2.html
+
+A page can be saved with --save:
+
+    python benchmarks/parse_json.py --save AAPL aapl_financials.html
+
+Without pages, a synthetic page of a few megabytes is generated.
+"""
+
+import os
+import re
+import sys
+import json
+import random
+import timeit
+import argparse
+
+APP_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_PATH)
+
+from libs.yahoo_fin import stock_info as sf
+
+
+def legacy_parse_json(html):
+    """The former implementation of stock_info._parse_json, without the
+    request
+
+    :param html: The content of the page
+    :type html: str
+    :return: The QuoteSummaryStore
+    :rtype: dict
+    """
+    json_str = (
+        html.split("root.App.main =")[1]
+        .split("(this)")[0]
+        .split(";\n}")[0]
+        .strip()
+    )
+    data = json.loads(json_str)["context"]["dispatcher"]["stores"][
+        "QuoteSummaryStore"
+    ]
+
+    new_data = json.dumps(data).replace("{}", "null")
+    new_data = re.sub(r"\{[\'|\"]raw[\'|\"]:(.*?),(.*?)\}", r"\1", new_data)
+
+    return json.loads(new_data)
+
+
+def parse_json(html):
+    """The current implementation of stock_info._parse_json, without the
+    request
+
+    :param html: The content of the page
+    :type html: str
+    :return: The QuoteSummaryStore
+    :rtype: dict
+    """
+    return sf._extract_app_main(html, store="QuoteSummaryStore")
+
+
+def synthetic_page(statements=40, padding=20000):
+    """Generate a page which looks like a Yahoo Finance financials page
+
+    :param statements: Number of statements per history, defaults to 40
+    :type statements: int, optional
+    :param padding: Number of entries in the other stores, defaults to 20000
+    :type padding: int, optional
+    :return: The content of the page
+    :rtype: str
+    """
+    random.seed(0)
+
+    def value():
+        raw = round(random.uniform(-1e9, 1e9), 2)
+        return {"raw": raw, "fmt": "{:.2f}".format(raw), "longFmt": str(raw)}
+
+    def statement():
+        data = {"field_%d" % i: value() for i in range(30)}
+        data["endDate"] = {"raw": 1609372800, "fmt": "2020-12-31"}
+        data["maxAge"] = 1
+        data["empty"] = {}
+        return data
+
+    summary = {
+        "incomeStatementHistory": {
+            "incomeStatementHistory": [
+                statement() for _ in range(statements)
+            ],
+            "maxAge": 86400,
+        },
+        "earnings": {"earningsChart": {"quarterly": []}, "extra": {}},
+    }
+    stores = {
+        "QuoteSummaryStore": summary,
+        "StreamDataStore": {
+            "item_%d" % i: {"title": "news %d" % i, "value": value()}
+            for i in range(padding)
+        },
+    }
+    app_main = json.dumps({"context": {"dispatcher": {"stores": stores}}})
+    return (
+        "<html><head></head><body><script>\n"
+        "(function (root) {\n"
+        "root.App || (root.App = {});\n"
+        "root.App.main = %s;\n"
+        "}(this));\n"
+        "</script></body></html>" % app_main
+    )
+
+
+def benchmark(name, html, number=5):
+    """Run both implementations on the page and print their timings
+
+    :param name: The name of the page
+    :type name: str
+    :param html: The content of the page
+    :type html: str
+    :param number: Number of runs, defaults to 5
+    :type number: int, optional
+    """
+    if legacy_parse_json(html) != parse_json(html):
+        print("%s: results differ" % name)
+
+    legacy = min(
+        timeit.repeat(lambda: legacy_parse_json(html), number=1, repeat=number)
+    )
+    current = min(
+        timeit.repeat(lambda: parse_json(html), number=1, repeat=number)
+    )
+    print(
+        "{name} ({size:.1f} MB): legacy {legacy:.1f} ms, "
+        "current {current:.1f} ms, x{ratio:.1f}".format(
+            name=name,
+            size=len(html) / 1e6,
+            legacy=legacy * 1000,
+            current=current * 1000,
+            ratio=legacy / current,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", help="Saved pages")
+    parser.add_argument(
+        "--save",
+        nargs=2,
+        metavar=("TICKER", "PATH"),
+        help="Save the financials page of the ticker",
+    )
+    args = parser.parse_args()
+
+    if args.save:
+        ticker, path = args.save
+        url = "https://finance.yahoo.com/quote/%s/financials?p=%s" % (
+            ticker,
+            ticker,
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(sf.session.get(url).text)
+        return
+
+    if not args.pages:
+        benchmark("synthetic", synthetic_page())
+        return
+
+    for path in args.pages:
+        with open(path, "r", encoding="utf-8") as f:
+            benchmark(os.path.basename(path), f.read())
+
+
+if __name__ == "__main__":
+    main()
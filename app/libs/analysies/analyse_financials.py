@@ -17,19 +17,30 @@
 import datetime
 from pprint import pprint
 from utils import utils as utl
-from libs.yahoo_fin import stock_info as sf
+from libs.yahoo_fin import stock_info_async as sfa
 from .analyse import AnalyseData
 
 
 class AnalyseFondamental(object):
-    def __init__(self, ticker):
-
-        self.per_datas = sf.get_quote_table(ticker)
-        self.resultat_datas = sf.get_income_statement(ticker)
-        self.balance_datas = sf.get_balance_sheet(ticker)
-        self.cash_flow_datas = sf.get_cash_flow(ticker)
-        self.statistic_datas = sf.get_stats(ticker)
-        self.dividendes = sf.get_dividends(ticker)
+    def __init__(self, ticker, bundle=None):
+        """Analyse the fundamentals of the ticker
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param bundle: The data of the ticker, defaults to None (fetched by
+        sfa.get_financial_bundle, async callers should await it and give it)
+        :type bundle: dict, optional
+        """
+        if bundle is None:
+            # All pages are fetched concurrently, the financials page once
+            bundle = sfa.run_sync(sfa.get_financial_bundle(ticker))
+        self.per_datas = bundle["quote_table"]
+        self.resultat_datas = bundle["income_statement"]
+        self.balance_datas = bundle["balance_sheet"]
+        self.cash_flow_datas = bundle["cash_flow"]
+        self.statistic_datas = bundle["stats"]
+        self.dividendes = bundle["dividends"]
+        self.history = bundle["history"]["close"]
 
         self.year_atual = self.resultat_datas.keys()[0]
         self.year_before = self.resultat_datas.keys()[1]
@@ -43,7 +54,7 @@ class AnalyseFondamental(object):
         self.datas = {}
         self.data_analyse = {}
 
-        self.get_histoty_prices(ticker)
+        self.get_histoty_prices()
         self.set_var()
         self.datas_dict()
         self.data_for_analyse()
@@ -232,9 +243,8 @@ class AnalyseFondamental(object):
         self.data_analyse["YEAR"] = self.datas["YEAR"]
         self.data_analyse["PRICE"] = self.price_dates
 
-    def get_histoty_prices(self, tick):
+    def get_histoty_prices(self):
         dates = self.resultat_datas.keys()
-        self.history = sf.get_data(tick, interval="1d")["close"]
         self.price_dates = []
         for date in dates:
             date_ = date.strftime("%Y-%m-%d")
@@ -1,6 +1,6 @@
 from PySide2 import QtCore, QtGui, QtWidgets
 
-from libs.thread_pool import ThreadPool
+from libs.scheduler import PRIORITY_NORMAL, get_scheduler
 from utils import utils
 from ui.company_widget import Ui_CompanyWidget
 
@@ -13,13 +13,12 @@ class CompanyWidget(QtWidgets.QWidget, Ui_CompanyWidget):
 
         # Constants
         self.browser = QtGui.QDesktopServices()
-        self.thread_pool = ThreadPool()
+        self.scheduler = get_scheduler()
+        # The download of the thumbnail of the current ticker
+        self._thumbnail_task = None
 
         # Signals
         self.pub_company_logo.clicked.connect(self.open_company_website)
-        self.thread_pool.signals.sig_thread_result.connect(
-            self._on_thumbnail_available
-        )
 
     @QtCore.Slot(dict)
     def _on_ticker_infos(self, infos):
@@ -74,9 +73,18 @@ class CompanyWidget(QtWidgets.QWidget, Ui_CompanyWidget):
         else:
             self.lab_last_dividend_date_value.setText(str(last_dividend_date))
 
+        # The thumbnail of the previous ticker is not wanted anymore
+        if self._thumbnail_task is not None:
+            self._thumbnail_task.cancel()
+            self._thumbnail_task = None
         if company_logo_url:
-            self.thread_pool.execution(
-                function=utils.get_image_from_url, url=company_logo_url
+            self._thumbnail_task = self.scheduler.submit(
+                utils.get_image_from_url,
+                key=("thumbnail", company_logo_url),
+                priority=PRIORITY_NORMAL,
+                group="company",
+                callback=self._on_thumbnail_available,
+                url=company_logo_url,
             )
         else:
             self.set_company_thumbnail(thumbnail=":/svg/business.svg")
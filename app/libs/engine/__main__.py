@@ -0,0 +1,124 @@
+"""Scan the tickers of the application with the batch engine.
+
+The histories are shared with the price cache of the application, run it
+from the app directory:
+
+    python -m libs.engine
+    python -m libs.engine --indicators rsi macd --workers 4 -o scan.csv
+    python -m libs.engine --conditions "RSI < 30"
+    python -m libs.engine --backtest macd --tickers AI.PA MC.PA
+"""
+
+import os
+import json
+import time
+import argparse
+
+import pandas as pd
+
+from libs.engine import batch, conditions, registry, strategies
+from libs.engine.panel import Panel
+from libs.io.price_cache import PriceCache
+
+APP_PATH = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tickers",
+        nargs="*",
+        help="Tickers to scan, defaults to all tickers of data/dataset.json",
+    )
+    parser.add_argument(
+        "--indicators",
+        nargs="*",
+        default=["rsi", "macd", "bollinger"],
+        choices=sorted(registry.INDICATORS),
+        help="Indicators to evaluate",
+    )
+    parser.add_argument(
+        "--conditions",
+        nargs="*",
+        choices=sorted(conditions.CONDITIONS),
+        help="Only keep the tickers which match all these conditions",
+    )
+    parser.add_argument(
+        "--backtest",
+        choices=sorted(strategies.STRATEGIES),
+        help="Backtest the strategy on each ticker instead of the scan",
+    )
+    parser.add_argument(
+        "--fees",
+        type=float,
+        default=0.001,
+        help="Fees of a trade of the backtest, as a fraction of its amount",
+    )
+    parser.add_argument(
+        "--start", default="2018-01-01", help="First date of histories"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of processes of the evaluation",
+    )
+    parser.add_argument("-o", "--output", help="Write the results to a csv")
+    args = parser.parse_args()
+
+    # The price cache is stored in the same place as for the application
+    if not os.environ.get("APP_HOME"):
+        os.environ["APP_HOME"] = os.path.join(
+            os.path.expanduser("~"), ".trade_helper"
+        )
+
+    tickers = args.tickers
+    if not tickers:
+        path = os.path.join(APP_PATH, "data", "dataset.json")
+        with open(path, "r") as f:
+            tickers = list(json.load(f))
+
+    begin = time.perf_counter()
+    if args.backtest:
+        histories = batch.fetch_histories(
+            tickers, price_cache=PriceCache(), start=args.start
+        )
+        panel = Panel.from_histories(histories)
+        result = strategies.run_strategy(
+            args.backtest, panel, fees=args.fees, index=panel.index
+        )
+        results = pd.DataFrame(
+            result.summary(), index=pd.Index(panel.tickers, name="ticker")
+        )
+    elif args.conditions:
+        histories = batch.fetch_histories(
+            tickers, price_cache=PriceCache(), start=args.start
+        )
+        results = conditions.screen(
+            Panel.from_histories(histories),
+            args.conditions,
+            max_workers=args.workers,
+        )
+    else:
+        results = batch.scan(
+            tickers,
+            indicators=args.indicators,
+            price_cache=PriceCache(),
+            start=args.start,
+            max_workers=args.workers,
+        )
+    print(
+        "{count} of {total} tickers kept in {seconds:.1f} s".format(
+            count=len(results),
+            total=len(tickers),
+            seconds=time.perf_counter() - begin,
+        )
+    )
+    if args.output:
+        results.to_csv(args.output)
+    else:
+        print(results.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""Vectorised backtest of positions.
+
+A strategy gives its entries and exits at the close of each bar, they are
+turned into positions (see get_positions), the position decided on a bar
+is held from the next one. Everything is computed with array operations
+along the last axis, on a single history or on tickers x dates.
+"""
+
+import numpy as np
+import pandas as pd
+
+PERIODS_PER_YEAR = 252
+
+
+def forward_fill(values, initial=np.nan) -> np.ndarray:
+    """Replace each NaN by the last value before it, along the last axis
+
+    :param values: The values
+    :type values: np.array
+    :param initial: The value before the first known one, defaults to NaN
+    :type initial: float, optional
+    :return: The filled values
+    :rtype: np.array
+    """
+    values = np.asarray(values, dtype=float)
+    positions = np.arange(values.shape[-1])
+    known = np.where(np.isnan(values), -1, positions)
+    last_known = np.maximum.accumulate(known, axis=-1) if known.size else known
+    filled = np.take_along_axis(values, np.maximum(last_known, 0), axis=-1)
+    return np.where(last_known >= 0, filled, initial)
+
+
+def get_positions(entries, exits, short=False) -> np.ndarray:
+    """Turn the signals of a strategy into positions. A position is taken
+    on an entry and kept until the next exit, a bar with both signals
+    keeps the current position.
+
+    :param entries: True on the bars where the strategy buys
+    :type entries: np.array of bool
+    :param exits: True on the bars where the strategy sells
+    :type exits: np.array of bool
+    :param short: Go short on exits instead of staying out of the market,
+    defaults to False
+    :type short: bool, optional
+    :return: The position decided at the close of each bar, 1 long, 0 out
+    of the market, -1 short
+    :rtype: np.array
+    """
+    entries = np.asarray(entries, dtype=bool)
+    exits = np.asarray(exits, dtype=bool)
+    target = np.where(entries & ~exits, 1.0, np.nan)
+    target[exits & ~entries] = -1.0 if short else 0.0
+    return forward_fill(target, initial=0.0)
+
+
+def backtest(close, positions, fees=0.001, initial_capital=1.0, index=None):
+    """Backtest the positions on the close
+
+    :param close: The close of each bar, NaN where there is no bar
+    :type close: np.array
+    :param positions: The position decided at the close of each bar
+    (see get_positions)
+    :type positions: np.array
+    :param fees: The fees of a trade, as a fraction of its amount,
+    defaults to 0.001
+    :type fees: float, optional
+    :param initial_capital: The equity before the first bar, defaults to 1
+    :type initial_capital: float, optional
+    :param index: The dates of the bars, used in the trades, defaults to
+    None (the positions of the bars are used)
+    :type index: pd.DatetimeIndex, optional
+    :return: The result of the backtest
+    :rtype: BacktestResult
+    """
+    # A missing close keeps the previous one, so the change of price over
+    # a missing bar is taken on the next one
+    close = forward_fill(close)
+    positions = np.broadcast_to(
+        np.asarray(positions, dtype=float), close.shape
+    )
+
+    held = np.zeros(close.shape)
+    held[..., 1:] = positions[..., :-1]
+    returns = np.zeros(close.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[..., 1:] = close[..., 1:] / close[..., :-1] - 1.0
+    returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # The fees are paid at the close where the position changes
+    turnover = np.abs(np.diff(positions, axis=-1, prepend=0.0))
+    strategy_returns = held * returns - fees * turnover
+    equity = initial_capital * np.cumprod(1.0 + strategy_returns, axis=-1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1.0
+
+    return BacktestResult(
+        close=close,
+        positions=positions,
+        returns=strategy_returns,
+        equity=equity,
+        drawdown=drawdown,
+        fees=fees,
+        initial_capital=initial_capital,
+        index=index,
+    )
+
+
+class BacktestResult(object):
+    """Arrays of a backtest, the statistics and trades are computed from
+    them on demand"""
+
+    def __init__(
+        self,
+        close,
+        positions,
+        returns,
+        equity,
+        drawdown,
+        fees,
+        initial_capital,
+        index=None,
+    ):
+        """Create the result
+
+        :param close: The close of each bar
+        :type close: np.array
+        :param positions: The position decided at the close of each bar
+        :type positions: np.array
+        :param returns: The return of the strategy on each bar, net of fees
+        :type returns: np.array
+        :param equity: The equity at the close of each bar
+        :type equity: np.array
+        :param drawdown: The drawdown of the equity from its last peak
+        :type drawdown: np.array
+        :param fees: The fees of a trade, as a fraction of its amount
+        :type fees: float
+        :param initial_capital: The equity before the first bar
+        :type initial_capital: float
+        :param index: The dates of the bars, defaults to None
+        :type index: pd.DatetimeIndex, optional
+        """
+        # Constants
+        self.close = close
+        self.positions = positions
+        self.returns = returns
+        self.equity = equity
+        self.drawdown = drawdown
+        self.fees = fees
+        self.initial_capital = initial_capital
+        self.index = index
+
+    def summary(self, periods_per_year=PERIODS_PER_YEAR) -> dict:
+        """Return the statistics of the backtest, one value per ticker for
+        tickers x dates
+
+        :param periods_per_year: The number of bars in a year, defaults to
+        PERIODS_PER_YEAR
+        :type periods_per_year: int, optional
+        :return: The total and annual returns, the max drawdown, the Sharpe
+        ratio, the part of the bars in the market and the number of trades
+        :rtype: dict
+        """
+        length = self.equity.shape[-1]
+        if not length:
+            return {}
+        total_return = self.equity[..., -1] / self.initial_capital - 1.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            annual_return = (1.0 + total_return) ** (
+                periods_per_year / length
+            ) - 1.0
+            sharpe = (
+                self.returns.mean(axis=-1)
+                / self.returns.std(axis=-1)
+                * np.sqrt(periods_per_year)
+            )
+        opened = (np.diff(self.positions, axis=-1, prepend=0.0) != 0) & (
+            self.positions != 0
+        )
+        return {
+            "total_return": total_return,
+            "annual_return": annual_return,
+            "max_drawdown": self.drawdown.min(axis=-1),
+            "sharpe": sharpe,
+            "exposure": (self.positions != 0).mean(axis=-1),
+            "trades": opened.sum(axis=-1),
+        }
+
+    def get_trades(self, row=None) -> pd.DataFrame:
+        """Return the trades of the backtest. A trade is entered at the close
+        where the position is taken and exited at the close where it
+        changes, the last one is still open at the last bar.
+
+        :param row: The ticker for tickers x dates, defaults to None
+        :type row: int, optional
+        :return: One row per trade with its entry, exit, side, prices, bars
+        and return net of the fees of both sides
+        :rtype: pd.DataFrame
+        """
+        positions = self.positions if row is None else self.positions[row]
+        close = self.close if row is None else self.close[row]
+
+        changes = np.flatnonzero(np.diff(positions, prepend=0.0) != 0)
+        ends = np.append(changes[1:], len(positions))
+        kept = positions[changes] != 0
+        starts, ends = changes[kept], ends[kept]
+        closed = ends < len(positions)
+        exits = np.minimum(ends, len(positions) - 1)
+
+        side = positions[starts]
+        entry_price = close[starts]
+        exit_price = close[exits]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            trade_return = (
+                side * (exit_price / entry_price - 1.0)
+                - self.fees * np.abs(side) * 2
+            )
+        labels = (
+            self.index if self.index is not None else np.arange(len(positions))
+        )
+        return pd.DataFrame(
+            {
+                "entry": labels[starts],
+                "exit": labels[exits],
+                "side": side,
+                "entry_price": entry_price,
+                "exit_price": exit_price,
+                "bars": exits - starts,
+                "return": trade_return,
+                "closed": closed,
+            }
+        )
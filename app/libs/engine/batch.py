@@ -0,0 +1,197 @@
+"""Evaluation of indicators over many tickers at once."""
+
+import itertools
+from concurrent import futures
+
+import numpy as np
+import pandas as pd
+
+from libs.engine import registry
+from libs.engine.panel import Panel
+
+
+def evaluate(panel, indicators, max_workers=None, chunk_size=500) -> dict:
+    """Evaluate the indicators on all tickers of the panel.
+
+    Each indicator is computed once on the 2-D arrays of the panel. With
+    several workers, the tickers are split in chunks evaluated in separate
+    processes.
+
+    :param panel: The histories of the tickers
+    :type panel: Panel
+    :param indicators: The names of the indicators, or their parameters
+    by name (see registry.INDICATORS)
+    :type indicators: list or dict
+    :param max_workers: The number of processes, defaults to None (the
+    evaluation is done in the current process)
+    :type max_workers: int, optional
+    :param chunk_size: The number of tickers of a chunk, defaults to 500
+    :type chunk_size: int, optional
+    :return: The outputs of each indicator, by indicator and output name
+    :rtype: dict
+    """
+    specifications = get_specifications(indicators)
+    if not max_workers or max_workers < 2 or len(panel) <= chunk_size:
+        return _evaluate_panel(panel, specifications)
+
+    chunks = [
+        panel.take(slice(start, start + chunk_size))
+        for start in range(0, len(panel), chunk_size)
+    ]
+    with futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(
+            executor.map(
+                _evaluate_panel, chunks, itertools.repeat(specifications)
+            )
+        )
+    return {
+        name: {
+            output: np.concatenate(
+                [result[name][output] for result in results]
+            )
+            for output in results[0][name]
+        }
+        for name in specifications
+    }
+
+
+def get_specifications(indicators) -> dict:
+    """Return the parameters of each indicator, completed by its defaults
+
+    :param indicators: The names of the indicators, or their parameters
+    by name
+    :type indicators: list or dict
+    :return: The parameters by indicator name
+    :rtype: dict
+    """
+    if not isinstance(indicators, dict):
+        indicators = {name: {} for name in indicators}
+    specifications = {}
+    for name, parameters in indicators.items():
+        _, defaults = registry.get_indicator(name)
+        specifications[name] = dict(defaults, **(parameters or {}))
+    return specifications
+
+
+def _evaluate_panel(panel, specifications) -> dict:
+    """Evaluate the indicators on the panel, in the current process. They
+    are computed on the bars of each ticker (see Panel.compacted), so the
+    outputs of a ticker don't depend on the days of the other tickers.
+
+    :param panel: The histories of the tickers
+    :type panel: Panel
+    :param specifications: The parameters by indicator name
+    :type specifications: dict
+    :return: The outputs of each indicator
+    :rtype: dict
+    """
+    compacted = panel.compacted()
+    results = {}
+    for name, parameters in specifications.items():
+        function, _ = registry.get_indicator(name)
+        results[name] = {
+            output: (panel.expand(values) if np.ndim(values) == 2 else values)
+            for output, values in function(compacted, **parameters).items()
+        }
+    return results
+
+
+def fetch_histories(
+    tickers, price_cache, interval="1d", start="2018-01-01", max_workers=8
+) -> dict:
+    """Get the histories of the tickers from the price cache, the missing
+    bars are downloaded by several threads
+
+    :param tickers: The names of the tickers
+    :type tickers: list
+    :param price_cache: The price cache
+    :type price_cache: PriceCache
+    :param interval: The interval of bars, defaults to "1d"
+    :type interval: str, optional
+    :param start: The first date of histories, defaults to "2018-01-01"
+    :type start: str, optional
+    :param max_workers: The number of threads, defaults to 8
+    :type max_workers: int, optional
+    :return: The history of each ticker, the tickers without history are
+    left out
+    :rtype: dict of pd.DataFrame
+    """
+
+    def fetch(ticker):
+        try:
+            return price_cache.get_history(
+                ticker=ticker, interval=interval, start=start
+            )
+        except Exception as error:
+            print(error)
+            return None
+
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        histories = dict(zip(tickers, executor.map(fetch, tickers)))
+    return {
+        ticker: data
+        for ticker, data in histories.items()
+        if data is not None and not data.empty
+    }
+
+
+def last_values(panel, results) -> pd.DataFrame:
+    """Return the last known value of every output for each ticker
+
+    :param panel: The evaluated panel
+    :type panel: Panel
+    :param results: The outputs returned by evaluate
+    :type results: dict
+    :return: One row per ticker, one column per output ("rsi.rsi", ...)
+    :rtype: pd.DataFrame
+    """
+    table = {}
+    if not len(panel.index):
+        return pd.DataFrame(
+            table, index=pd.Index(panel.tickers, name="ticker")
+        )
+
+    last = panel.last_positions()
+    rows = np.arange(len(panel))
+    table["date"] = panel.index[last]
+    table["Close"] = panel["Close"][rows, last]
+    for name, outputs in results.items():
+        for output, values in outputs.items():
+            column = "{name}.{output}".format(name=name, output=output)
+            table[column] = values[rows, last] if values.ndim == 2 else values
+    return pd.DataFrame(table, index=pd.Index(panel.tickers, name="ticker"))
+
+
+def scan(
+    tickers,
+    indicators,
+    price_cache,
+    interval="1d",
+    start="2018-01-01",
+    max_workers=None,
+) -> pd.DataFrame:
+    """Evaluate the indicators on the tickers and return their last values
+
+    :param tickers: The names of the tickers
+    :type tickers: list
+    :param indicators: The names of the indicators, or their parameters
+    by name
+    :type indicators: list or dict
+    :param price_cache: The price cache
+    :type price_cache: PriceCache
+    :param interval: The interval of bars, defaults to "1d"
+    :type interval: str, optional
+    :param start: The first date of histories, defaults to "2018-01-01"
+    :type start: str, optional
+    :param max_workers: The number of processes of the evaluation,
+    defaults to None
+    :type max_workers: int, optional
+    :return: One row per ticker with a history
+    :rtype: pd.DataFrame
+    """
+    histories = fetch_histories(
+        tickers, price_cache=price_cache, interval=interval, start=start
+    )
+    panel = Panel.from_histories(histories)
+    results = evaluate(panel, indicators, max_workers=max_workers)
+    return last_values(panel, results)
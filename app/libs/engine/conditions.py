@@ -0,0 +1,172 @@
+"""Conditions of the screener.
+
+A condition needs some indicators of the registry and tells, from their
+outputs on a panel, which tickers match it.
+"""
+
+import numpy as np
+
+from libs.engine import batch
+
+CONDITIONS = {}
+
+
+class Condition(object):
+    """A condition evaluated on the last bars of each ticker"""
+
+    def __init__(self, name: str, indicators: dict, function):
+        """Create the condition
+
+        :param name: The name of the condition, shown to the user
+        :type name: str
+        :param indicators: The parameters of the needed indicators by name
+        (see registry.INDICATORS)
+        :type indicators: dict
+        :param function: The function which takes the panel and the outputs
+        of the indicators and returns the mask of the matching tickers
+        :type function: function
+        """
+        # Constants
+        self.name = name
+        self.indicators = indicators
+        self.function = function
+
+    def evaluate(self, panel, results) -> np.ndarray:
+        """Return the tickers of the panel which match the condition
+
+        :param panel: The histories of the tickers
+        :type panel: Panel
+        :param results: The outputs of the indicators (see batch.evaluate)
+        :type results: dict
+        :return: True for the matching tickers
+        :rtype: np.array of bool
+        """
+        return np.asarray(self.function(panel, results), dtype=bool)
+
+
+def register_condition(name: str, **indicators):
+    """Register the decorated function as a condition
+
+    :param name: The name of the condition
+    :type name: str
+    :param indicators: The parameters of the needed indicators by name
+    :type indicators: dict
+    :return: The decorator
+    :rtype: function
+    """
+
+    def decorator(function):
+        CONDITIONS[name] = Condition(name, indicators, function)
+        return function
+
+    return decorator
+
+
+def get_condition(name: str) -> Condition:
+    """Return the condition registered under the name
+
+    :param name: The name of the condition
+    :type name: str
+    :raises KeyError: If the condition is not registered
+    :return: The condition
+    :rtype: Condition
+    """
+    if name not in CONDITIONS:
+        raise KeyError(
+            "Unknown condition {name}, available: {names}".format(
+                name=name, names=", ".join(sorted(CONDITIONS))
+            )
+        )
+    return CONDITIONS[name]
+
+
+def screen(panel, names, max_workers=None):
+    """Evaluate the conditions on the panel, the indicators needed by
+    several conditions are computed once
+
+    :param panel: The histories of the tickers
+    :type panel: Panel
+    :param names: The names of the conditions, a ticker must match all of
+    them
+    :type names: list
+    :param max_workers: The number of processes of the evaluation,
+    defaults to None
+    :type max_workers: int, optional
+    :return: The last values of the matching tickers (see
+    batch.last_values)
+    :rtype: pd.DataFrame
+    """
+    conditions = [get_condition(name) for name in names]
+    indicators = {}
+    for condition in conditions:
+        indicators.update(condition.indicators)
+    results = batch.evaluate(panel, indicators, max_workers=max_workers)
+
+    matched = np.ones(len(panel), dtype=bool)
+    for condition in conditions:
+        matched &= condition.evaluate(panel, results)
+    return batch.last_values(panel, results)[matched]
+
+
+def _last_value(panel, values) -> np.ndarray:
+    """Return the value of each ticker at its last bar
+
+    :param panel: The histories of the tickers
+    :type panel: Panel
+    :param values: The values, tickers x dates
+    :type values: np.array
+    :return: One value per ticker
+    :rtype: np.array
+    """
+    return values[np.arange(len(panel)), panel.last_positions()]
+
+
+def _crossed(panel, markers, bars) -> np.ndarray:
+    """Return the tickers with a marker on their last bars
+
+    :param panel: The histories of the tickers
+    :type panel: Panel
+    :param markers: The markers, NaN where there is none
+    :type markers: np.array
+    :param bars: The number of last bars
+    :type bars: int
+    :return: True for the tickers with a marker
+    :rtype: np.array of bool
+    """
+    return (~np.isnan(markers) & panel.last_bars(bars)).any(axis=1)
+
+
+@register_condition("RSI < 30", rsi={})
+def _rsi_oversold(panel, results):
+    with np.errstate(invalid="ignore"):
+        return _last_value(panel, results["rsi"]["rsi"]) < 30
+
+
+@register_condition("RSI > 70", rsi={})
+def _rsi_overbought(panel, results):
+    with np.errstate(invalid="ignore"):
+        return _last_value(panel, results["rsi"]["rsi"]) > 70
+
+
+@register_condition("MACD bullish crossover in the last 3 bars", macd={})
+def _macd_bullish(panel, results):
+    return _crossed(panel, results["macd"]["buy"], bars=3)
+
+
+@register_condition("MACD bearish crossover in the last 3 bars", macd={})
+def _macd_bearish(panel, results):
+    return _crossed(panel, results["macd"]["sell"], bars=3)
+
+
+@register_condition("Close below the lower Bollinger band", bollinger={})
+def _below_bollinger(panel, results):
+    close = _last_value(panel, panel["Close"])
+    with np.errstate(invalid="ignore"):
+        return close < _last_value(panel, results["bollinger"]["lower"])
+
+
+@register_condition("Close above the upper Bollinger band", bollinger={})
+def _above_bollinger(panel, results):
+    close = _last_value(panel, panel["Close"])
+    with np.errstate(invalid="ignore"):
+        return close > _last_value(panel, results["bollinger"]["upper"])
@@ -0,0 +1,452 @@
+"""Pure computations of the indicators.
+
+Nothing here depends on Qt or on the graph: the functions take arrays and
+return arrays, so they are shared by the add-ons and by the batch engine.
+Unless stated otherwise, the values may be a single history or a 2-D
+array of tickers x time, the computation is done along the last axis.
+"""
+
+from statistics import mean
+
+import numpy as np
+from scipy import signal
+
+from utils import rolling
+
+
+def get_rsi(values, length=14):
+    """Relative strength index
+
+    :param values: The values
+    :type values: np.array
+    :param length: The center of mass of the averages, defaults to 14
+    :type length: int, optional
+    :return: The RSI
+    :rtype: np.array
+    """
+    return RsiState(length=length).update(values)
+
+
+class RsiState(object):
+    """Streaming relative strength index, the averages of gains and losses
+    are kept between two chunks of values"""
+
+    def __init__(self, length=14):
+        """Create the state
+
+        :param length: The center of mass of the averages, defaults to 14
+        :type length: int, optional
+        """
+        # Constants
+        self._gain = rolling.EwmState(com=length)
+        self._loss = rolling.EwmState(com=length)
+        self._last = np.nan
+
+    def update(self, values, commit=None) -> np.ndarray:
+        """Compute the RSI for the given values, which follow the values
+        already seen
+
+        :param values: The new values
+        :type values: np.array
+        :param commit: The number of values kept in the state, the next
+        values are computed but will be given again, defaults to all
+        :type commit: int, optional
+        :return: The RSI at each new value
+        :rtype: np.array
+        """
+        values = np.asarray(values, dtype=float)
+        length = values.shape[-1] if values.ndim else 0
+        if commit is None:
+            commit = length
+        if not length:
+            return values
+
+        last = np.broadcast_to(self._last, values.shape[:-1])[..., None]
+        change = np.diff(values, prepend=last)
+        gain = np.where(change < 0, 0.0, change)
+        loss = np.abs(np.where(change > 0, 0.0, change))
+        gain = self._gain.update(gain, commit=commit)
+        loss = self._loss.update(loss, commit=commit)
+        if commit > 0:
+            self._last = values[..., commit - 1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = gain / loss
+        return 100 - 100 / (1 + rs)
+
+
+def exp_moving_average(values, w):
+    """Exponential moving average of span w
+
+    :param values: The values
+    :type values: np.array
+    :param w: The span
+    :type w: int
+    :return: The moving average
+    :rtype: np.array
+    """
+    return rolling.ema(values, span=w)
+
+
+def get_macd(values, w_low=12, w_fast=26):
+    """Return the two averages of the MACD and their difference
+
+    :param values: The values
+    :type values: np.array
+    :param w_low: The span of the first average, defaults to 12
+    :type w_low: int, optional
+    :param w_fast: The span of the second average, defaults to 26
+    :type w_fast: int, optional
+    :return: The first average, the second one and the MACD
+    :rtype: tuple (np.array, np.array, np.array)
+    """
+    emaslow = exp_moving_average(values, w=w_low)
+    emafast = exp_moving_average(values, w=w_fast)
+    return emaslow, emafast, emaslow - emafast
+
+
+class MacdState(object):
+    """Streaming MACD, the exponential moving averages are kept between two
+    chunks of values"""
+
+    def __init__(self, w_ema=9, w_low=12, w_fast=26):
+        """Create the state
+
+        :param w_ema: The span of the signal line, defaults to 9
+        :type w_ema: int, optional
+        :param w_low: The span of the first average, defaults to 12
+        :type w_low: int, optional
+        :param w_fast: The span of the second average, defaults to 26
+        :type w_fast: int, optional
+        """
+        # Constants
+        self._low = rolling.EwmState(span=w_low)
+        self._fast = rolling.EwmState(span=w_fast)
+        self._signal = rolling.EwmState(span=w_ema)
+
+    def update(self, values, commit=None) -> tuple:
+        """Compute the MACD for the given values, which follow the values
+        already seen
+
+        :param values: The new values
+        :type values: np.array
+        :param commit: The number of values kept in the state, the next
+        values are computed but will be given again, defaults to all
+        :type commit: int, optional
+        :return: The MACD and the signal line at each new value
+        :rtype: tuple (np.array, np.array)
+        """
+        macd = self._low.update(values, commit=commit) - self._fast.update(
+            values, commit=commit
+        )
+        return macd, self._signal.update(macd, commit=commit)
+
+
+def get_side(macd, signal):
+    """Return the side of the MACD against the signal line at each bar
+
+    :param macd: The MACD
+    :type macd: np.array
+    :param signal: The signal line
+    :type signal: np.array
+    :return: 1 when the MACD is above, -1 when it is below, 0 when they are
+    equal or unknown
+    :rtype: np.array
+    """
+    difference = np.asarray(macd, dtype=float) - np.asarray(
+        signal, dtype=float
+    )
+    return np.sign(np.nan_to_num(difference))
+
+
+def get_last_side(macd, signal):
+    """Return the last known side of the MACD against the signal line
+
+    :param macd: The MACD of a single history
+    :type macd: np.array
+    :param signal: The signal line
+    :type signal: np.array
+    :return: 1 or -1, 0 if the lines were never apart
+    :rtype: int
+    """
+    side = get_side(macd, signal)
+    known = np.flatnonzero(side)
+    return int(side[known[-1]]) if len(known) else 0
+
+
+def MACD_strategy(values, w_ema=9, w_low=12, w_fast=26):
+    """Compute the MACD strategy on the close of the values
+
+    :param values: The values, with a Close column
+    :type values: pd.DataFrame or dict
+    :param w_ema: The span of the signal line, defaults to 9
+    :type w_ema: int, optional
+    :param w_low: The span of the first average, defaults to 12
+    :type w_low: int, optional
+    :param w_fast: The span of the second average, defaults to 26
+    :type w_fast: int, optional
+    :return: The MACD, Signal, Buy and Sell arrays
+    :rtype: dict
+    """
+    close = np.asarray(values["Close"], dtype=float)
+    macd, signal = MacdState(w_ema=w_ema, w_low=w_low, w_fast=w_fast).update(
+        close
+    )
+    buy, sell = buy_sell_macd({"Close": close, "MACD": macd, "Signal": signal})
+    return {"MACD": macd, "Signal": signal, "Buy": buy, "Sell": sell}
+
+
+def buy_sell_macd(values, offset=0.01, previous=0):
+    """Find the crossovers of the MACD and the signal line. A buy is placed
+    when the MACD goes above the signal line, a sell when it goes below.
+
+    :param values: The Close, MACD and Signal arrays
+    :type values: dict or pd.DataFrame
+    :param offset: The offset of markers from the close, defaults to 0.01
+    :type offset: float, optional
+    :param previous: The last side of the MACD before the values (see
+    get_side), one per row for 2-D values, defaults to 0
+    :type previous: int or np.array, optional
+    :return: The buy and sell markers, NaN where there is no crossover
+    :rtype: tuple (np.array, np.array)
+    """
+    close = np.asarray(values["Close"], dtype=float)
+    side = get_side(values["MACD"], values["Signal"])
+    previous = np.broadcast_to(previous, side.shape[:-1])[..., None]
+
+    # Forward fill the last known side, the crossovers are the changes of
+    # side on bars where the side is known
+    positions = np.arange(1, side.shape[-1] + 1)
+    known = np.where(side != 0, positions, 0)
+    last_known = np.maximum.accumulate(known, axis=-1) if known.size else known
+    filled = np.where(
+        last_known > 0,
+        np.take_along_axis(side, np.maximum(last_known - 1, 0), axis=-1),
+        previous,
+    )
+    flips = (np.diff(filled, axis=-1, prepend=previous) != 0) & (side != 0)
+
+    buy = np.where(flips & (side > 0), close * (1 + offset), np.nan)
+    sell = np.where(flips & (side < 0), close * (1 - offset), np.nan)
+    return buy, sell
+
+
+def rolling_mean_std(values, window=20) -> tuple:
+    """Rolling mean and standard deviation, the same as
+    pd.Series.rolling(window) but on all rows at once. The sums of the
+    windows are differences of cumulative sums, the values are centered on
+    the mean of their row to keep the precision of the variance.
+
+    :param values: The values
+    :type values: np.array
+    :param window: The length of the window, defaults to 20
+    :type window: int, optional
+    :return: The mean and the standard deviation, NaN until the window is
+    full and where it contains a NaN
+    :rtype: tuple (np.array, np.array)
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center = np.nansum(values, axis=-1, keepdims=True) / np.sum(
+            valid, axis=-1, keepdims=True
+        )
+    center = np.nan_to_num(center)
+    data = np.where(valid, values - center, 0.0)
+
+    count = _window_sum(valid.astype(float), window)
+    first = _window_sum(data, window)
+    second = _window_sum(data * data, window)
+
+    full = count == window
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (second - first * first / window) / (window - 1)
+    average = np.where(full, first / window + center, np.nan)
+    deviation = np.where(
+        full & (window > 1), np.sqrt(np.maximum(variance, 0.0)), np.nan
+    )
+    return average, deviation
+
+
+def _window_sum(values, window) -> np.ndarray:
+    """Sum of the last window values at each position, along the last axis
+
+    :param values: The values, without NaN
+    :type values: np.array
+    :param window: The length of the window
+    :type window: int
+    :return: The sums, the first ones are over less than window values
+    :rtype: np.array
+    """
+    total = np.cumsum(values, axis=-1)
+    total[..., window:] -= total[..., :-window].copy()
+    return total
+
+
+def bollinger_bands(values, window=20, deviations=2):
+    """Bollinger bands of the values
+
+    :param values: The values
+    :type values: np.array
+    :param window: The length of the window, defaults to 20
+    :type window: int, optional
+    :param deviations: The number of standard deviations between the middle
+    band and the others, defaults to 2
+    :type deviations: float, optional
+    :return: The middle, upper and lower bands
+    :rtype: tuple
+    """
+    return get_bands(*rolling_mean_std(values, window=window), deviations)
+
+
+def get_bands(middle_band, standard_deviation, deviations=2):
+    """Return the bands from the rolling mean and standard deviation
+
+    :param middle_band: The rolling mean
+    :type middle_band: np.array
+    :param standard_deviation: The rolling standard deviation
+    :type standard_deviation: np.array
+    :param deviations: The number of standard deviations between the middle
+    band and the others, defaults to 2
+    :type deviations: float, optional
+    :return: The middle, upper and lower bands
+    :rtype: tuple
+    """
+    upper_band = middle_band + standard_deviation * deviations
+    lower_band = middle_band - standard_deviation * deviations
+    return middle_band, upper_band, lower_band
+
+
+def zig_zag(values, distance=2.1):
+    """Return the positions of the tops and bottoms of a single history
+
+    :param values: The values
+    :type values: np.array
+    :param distance: The min distance between two peaks, defaults to 2.1
+    :type distance: float, optional
+    :return: The sorted positions of the peaks
+    :rtype: np.array
+    """
+    peaks_up, _ = signal.find_peaks(values, prominence=1, distance=distance)
+    peaks_down, _ = signal.find_peaks(-values, prominence=1, distance=distance)
+
+    indexes = [i for i in peaks_up]
+    indexes.extend([i for i in peaks_down])
+    indexes.sort()
+
+    return np.asarray(indexes, dtype=int)
+
+
+def _peaks_detection(values, rounded=3, direction="up"):
+    """Peak detection for the given data.
+
+    :param values: All values to analyse
+    :type values: np.array
+    :param rounded: round values of peaks with n digits, defaults to 3
+    :type rounded: int, optional
+    :param direction: The direction is use to find peaks.
+    Two available choices: (up or down), defaults to "up"
+    :type direction: str, optional
+    :return: The list of peaks founded
+    :rtype: list
+    """
+    data = np.copy(values)
+    if direction == "down":
+        data = -data
+    peaks, _ = signal.find_peaks(data, height=min(data))
+    if rounded:
+        peaks = [abs(round(data[val], rounded)) for val in peaks]
+    return peaks
+
+
+def get_resistances(values, closest=2):
+    """Get resistances in values
+
+    :param values: Values to analyse
+    :type values: np.array
+    :param closest: The value for grouping. It represent the max difference
+    between values in order to be considering inside the same
+    bucket, more the value is small, more the result will be precises.
+    defaults to 2
+    :type closest: int, optional
+    :return: list of values which represents resistances
+    :rtype: list
+    """
+    return _get_support_resistances(
+        values=values, direction="up", closest=closest
+    )
+
+
+def get_supports(values, closest=2):
+    """Get supports in values
+
+    :param values: Values to analyse
+    :type values: np.array
+    :param closest: The value for grouping. It represent the max difference
+    between values in order to be considering inside the same
+    bucket, more the value is small, more the result will be precises.
+    defaults to 2
+    :type closest: int, optional
+    :return: list of values which represents supports
+    :rtype: list
+    """
+    return _get_support_resistances(
+        values=values, direction="down", closest=closest
+    )
+
+
+def _get_support_resistances(values, direction, closest=2):
+    """Private function which found all supports and resistances
+
+    :param values: values to analyse
+    :type values: np.array
+    :param direction: The direction (up for resistances, down for supports)
+    :type direction: str
+    :param closest: closest is the maximun value difference between two values
+    in order to be considering in the same bucket, default to 2
+    :type closest: int, optional
+    :return: The list of support or resistances
+    :rtype: list
+    """
+    result = []
+    # Find peaks
+    peaks = _peaks_detection(values=values, direction=direction)
+    # Group by nearest values
+    peaks_grouped = group_values_nearest(values=peaks, closest=closest)
+    # Mean all groups in order to have an only one value for each group
+    for val in peaks_grouped:
+        if not val:
+            continue
+        if len(val) < 3:  # need 3 values to confirm resistance
+            continue
+        result.append(mean(val))
+    return result
+
+
+def group_values_nearest(values, closest=2):
+    """Group given values together under multiple buckets.
+
+    :param values: values to group
+    :type values: list
+    :param closest: closest is the maximun value difference between two values
+    in order to be considering in the same bucket, defaults to 2
+    :type closest: int, optional
+    :return: The list of the grouping (list of list)
+    :rtype: list
+    """
+    values.sort()
+    il = []
+    ol = []
+    for k, v in enumerate(values):
+        if k <= 0:
+            continue
+        if abs(values[k] - values[k - 1]) < closest:
+            if values[k - 1] not in il:
+                il.append(values[k - 1])
+            if values[k] not in il:
+                il.append(values[k])
+        else:
+            ol.append(list(il))
+            il = []
+    ol.append(list(il))
+    return ol
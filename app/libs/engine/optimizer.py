@@ -0,0 +1,209 @@
+"""Search of the best parameters of a strategy.
+
+Every combination of parameters is backtested on the same history. The
+combinations are split in chunks evaluated by a process pool, each process
+keeps a SeriesCache of the history so the intermediate series (the average
+of each window, ...) are computed once per process and shared by all the
+combinations it evaluates.
+"""
+
+import functools
+import itertools
+import multiprocessing
+import os
+from concurrent import futures
+
+import numpy as np
+import pandas as pd
+
+from libs.engine import strategies
+
+# The history of the worker processes, see _init_worker
+_worker_cache = None
+
+
+def get_grid(space: dict, valid=None) -> list:
+    """Return all combinations of the parameters
+
+    :param space: The values to try for each parameter
+    :type space: dict of list
+    :param valid: Returns False for the combinations to skip, defaults to
+    None (all combinations)
+    :type valid: function, optional
+    :return: The combinations
+    :rtype: list of dict
+    """
+    names = list(space)
+    combinations = (
+        dict(zip(names, values))
+        for values in itertools.product(*(space[name] for name in names))
+    )
+    return [
+        combination
+        for combination in combinations
+        if valid is None or valid(combination)
+    ]
+
+
+def get_random(space: dict, count: int, seed=None, valid=None) -> list:
+    """Return random combinations of the parameters, without repetition
+
+    :param space: The values to try for each parameter
+    :type space: dict of list
+    :param count: The number of combinations
+    :type count: int
+    :param seed: The seed of the random generator, defaults to None
+    :type seed: int, optional
+    :param valid: Returns False for the combinations to skip, defaults to
+    None (all combinations)
+    :type valid: function, optional
+    :return: The combinations, in the order of the grid
+    :rtype: list of dict
+    """
+    names = list(space)
+    choices = [list(space[name]) for name in names]
+    sizes = [len(values) for values in choices]
+    total = int(np.prod(sizes))
+    generator = np.random.default_rng(seed)
+    # The combinations are drawn by their position in the grid until there
+    # are enough valid ones
+    drawn = generator.permutation(total)
+    if valid is None:
+        drawn = drawn[:count]
+    combinations = {}
+    for position in drawn:
+        if len(combinations) >= count:
+            break
+        indexes = np.unravel_index(position, sizes) if sizes else ()
+        combination = {
+            name: values[index]
+            for name, values, index in zip(names, choices, indexes)
+        }
+        if valid is None or valid(combination):
+            combinations[position] = combination
+    # Sorted so the combinations which share parameters stay in the same
+    # chunk
+    return [combinations[position] for position in sorted(combinations)]
+
+
+def optimize(
+    strategy: str,
+    values,
+    space: dict,
+    method="grid",
+    count=1000,
+    metric="sharpe",
+    fees=0.001,
+    short=False,
+    max_workers=None,
+    seed=None,
+) -> pd.DataFrame:
+    """Backtest the strategy with each combination of parameters
+
+    :param strategy: The name of the strategy (see strategies.STRATEGIES)
+    :type strategy: str
+    :param values: The history, with a Close column
+    :type values: pd.DataFrame, Dataset or dict
+    :param space: The values to try for each parameter of the strategy
+    :type space: dict of list
+    :param method: "grid" for all combinations, "random" for count random
+    ones, defaults to "grid"
+    :type method: str, optional
+    :param count: The number of combinations of the random search,
+    defaults to 1000
+    :type count: int, optional
+    :param metric: The statistic of the summary used to rank the
+    combinations, defaults to "sharpe"
+    :type metric: str, optional
+    :param fees: The fees of a trade, defaults to 0.001
+    :type fees: float, optional
+    :param short: Go short on exits, defaults to False
+    :type short: bool, optional
+    :param max_workers: The number of processes, defaults to None (the
+    number of processors), 1 to run in the current process
+    :type max_workers: int, optional
+    :param seed: The seed of the random search, defaults to None
+    :type seed: int, optional
+    :raises ValueError: If the method is unknown
+    :return: One row per combination with its parameters and summary,
+    the best first
+    :rtype: pd.DataFrame
+    """
+    # The combinations which make no sense are not backtested
+    valid = functools.partial(strategies.is_valid, strategy)
+    if method == "grid":
+        combinations = get_grid(space, valid=valid)
+    elif method == "random":
+        combinations = get_random(space, count=count, seed=seed, valid=valid)
+    else:
+        raise ValueError("Unknown method {method}".format(method=method))
+
+    close = np.asarray(values["Close"], dtype=float)
+    options = {"strategy": strategy, "fees": fees, "short": short}
+    if max_workers == 1 or len(combinations) < 2:
+        _init_worker(close)
+        rows = _evaluate(combinations, **options)
+    else:
+        max_workers = max_workers or os.cpu_count() or 1
+        # Several chunks per process, the fastest ones take more of them
+        size = max(1, -(-len(combinations) // (max_workers * 4)))
+        chunks = [
+            combinations[start : start + size]
+            for start in range(0, len(combinations), size)
+        ]
+        # The processes are spawned, the optimisation runs from a thread of
+        # the application and forking a process with Qt threads may hang
+        with futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(close,),
+        ) as executor:
+            results = executor.map(
+                functools.partial(_evaluate, **options), chunks
+            )
+            rows = [row for chunk in results for row in chunk]
+
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    return table.sort_values(
+        metric, ascending=False, na_position="last", kind="stable"
+    ).reset_index(drop=True)
+
+
+def _init_worker(close):
+    """Keep the history in the process, with its cache of series
+
+    :param close: The close of the history
+    :type close: np.array
+    """
+    global _worker_cache
+    _worker_cache = strategies.SeriesCache({"Close": close})
+
+
+def _evaluate(combinations, strategy, fees, short) -> list:
+    """Backtest the combinations on the history of the process
+
+    :param combinations: The parameters of each backtest
+    :type combinations: list of dict
+    :param strategy: The name of the strategy
+    :type strategy: str
+    :param fees: The fees of a trade
+    :type fees: float
+    :param short: Go short on exits
+    :type short: bool
+    :return: The parameters and the summary of each backtest
+    :rtype: list of dict
+    """
+    rows = []
+    for parameters in combinations:
+        result = strategies.run_strategy(
+            strategy, _worker_cache, fees=fees, short=short, **parameters
+        )
+        row = dict(parameters)
+        row.update(
+            {name: float(value) for name, value in result.summary().items()}
+        )
+        rows.append(row)
+    return rows
@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class Panel(object):
+    """Histories of several tickers aligned on the same dates.
+
+    Each column is a 2-D array of tickers x dates, NaN where a ticker has no
+    bar (not listed yet, holiday of its exchange, ...). The tickers of
+    different exchanges don't trade on the same days, so the indicators are
+    computed on the compacted panel (see compacted), where each row only
+    holds the bars of its ticker, and their outputs are expanded back on
+    the dates.
+    """
+
+    def __init__(self, tickers, index, columns, bars=None):
+        """Create the panel
+
+        :param tickers: The names of the tickers, one per row
+        :type tickers: list
+        :param index: The dates, one per column
+        :type index: pd.DatetimeIndex
+        :param columns: The 2-D arrays of each column (Open, Close, ...)
+        :type columns: dict
+        :param bars: True where a ticker has a bar, tickers x dates, defaults
+        to None (where the Close is known)
+        :type bars: np.array of bool, optional
+        """
+        # Constants
+        self.tickers = list(tickers)
+        self.index = index
+        self.columns = columns
+        if bars is None:
+            bars = ~np.isnan(columns["Close"])
+        self.bars = bars
+
+        # The position of the bars of each ticker first, see compact
+        self._order = None
+
+    @classmethod
+    def from_histories(cls, histories, columns=COLUMNS):
+        """Create the panel from the histories of the tickers. The dates
+        are the union of the days of all histories, whatever the timezone
+        of their exchange.
+
+        :param histories: The history of each ticker
+        :type histories: dict of pd.DataFrame
+        :param columns: The columns to keep, defaults to COLUMNS
+        :type columns: tuple, optional
+        :return: The panel
+        :rtype: Panel
+        """
+        days = {}
+        for ticker, data in histories.items():
+            if data is None or data.empty:
+                continue
+            index = data.index
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            days[ticker] = index.normalize()
+
+        tickers = list(days)
+        index = pd.DatetimeIndex(
+            np.unique(
+                np.concatenate([day.to_numpy() for day in days.values()])
+            )
+            if days
+            else []
+        )
+        arrays = {
+            column: np.full((len(tickers), len(index)), np.nan)
+            for column in columns
+        }
+        bars = np.zeros((len(tickers), len(index)), dtype=bool)
+        for row, ticker in enumerate(tickers):
+            data = histories[ticker]
+            # A day may appear twice, around a split or a change of
+            # timezone, the last bar of the day is kept
+            positions = index.get_indexer(days[ticker])
+            bars[row, positions] = True
+            for column, array in arrays.items():
+                if column in data:
+                    array[row, positions] = data[column].to_numpy(float)
+        return cls(tickers=tickers, index=index, columns=arrays, bars=bars)
+
+    def take(self, rows):
+        """Return the panel of some tickers
+
+        :param rows: The rows of the tickers
+        :type rows: slice or list
+        :return: The panel of the tickers
+        :rtype: Panel
+        """
+        tickers = np.asarray(self.tickers, dtype=object)[rows]
+        columns = {
+            column: array[rows] for column, array in self.columns.items()
+        }
+        return Panel(
+            tickers=tickers,
+            index=self.index,
+            columns=columns,
+            bars=self.bars[rows],
+        )
+
+    def compacted(self):
+        """Return the panel where the bars of each ticker are moved to the
+        start of its row, in the same order. The indicators computed on it
+        are the same as on the history of each ticker alone, whatever the
+        days of the other tickers. Its columns are not dates anymore, the
+        outputs are expanded back on the dates of this panel by expand.
+
+        :return: The compacted panel, it has no index
+        :rtype: Panel
+        """
+        columns = {
+            column: self.compact(array)
+            for column, array in self.columns.items()
+        }
+        return Panel(
+            tickers=self.tickers,
+            index=None,
+            columns=columns,
+            bars=self.compact(self.bars),
+        )
+
+    def compact(self, values) -> np.ndarray:
+        """Move the bars of each ticker to the start of its row
+
+        :param values: The values on the dates, tickers x dates
+        :type values: np.array
+        :return: The values of the bars first, then NaN (False or None
+        depending on the type of the values)
+        :rtype: np.array
+        """
+        order = self._get_order()
+        values = np.take_along_axis(np.asarray(values), order, axis=1)
+        count = self.bars.sum(axis=1, keepdims=True)
+        filled = np.arange(values.shape[1]) < count
+        return np.where(filled, values, _get_fill(values.dtype))
+
+    def expand(self, values) -> np.ndarray:
+        """Move the values computed on the compacted panel back on the
+        dates of the bars of each ticker, the reverse of compact
+
+        :param values: The values of the compacted panel, tickers x bars
+        :type values: np.array
+        :return: The values on the dates, NaN (False or None depending on
+        the type of the values) where a ticker has no bar
+        :rtype: np.array
+        """
+        values = np.asarray(values)
+        expanded = np.empty_like(values)
+        np.put_along_axis(expanded, self._get_order(), values, axis=1)
+        return np.where(self.bars, expanded, _get_fill(values.dtype))
+
+    def _get_order(self) -> np.ndarray:
+        """Return the positions of the bars of each ticker, then the other
+        positions
+
+        :return: The positions, tickers x dates
+        :rtype: np.array
+        """
+        if self._order is None:
+            self._order = np.argsort(~self.bars, axis=1, kind="stable")
+        return self._order
+
+    def last_positions(self) -> np.ndarray:
+        """Return the position of the last bar of each ticker, they don't
+        all end on the same day
+
+        :return: The column of the last bar, one per ticker
+        :rtype: np.array
+        """
+        has_bar = self.bars
+        return has_bar.shape[1] - 1 - np.argmax(has_bar[:, ::-1], axis=1)
+
+    def last_bars(self, count: int) -> np.ndarray:
+        """Return where the last bars of each ticker are
+
+        :param count: The number of bars
+        :type count: int
+        :return: True on the last count bars of each ticker, tickers x dates
+        :rtype: np.array of bool
+        """
+        has_bar = self.bars
+        from_end = np.cumsum(has_bar[:, ::-1], axis=1)[:, ::-1]
+        return has_bar & (from_end <= count)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Return a column of all tickers
+
+        :param column: The name of the column
+        :type column: str
+        :return: The values, tickers x dates
+        :rtype: np.array
+        """
+        return self.columns[column]
+
+    def __len__(self):
+        return len(self.tickers)
+
+
+def _get_fill(dtype):
+    """Return the value of the missing bars for the type of values
+
+    :param dtype: The type of the values
+    :type dtype: np.dtype
+    :return: NaN, False or None
+    :rtype: object
+    """
+    if dtype == bool:
+        return False
+    if dtype == object:
+        return None
+    return np.nan
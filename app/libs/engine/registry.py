@@ -0,0 +1,99 @@
+"""Indicators which can be evaluated on a panel.
+
+An evaluator takes the panel and its parameters and returns the outputs of
+the indicator, each one a 2-D array of tickers x dates (or one object per
+ticker for the outputs which are not series, like the support levels).
+"""
+
+import numpy as np
+
+from libs.engine import indicators
+
+INDICATORS = {}
+
+
+def register_indicator(name: str, **defaults):
+    """Register the decorated function as the evaluator of an indicator
+
+    :param name: The name of the indicator
+    :type name: str
+    :param defaults: The default parameters of the indicator
+    :type defaults: dict
+    :return: The decorator
+    :rtype: function
+    """
+
+    def decorator(function):
+        INDICATORS[name] = (function, defaults)
+        return function
+
+    return decorator
+
+
+def get_indicator(name: str) -> tuple:
+    """Return the evaluator of the indicator and its default parameters
+
+    :param name: The name of the indicator
+    :type name: str
+    :raises KeyError: If the indicator is not registered
+    :return: The evaluator and the default parameters
+    :rtype: tuple (function, dict)
+    """
+    if name not in INDICATORS:
+        raise KeyError(
+            "Unknown indicator {name}, available: {names}".format(
+                name=name, names=", ".join(sorted(INDICATORS))
+            )
+        )
+    return INDICATORS[name]
+
+
+@register_indicator("rsi", length=14, source="Close")
+def _evaluate_rsi(panel, length, source):
+    return {"rsi": indicators.get_rsi(panel[source], length=length)}
+
+
+@register_indicator("macd", w_ema=9, w_low=12, w_fast=26, source="Close")
+def _evaluate_macd(panel, w_ema, w_low, w_fast, source):
+    state = indicators.MacdState(w_ema=w_ema, w_low=w_low, w_fast=w_fast)
+    macd, signal = state.update(panel[source])
+    buy, sell = indicators.buy_sell_macd(
+        {"Close": panel["Close"], "MACD": macd, "Signal": signal}
+    )
+    return {"macd": macd, "signal": signal, "buy": buy, "sell": sell}
+
+
+@register_indicator("bollinger", window=20, deviations=2, source="Close")
+def _evaluate_bollinger(panel, window, deviations, source):
+    middle, upper, lower = indicators.bollinger_bands(
+        panel[source], window=window, deviations=deviations
+    )
+    return {"middle": middle, "upper": upper, "lower": lower}
+
+
+@register_indicator("zig_zag", distance=2.1, source="Close")
+def _evaluate_zig_zag(panel, distance, source):
+    # The peaks are searched ticker by ticker, on the days it has a bar
+    values = panel[source]
+    peaks = np.zeros(values.shape, dtype=bool)
+    for row, history in enumerate(values):
+        days = np.flatnonzero(~np.isnan(history))
+        if len(days):
+            found = indicators.zig_zag(history[days], distance=distance)
+            peaks[row, days[found]] = True
+    return {"peaks": peaks}
+
+
+@register_indicator("levels", closest=2, source="Close")
+def _evaluate_levels(panel, closest, source):
+    values = panel[source]
+    supports = np.empty(len(values), dtype=object)
+    resistances = np.empty(len(values), dtype=object)
+    for row, history in enumerate(values):
+        history = history[~np.isnan(history)]
+        if len(history) < 3:
+            supports[row], resistances[row] = [], []
+            continue
+        supports[row] = indicators.get_supports(history, closest=closest)
+        resistances[row] = indicators.get_resistances(history, closest=closest)
+    return {"supports": supports, "resistances": resistances}
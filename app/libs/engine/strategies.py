@@ -0,0 +1,252 @@
+"""Strategies which can be backtested.
+
+A strategy takes the values of a history (anything with a "Close" column:
+a DataFrame, the dataset of the graph, a panel or a SeriesCache) and its
+parameters, and returns its entries and exits at each bar.
+"""
+
+import numpy as np
+
+from libs.engine import backtest, indicators
+from utils import rolling
+
+STRATEGIES = {}
+CONSTRAINTS = {}
+
+
+def register_strategy(name: str, constraint=None, **defaults):
+    """Register the decorated function as a strategy
+
+    :param name: The name of the strategy
+    :type name: str
+    :param constraint: Takes the parameters and returns False when they
+    make no sense together (a fast average slower than the slow one, ...),
+    defaults to None
+    :type constraint: function, optional
+    :param defaults: The default parameters of the strategy
+    :type defaults: dict
+    :return: The decorator
+    :rtype: function
+    """
+
+    def decorator(function):
+        STRATEGIES[name] = (function, defaults)
+        CONSTRAINTS[name] = constraint
+        return function
+
+    return decorator
+
+
+def is_valid(name: str, parameters: dict) -> bool:
+    """Return True if the parameters of the strategy make sense together,
+    the optimizer skips the other combinations
+
+    :param name: The name of the strategy
+    :type name: str
+    :param parameters: The parameters, completed by the defaults
+    :type parameters: dict
+    :return: The validity of the parameters
+    :rtype: bool
+    """
+    constraint = CONSTRAINTS.get(name)
+    if constraint is None:
+        return True
+    _, defaults = STRATEGIES[name]
+    return bool(constraint(**dict(defaults, **parameters)))
+
+
+def get_signals(name: str, values, **parameters) -> tuple:
+    """Return the entries and exits of the strategy on the values
+
+    :param name: The name of the strategy
+    :type name: str
+    :param values: The values, with a Close column
+    :type values: pd.DataFrame, Dataset or Panel
+    :raises KeyError: If the strategy is not registered
+    :return: The entries and the exits
+    :rtype: tuple (np.array of bool, np.array of bool)
+    """
+    if name not in STRATEGIES:
+        raise KeyError(
+            "Unknown strategy {name}, available: {names}".format(
+                name=name, names=", ".join(sorted(STRATEGIES))
+            )
+        )
+    function, defaults = STRATEGIES[name]
+    return function(values, **dict(defaults, **parameters))
+
+
+class SeriesCache(object):
+    """Values of a history with the intermediate series of the strategies.
+
+    When the same strategy is run with many parameters (see optimizer), the
+    series which depend on a single parameter, like the average of each
+    window, are computed once and shared by all runs.
+    """
+
+    def __init__(self, values):
+        """Create the cache
+
+        :param values: The values, with a Close column
+        :type values: pd.DataFrame, Dataset, Panel or dict
+        """
+        # Constants
+        self._columns = {"Close": _get_close(values)}
+        self._series = {}
+
+    def get(self, key: tuple, function):
+        """Return the series of the key, computed by the function the
+        first time it is asked
+
+        :param key: The key of the series, its kind and its parameters
+        :type key: tuple
+        :param function: The function which computes the series
+        :type function: function
+        :return: The series
+        :rtype: np.array or tuple
+        """
+        if key not in self._series:
+            self._series[key] = function()
+        return self._series[key]
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self._columns[column]
+
+
+def run_strategy(
+    name: str, values, fees=0.001, short=False, index=None, **parameters
+):
+    """Backtest the strategy on the values
+
+    :param name: The name of the strategy
+    :type name: str
+    :param values: The values, with a Close column
+    :type values: pd.DataFrame, Dataset or Panel
+    :param fees: The fees of a trade, as a fraction of its amount,
+    defaults to 0.001
+    :type fees: float, optional
+    :param short: Go short on exits, defaults to False
+    :type short: bool, optional
+    :param index: The dates of the bars, defaults to None
+    :type index: pd.DatetimeIndex, optional
+    :return: The result of the backtest
+    :rtype: BacktestResult
+    """
+    entries, exits = get_signals(name, values, **parameters)
+    return backtest.backtest(
+        _get_close(values),
+        backtest.get_positions(entries, exits, short=short),
+        fees=fees,
+        index=index,
+    )
+
+
+def _get_close(values) -> np.ndarray:
+    """Return the close of the values as a float array
+
+    :param values: The values, with a Close column
+    :type values: pd.DataFrame, Dataset or Panel
+    :return: The close
+    :rtype: np.array
+    """
+    return np.asarray(values["Close"], dtype=float)
+
+
+def _cached(values, key: tuple, function):
+    """Return the series of the key from the cache of the values, or
+    compute it if the values have no cache
+
+    :param values: The values
+    :type values: pd.DataFrame, Dataset, Panel or SeriesCache
+    :param key: The key of the series
+    :type key: tuple
+    :param function: The function which computes the series
+    :type function: function
+    :return: The series
+    :rtype: np.array or tuple
+    """
+    if isinstance(values, SeriesCache):
+        return values.get(key, function)
+    return function()
+
+
+def _ema(values, **parameters) -> np.ndarray:
+    """Exponential moving average of the close, shared through the cache
+
+    :param values: The values
+    :type values: pd.DataFrame, Dataset, Panel or SeriesCache
+    :return: The average
+    :rtype: np.array
+    """
+    key = ("ema",) + tuple(sorted(parameters.items()))
+    return _cached(
+        values, key, lambda: rolling.ema(_get_close(values), **parameters)
+    )
+
+
+def _crosses_above(values, level) -> np.ndarray:
+    """Return where the values go above the level
+
+    :param values: The values
+    :type values: np.array
+    :param level: The level
+    :type level: float or np.array
+    :return: True on the bars where the values cross the level, the values
+    must go from below to above it (a NaN or a touch is not a cross)
+    :rtype: np.array of bool
+    """
+    values = np.asarray(values, dtype=float)
+    below = np.zeros(values.shape, dtype=bool)
+    with np.errstate(invalid="ignore"):
+        below[..., 1:] = values[..., :-1] < level
+        return below & (values > level)
+
+
+@register_strategy(
+    "macd",
+    constraint=lambda w_ema, w_low, w_fast: w_low < w_fast,
+    w_ema=9,
+    w_low=12,
+    w_fast=26,
+)
+def _macd_strategy(values, w_ema, w_low, w_fast):
+    macd = _ema(values, span=w_low) - _ema(values, span=w_fast)
+    signal = rolling.ema(macd, span=w_ema)
+    return _crosses_above(macd - signal, 0), _crosses_above(signal - macd, 0)
+
+
+@register_strategy(
+    "rsi",
+    constraint=lambda length, lower, upper: lower < upper,
+    length=14,
+    lower=30,
+    upper=70,
+)
+def _rsi_strategy(values, length, lower, upper):
+    rsi = _cached(
+        values,
+        ("rsi", length),
+        lambda: indicators.get_rsi(_get_close(values), length=length),
+    )
+    return _crosses_above(rsi, lower), _crosses_above(-rsi, -upper)
+
+
+@register_strategy("bollinger", window=20, deviations=2)
+def _bollinger_strategy(values, window, deviations):
+    close = _get_close(values)
+    middle, deviation = _cached(
+        values,
+        ("rolling", window),
+        lambda: indicators.rolling_mean_std(close, window=window),
+    )
+    middle, _, lower = indicators.get_bands(middle, deviation, deviations)
+    with np.errstate(invalid="ignore"):
+        return close < lower, close > middle
+
+
+@register_strategy(
+    "mma", constraint=lambda fast, slow: fast < slow, fast=3, slow=15
+)
+def _mma_strategy(values, fast, slow):
+    difference = _ema(values, com=fast) - _ema(values, com=slow)
+    return _crosses_above(difference, 0), _crosses_above(-difference, 0)
@@ -32,3 +32,15 @@ class EventHandler(QtCore.QObject):
     sig_favorite_clicked = QtCore.Signal(str)
 
     sig_articles = QtCore.Signal(dict)
+
+    sig_live_quote_fetched = QtCore.Signal(str, object)
+    sig_live_bar_updated = QtCore.Signal(object)
+
+    sig_screener_chunk_screened = QtCore.Signal(int, int, object)
+    sig_screener_matched = QtCore.Signal(object)
+    sig_screener_progress = QtCore.Signal(int, int)
+    sig_screener_finished = QtCore.Signal()
+
+    sig_indicator_computed = QtCore.Signal(object, object)
+
+    sig_task_finished = QtCore.Signal(object)
@@ -13,15 +13,26 @@ class BarGraphItem(pg.GraphicsObject):
     ):
         pg.GraphicsObject.__init__(self)
 
-        self.data = []
-        for x, y in zip(x, height):
-            self.data.append((x, y))
-
         self.up_color = up_color
         self.down_color = down_color
         self.previous_offset = previous_offset
 
+        self.set_data(x=x, height=height)
+
+    def set_data(self, x, height):
+        """Set the bars and draw them again
+
+        :param x: The position of each bar
+        :type x: np.array
+        :param height: The height of each bar
+        :type height: np.array
+        """
+        self.prepareGeometryChange()
+        self.data = []
+        for x, y in zip(x, height):
+            self.data.append((x, y))
         self.generatePicture()
+        self.update()
 
     def generatePicture(self):
         self.picture = QtGui.QPicture()
@@ -1,36 +1,309 @@
+import math
+
+import numpy as np
 import pyqtgraph as pg
 from PySide2 import QtCore, QtGui
 
 
 class CandlestickItem(pg.GraphicsObject):
+    """Candlestick chart item.
+
+    Only the candles around the visible range are drawn. When zoomed out,
+    consecutive candles are merged into OHLC buckets: the levels of a
+    pyramid, each level merging the candles of the previous one by two, are
+    built when first needed and the level is chosen from the width of a
+    pixel. The number of drawn candles depends on the width of the view,
+    not on the length of the history.
+    """
+
+    # Minimum space between two drawn candles, in pixels
+    MIN_CANDLE_SPACING = 3
+
     def __init__(
         self, data, up_color=(38, 166, 154), down_color=(239, 83, 80)
     ):
         pg.GraphicsObject.__init__(self)
 
-        self.data = data  ## data must have fields: time, open, close, min, max
+        ## data must have fields: time, open, close, min, max
+        self.data = np.asarray(data, dtype=float).reshape(-1, 5)
         self.up_color = up_color
         self.down_color = down_color
 
+        self.picture = None
+        self._levels = [self.data]
+        # The buffers of the levels, with room for the next candles
+        self._buffers = [self.data]
+        self._level = 0
+        self._window = None
+        self._spacing = 1.0
+        if len(self.data) > 1:
+            self._spacing = self.data[1][0] - self.data[0][0]
+        self._bounds = self._compute_bounds()
+
+    def update_candles(self, data, start):
+        """Replace the candles from the given position, the candles before
+        it must be unchanged. Only the changed candles of each level of the
+        pyramid are aggregated again.
+
+        :param data: All candles (time, open, close, min, max)
+        :type data: np.array
+        :param start: The position of the first changed candle
+        :type start: int
+        """
+        self.prepareGeometryChange()
+        self.data = np.asarray(data, dtype=float).reshape(-1, 5)
+        start = min(start, len(self.data))
+        levels = [self.data]
+        for level in self._levels[1:]:
+            start //= 2
+            changed = aggregate_candles(levels[-1][start * 2 :])
+            levels.append(np.concatenate((level[:start], changed)))
+        self._levels = levels
+        self._buffers = list(levels)
+        if len(self.data) > 1:
+            self._spacing = self.data[1][0] - self.data[0][0]
+        self._bounds = self._compute_bounds()
+        self.picture = None
+        self.update()
+
+    def set_candles(self, candles, start):
+        """Replace the last candles from the given position, for the live
+        updates. The candles are written in place in the buffers of the
+        levels and only the last candles of each level are aggregated again,
+        so the cost doesn't depend on the length of the history.
+
+        :param candles: The candles from the position (time, open, close,
+        min, max)
+        :type candles: np.array
+        :param start: The position of the first given candle
+        :type start: int
+        """
+        self.prepareGeometryChange()
+        candles = np.asarray(candles, dtype=float).reshape(-1, 5)
+        start = min(start, len(self.data))
+        changed = candles
+        for depth in range(len(self._levels)):
+            if depth:
+                start //= 2
+                changed = aggregate_candles(
+                    self._levels[depth - 1][start * 2 :]
+                )
+            self._levels[depth] = self._write_level(depth, changed, start)
+        self.data = self._levels[0]
+        if len(self.data) > 1:
+            self._spacing = self.data[1][0] - self.data[0][0]
+        if np.isfinite(candles[:, 1:]).any():
+            self._bounds = self._bounds.united(self._get_bounds(candles))
+        self.picture = None
+        self.update()
+
+    def _write_level(self, depth, candles, start):
+        """Write the candles in the buffer of the level from the position,
+        the buffer is doubled when it is full
+
+        :param depth: The level
+        :type depth: int
+        :param candles: The candles
+        :type candles: np.array
+        :param start: The position of the first candle
+        :type start: int
+        :return: The candles of the level
+        :rtype: np.array
+        """
+        buffer = self._buffers[depth]
+        length = start + len(candles)
+        if length > len(buffer):
+            grown = np.empty((max(length, 2 * len(buffer)), 5))
+            grown[:start] = buffer[:start]
+            self._buffers[depth] = buffer = grown
+        buffer[start:length] = candles
+        return buffer[:length]
+
+    def viewRangeChanged(self):
+        """Called by pyqtgraph when the range of the view changed. The level
+        of detail is updated at the next paint, once the transform of the
+        item matches the new range.
+        """
+        self.update()
+
+    def update_level_of_detail(self):
+        """Choose the level of the pyramid for the current zoom and redraw
+        the candles if the level changed or if the visible range goes
+        outside the drawn candles.
+        """
+        view_rect = self.viewRect()
+        if view_rect is None:
+            return
+        level = self._choose_level(pixel_width=self.pixelWidth())
+        left, right = view_rect.left(), view_rect.right()
+        if (
+            self.picture is not None
+            and level == self._level
+            and self._window[0] <= left
+            and right <= self._window[1]
+        ):
+            return
+        # Draw one more view width on each side, so small pans don't need
+        # a new picture
+        self._level = level
+        self._window = (left - view_rect.width(), right + view_rect.width())
         self.generatePicture()
 
     def generatePicture(self):
+        """Draw the candles of the current level in the picture. Candles are
+        grouped by color, each group is drawn with one path for the wicks
+        and one path for the bodies built from arrays.
+        """
         self.picture = QtGui.QPicture()
         p = QtGui.QPainter(self.picture)
-        w = (self.data[1][0] - self.data[0][0]) / 3.0
-        for (t, open, close, min, max) in self.data:
-            if open > close:
-                p.setPen(pg.mkPen(self.down_color))
-                p.setBrush(pg.mkBrush(self.down_color))
-            else:
-                p.setPen(pg.mkPen(self.up_color))
-                p.setBrush(pg.mkBrush(self.up_color))
-            p.drawLine(QtCore.QPointF(t, min), QtCore.QPointF(t, max))
-            p.drawRect(QtCore.QRectF(t - w, open, w * 2, close - open))
+        data = self._get_drawn_candles()
+        if len(self.data) > 1 and len(data):
+            w = self._spacing * 2**self._level / 3.0
+            down = data[:, 1] > data[:, 2]
+            groups = ((~down, self.up_color), (down, self.down_color))
+            for mask, color in groups:
+                if not mask.any():
+                    continue
+                wicks, bodies = self._build_paths(data[mask], w)
+                p.setPen(pg.mkPen(color))
+                p.setBrush(pg.mkBrush(color))
+                p.drawPath(wicks)
+                p.drawPath(bodies)
         p.end()
 
+    def _get_drawn_candles(self):
+        """Return the candles of the current level inside the drawn window
+
+        :return: The candles (time, open, close, min, max)
+        :rtype: np.array
+        """
+        data = self._get_level(self._level)
+        if self._window is None:
+            return data
+        start, end = np.searchsorted(data[:, 0], self._window)
+        return data[max(start - 1, 0) : end + 1]
+
+    def _choose_level(self, pixel_width):
+        """Return the first level of the pyramid with enough pixels between
+        two candles
+
+        :param pixel_width: The width of a pixel in data coordinates
+        :type pixel_width: float
+        :return: The level
+        :rtype: int
+        """
+        if not pixel_width or self._spacing <= 0:
+            return 0
+        ratio = self.MIN_CANDLE_SPACING * pixel_width / self._spacing
+        if ratio <= 1:
+            return 0
+        max_level = int(math.log2(max(len(self.data), 1)))
+        return min(int(math.ceil(math.log2(ratio))), max_level)
+
+    def _get_level(self, level):
+        """Return the candles of the given level of the pyramid, the missing
+        levels are built from the previous ones
+
+        :param level: The level, 0 is the raw data
+        :type level: int
+        :return: The candles (time, open, close, min, max)
+        :rtype: np.array
+        """
+        while len(self._levels) <= level:
+            self._levels.append(aggregate_candles(self._levels[-1]))
+            self._buffers.append(self._levels[-1])
+        return self._levels[level]
+
+    def _compute_bounds(self):
+        """Compute the bounds of all candles, whatever is drawn
+
+        :return: The bounds
+        :rtype: QtCore.QRectF
+        """
+        if not len(self.data):
+            return QtCore.QRectF()
+        return self._get_bounds(self.data)
+
+    def _get_bounds(self, data):
+        """Compute the bounds of the given candles
+
+        :param data: The candles (time, open, close, min, max)
+        :type data: np.array
+        :return: The bounds
+        :rtype: QtCore.QRectF
+        """
+        w = self._spacing / 3.0
+        prices = data[:, 1:]
+        y_min, y_max = np.nanmin(prices), np.nanmax(prices)
+        return QtCore.QRectF(
+            data[0][0] - w,
+            y_min,
+            data[-1][0] - data[0][0] + 2 * w,
+            y_max - y_min,
+        )
+
+    @staticmethod
+    def _build_paths(data, w):
+        """Build the paths of the wicks and the bodies of the given candles
+
+        :param data: The candles (time, open, close, min, max)
+        :type data: np.array
+        :param w: The half width of a body
+        :type w: float
+        :return: The path of the wicks and the path of the bodies
+        :rtype: tuple
+        """
+        t, open_, close, min_, max_ = data.T
+
+        # One segment per wick
+        wicks = pg.arrayToQPath(
+            np.repeat(t, 2),
+            np.column_stack((min_, max_)).ravel(),
+            connect="pairs",
+        )
+
+        # One closed rectangle of 5 points per body
+        x = np.column_stack((t - w, t + w, t + w, t - w, t - w)).ravel()
+        y = np.column_stack((open_, open_, close, close, open_)).ravel()
+        connect = np.ones(len(x), dtype=np.int32)
+        connect[4::5] = 0
+        bodies = pg.arrayToQPath(x, y, connect=connect)
+
+        return wicks, bodies
+
     def paint(self, p, *args):
+        self.update_level_of_detail()
+        if self.picture is None:
+            self.generatePicture()
         p.drawPicture(0, 0, self.picture)
 
     def boundingRect(self):
-        return QtCore.QRectF(self.picture.boundingRect())
+        return QtCore.QRectF(self._bounds)
+
+
+def aggregate_candles(data, factor=2):
+    """Merge each group of consecutive candles into one OHLC candle
+
+    :param data: The candles (time, open, close, min, max)
+    :type data: np.array
+    :param factor: The number of merged candles, defaults to 2
+    :type factor: int, optional
+    :return: The merged candles (time, open, close, low, high), the time
+    of a merged candle is the middle of its group
+    :rtype: np.array
+    """
+    if not len(data):
+        return data
+    starts = np.arange(0, len(data), factor)
+    ends = np.minimum(starts + factor, len(data)) - 1
+    low = np.fmin(data[:, 3], data[:, 4])
+    high = np.fmax(data[:, 3], data[:, 4])
+    return np.column_stack(
+        (
+            (data[starts, 0] + data[ends, 0]) / 2.0,
+            data[starts, 1],
+            data[ends, 2],
+            np.fmin.reduceat(low, starts),
+            np.fmax.reduceat(high, starts),
+        )
+    )
@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+
+from utils import utils
+
+
+class Dataset(object):
+    """Arrays derived from the history loaded in the graph.
+
+    The x axis (epoch seconds) and the columns as float64 arrays are
+    computed the first time they are asked, then shared by the quotation
+    plot and all indicators until another history is loaded.
+
+    The live bars (see set_last and append) are written in place: each array
+    is the start of a buffer with room for the next bars, and the history is
+    only built again when it is asked.
+    """
+
+    def __init__(self, data):
+        """Create the dataset
+
+        :param data: The history of the ticker
+        :type data: pd.DataFrame
+        """
+        # Constants
+        self._data = data
+        self._length = len(data)
+        # The live changes of the last bar of the history, and the bars
+        # appended after it, see data
+        self._last = {}
+        self._appended = []
+        # The buffers of the arrays, by name
+        self._buffers = {}
+        self._x = None
+        self._columns = {}
+
+    @property
+    def data(self):
+        """Return the history of the ticker, with the live bars
+
+        :return: The history
+        :rtype: pd.DataFrame
+        """
+        if self._last:
+            data = self._data.copy()
+            for column, value in self._last.items():
+                if column in data:
+                    data.iloc[-1, data.columns.get_loc(column)] = value
+            self._data = data
+            self._last = {}
+        if self._appended:
+            index = self._data.index
+            rows = pd.DataFrame(
+                [values for _, values in self._appended],
+                index=pd.DatetimeIndex(
+                    [time for time, _ in self._appended], name=index.name
+                ),
+                columns=self._data.columns,
+            )
+            self._data = pd.concat([self._data, rows.fillna(0.0)])
+            self._appended = []
+        return self._data
+
+    @property
+    def last_time(self):
+        """Return the time of the last bar
+
+        :return: The time, None if there is no bar
+        :rtype: pd.Timestamp
+        """
+        if self._appended:
+            return self._appended[-1][0]
+        return self._data.index[-1] if len(self._data) else None
+
+    @property
+    def x(self) -> np.ndarray:
+        """Return the x axis of all plots, the epoch seconds of each bar
+
+        :return: The epoch seconds
+        :rtype: np.array of float64
+        """
+        if self._x is None:
+            self._x = self._set_buffer(
+                "x", utils.index_to_timestamps(self.data.index)
+            )
+        return self._x
+
+    def set_last(self, bar: dict):
+        """Replace values of the last bar, in place
+
+        :param bar: The new values by column (Close, High, ...)
+        :type bar: dict
+        """
+        if self._appended:
+            self._appended[-1][1].update(bar)
+        else:
+            self._last.update(bar)
+        for column, values in self._columns.items():
+            if column in bar:
+                values[-1] = bar[column]
+
+    def append(self, time, bar: dict):
+        """Append a bar after the last one, the arrays grow in their buffers
+
+        :param time: The time of the bar
+        :type time: pd.Timestamp
+        :param bar: The values of the bar by column, the other columns are 0
+        :type bar: dict
+        """
+        self._appended.append((time, dict(bar)))
+        self._length += 1
+        if self._x is not None:
+            self._x = self._append_value(
+                "x", utils.index_to_timestamps(pd.DatetimeIndex([time]))[0]
+            )
+        for column in self._columns:
+            self._columns[column] = self._append_value(
+                column, bar.get(column, 0.0)
+            )
+
+    def extend(self, data, start: int):
+        """Create the dataset of a history which extends this one. The bars
+        before the start are reused, only the next ones are converted.
+
+        :param data: The extended history
+        :type data: pd.DataFrame
+        :param start: The position of the first changed bar
+        :type start: int
+        :return: The dataset of the extended history
+        :rtype: Dataset
+        """
+        dataset = Dataset(data)
+        if self._x is not None:
+            dataset._x = dataset._set_buffer(
+                "x",
+                np.concatenate(
+                    (
+                        self._x[:start],
+                        utils.index_to_timestamps(data.index[start:]),
+                    )
+                ),
+            )
+        for column, values in self._columns.items():
+            if column not in data:
+                continue
+            dataset._columns[column] = dataset._set_buffer(
+                column,
+                np.concatenate(
+                    (values[:start], data[column].iloc[start:].to_numpy(float))
+                ),
+            )
+        return dataset
+
+    def _set_buffer(self, name: str, values) -> np.ndarray:
+        """Keep a copy of the values as the buffer of the array of the name
+
+        :param name: The name of the array
+        :type name: str
+        :param values: The values
+        :type values: np.array
+        :return: The array
+        :rtype: np.array of float64
+        """
+        self._buffers[name] = np.array(values, dtype=float)
+        return self._buffers[name]
+
+    def _append_value(self, name: str, value: float) -> np.ndarray:
+        """Write the value after the array of the name, its buffer is
+        doubled when it is full
+
+        :param name: The name of the array
+        :type name: str
+        :param value: The value
+        :type value: float
+        :return: The array, with the value
+        :rtype: np.array of float64
+        """
+        buffer = self._buffers[name]
+        if self._length > len(buffer):
+            grown = np.empty(max(self._length, 2 * len(buffer)))
+            grown[: len(buffer)] = buffer
+            self._buffers[name] = buffer = grown
+        buffer[self._length - 1] = value
+        return buffer[: self._length]
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Return the column of the history as a float64 array
+
+        :param column: The name of the column
+        :type column: str
+        :return: The values of the column
+        :rtype: np.array of float64
+        """
+        if column not in self._columns:
+            self._columns[column] = self._set_buffer(
+                column, self.data[column].to_numpy(dtype=float)
+            )
+        return self._columns[column]
+
+    def __len__(self):
+        return self._length
@@ -1,7 +1,10 @@
+import numpy as np
+import pandas as pd
 import pyqtgraph as pg
 from PySide2 import QtCore, QtGui, QtWidgets
 
 from libs.graph.candlestick import CandlestickItem
+from libs.graph.dataset import Dataset
 from utils import utils
 
 # TODO import from palette or Qss
@@ -15,7 +18,8 @@ class GraphView(pg.GraphicsLayoutWidget):
         super(GraphView, self).__init__(parent=parent)
 
         # Constants
-        self.values = None
+        self.dataset = None
+        self.candlestick = None
         self.v_line = None
         self.h_line = None
 
@@ -25,6 +29,15 @@ class GraphView(pg.GraphicsLayoutWidget):
 
         self.set_cross_hair()
 
+    @property
+    def values(self):
+        """Return the plotted history, with the live bars
+
+        :return: The history, None if nothing is plotted
+        :rtype: pd.dataframe
+        """
+        return self.dataset.data if self.dataset is not None else None
+
     def plot_quotation(self, data, clear=True):
         """Plot the quotation
 
@@ -33,27 +46,123 @@ class GraphView(pg.GraphicsLayoutWidget):
         :param clear: Clear the graph before plot, defaults to True
         :type clear: bool, optional
         """
-        self.values = data
+        self.dataset = Dataset(data)
         if clear:
             self.g_quotation.clear()
-        ls_data = []
-        dates = [x.timestamp() for x in data.index]
-        for index, (_time, _open, _close, _high, _low) in enumerate(
-            zip(
-                data.index,
-                data["Open"].values,
-                data["Close"].values,
-                data["High"].values,
-                data["Low"].values,
-            )
-        ):
-            ls_data.append((dates[index], _open, _close, _high, _low))
-        item = CandlestickItem(ls_data)
-        self.g_quotation.addItem(item)
+        self.candlestick = CandlestickItem(self._get_candles())
+        self.g_quotation.addItem(self.candlestick)
         self.g_quotation.enableAutoRange()
         self.set_time_x_axis(widget=self.g_quotation)
         self.set_cross_hair()
 
+    def update_quotation(self, data):
+        """Update the plotted quotation with a history which extends it,
+        the bars before the last plotted one must be unchanged. Only the
+        changed bars are converted and aggregated again.
+
+        :param data: The extended history
+        :type data: pd.dataframe
+        :return: The position of the first changed bar, None if the history
+        doesn't extend the plotted one (then nothing is updated)
+        :rtype: int
+        """
+        start = self._get_update_start(data)
+        if start is None:
+            return None
+        self.dataset = self.dataset.extend(data, start)
+        self.candlestick.update_candles(self._get_candles(), start)
+        return start
+
+    def update_last_bar(self, bar: dict):
+        """Update the quotation with a live bar. The bar replaces the last
+        one when they have the same time, it is appended when it is after.
+        The bar is written in place in the dataset and the candles, the cost
+        doesn't depend on the length of the history.
+
+        :param bar: The bar, with the keys time, Open, High, Low, Close and
+        Volume
+        :type bar: dict
+        :return: The position of the first changed bar, None if the bar is
+        before the last one (then nothing is updated)
+        :rtype: int
+        """
+        if self.dataset is None or not len(self.dataset):
+            return None
+        last_time = self.dataset.last_time
+        time = pd.Timestamp(bar["time"])
+        if last_time.tz is not None:
+            time = time.tz_convert(last_time.tz)
+        elif time.tzinfo is not None:
+            time = time.tz_localize(None)
+        if time < last_time:
+            return None
+
+        start = len(self.dataset) - 1
+        if time > last_time:
+            self.dataset.append(
+                time,
+                {
+                    column: bar[column]
+                    for column in ("Open", "High", "Low", "Close", "Volume")
+                },
+            )
+        else:
+            # The quote may have been fetched before the stored bar
+            self.dataset.set_last(
+                {
+                    "High": max(self.dataset["High"][-1], bar["High"]),
+                    "Low": min(self.dataset["Low"][-1], bar["Low"]),
+                    "Close": bar["Close"],
+                    "Volume": max(self.dataset["Volume"][-1], bar["Volume"]),
+                }
+            )
+        self.candlestick.set_candles(self._get_candles(start), start)
+        return start
+
+    def _get_update_start(self, data):
+        """Return the position of the first bar of the history which may
+        differ from the plotted quotation. The last plotted bar may have
+        been plotted before the close, it is always updated.
+
+        :param data: The new history
+        :type data: pd.dataframe
+        :return: The position, None if the history doesn't extend the
+        plotted one
+        :rtype: int
+        """
+        if self.values is None or self.candlestick is None:
+            return None
+        start = len(self.values) - 1
+        if start < 0 or len(data) <= start:
+            return None
+        if not data.index[:start].equals(self.values.index[:start]):
+            return None
+        if not np.array_equal(
+            data["Open"].iloc[:start].to_numpy(float),
+            self.dataset["Open"][:start],
+            equal_nan=True,
+        ):
+            return None
+        return start
+
+    def _get_candles(self, start=0):
+        """Return the candles of the dataset, for the CandlestickItem
+
+        :param start: The position of the first candle, defaults to 0
+        :type start: int, optional
+        :return: The candles (time, open, close, low, high)
+        :rtype: np.array
+        """
+        return np.column_stack(
+            (
+                self.dataset.x[start:],
+                self.dataset["Open"][start:],
+                self.dataset["Close"][start:],
+                self.dataset["Low"][start:],
+                self.dataset["High"][start:],
+            )
+        )
+
     def set_cross_hair(self):
         """Set the cross hair"""
         color = (200, 200, 200)
@@ -0,0 +1,125 @@
+from PySide2 import QtCore
+
+from libs.events_handler import EventHandler
+from libs.scheduler import PRIORITY_VISIBLE, get_scheduler
+
+
+class IndicatorComputer(QtCore.QObject):
+    """Compute the indicators out of the GUI thread.
+
+    The compute step of an indicator (see Indicator.compute), or the
+    continuation of its last results when bars have been appended (see
+    Indicator.compute_update), is a task of the scheduler, it runs in a
+    thread or in the worker processes of the sandbox. Only the last request
+    of each indicator counts: the task of the previous one is cancelled, it
+    is removed from the pool if it is not started and its results are
+    dropped otherwise, so browsing tickers quickly never piles up
+    computations. The results are emitted by
+    sig_indicator_computed in the GUI thread, where they are rendered.
+    """
+
+    def __init__(self, parent=None, sandbox=None, scheduler=None):
+        """Create the computer
+
+        :param parent: The parent object, defaults to None
+        :type parent: QtCore.QObject, optional
+        :param sandbox: The sandbox used for the sandboxed requests, defaults
+        to None
+        :type sandbox: Sandbox, optional
+        :param scheduler: The scheduler of the tasks, defaults to None (the
+        scheduler of the application)
+        :type scheduler: Scheduler, optional
+        """
+        super(IndicatorComputer, self).__init__(parent)
+
+        # Constants
+        self.signals = EventHandler()
+        self._sandbox = sandbox
+        self._scheduler = scheduler or get_scheduler()
+        # The task of the last request of each indicator
+        self._requests = {}
+
+    def compute(self, indicator, graph_view, sandboxed=False, start=None):
+        """Compute the indicator on the quotation of the graph, the previous
+        request of the indicator is replaced
+
+        :param indicator: The indicator, it must implement compute
+        :type indicator: Indicator
+        :param graph_view: The graph view
+        :type graph_view: GraphView
+        :param sandboxed: Compute in the sandbox, defaults to False
+        :type sandboxed: bool, optional
+        :param start: The position of the first changed bar, the rendered
+        results are continued from it when possible, defaults to None (all
+        bars are computed)
+        :type start: int, optional
+        """
+        self.cancel(indicator)
+        previous = None
+        if start is not None and indicator.can_update(start):
+            previous = indicator.results
+        task = self._scheduler.submit(
+            self._compute,
+            priority=PRIORITY_VISIBLE,
+            group="indicators",
+            indicator=indicator,
+            values=indicator.get_inputs(
+                graph_view, start=previous["committed"] if previous else 0
+            ),
+            parameters=indicator.parameters(),
+            sandboxed=sandboxed and self._sandbox is not None,
+            previous=previous,
+        )
+        task.add_done_callback(self._on_task_done)
+        self._requests[indicator] = task
+
+    def cancel(self, indicator):
+        """Cancel the request of the indicator, it is removed from the pool
+        if it is not started and its results are dropped otherwise
+
+        :param indicator: The indicator
+        :type indicator: Indicator
+        """
+        task = self._requests.pop(indicator, None)
+        if task is not None:
+            task.cancel()
+
+    def _compute(self, indicator, values, parameters, sandboxed, previous):
+        """Compute the indicator, called from the scheduler
+
+        :param indicator: The indicator
+        :type indicator: Indicator
+        :param values: The columns of the quotation
+        :type values: dict of np.array
+        :param parameters: The values of the fields of the indicator
+        :type parameters: dict
+        :param sandboxed: Compute in the sandbox
+        :type sandboxed: bool
+        :param previous: The results continued by compute_update, None to
+        compute all bars
+        :type previous: dict
+        :return: The results of the compute
+        :rtype: dict
+        """
+        if sandboxed:
+            return self._sandbox.compute(
+                indicator, values, parameters, previous=previous
+            )
+        if previous is not None:
+            return indicator.compute_update(values, parameters, previous)
+        return indicator.compute(values, parameters)
+
+    def _on_task_done(self, task):
+        """Called when the task of a request is done, failed or cancelled,
+        the results are emitted if it is still the last request of the
+        indicator
+
+        :param task: The task
+        :type task: Task
+        """
+        indicator = task.kwargs["indicator"]
+        if self._requests.get(indicator) is not task:
+            return
+        del self._requests[indicator]
+        if task.error is None and task.result is not None:
+            self.signals.sig_indicator_computed.emit(indicator, task.result)
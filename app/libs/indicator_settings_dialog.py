@@ -4,6 +4,7 @@ from ui.indicator_settings_dialog import Ui_IndicatorSettingsDialogWindow
 from ui.indicator_setting_style_widget import Ui_IndicatorStyleSettingWidget
 from ui.indicator_setting_input_widget import Ui_IndicatorInputSettingWidget
 from libs.events_handler import EventHandler
+from libs.thread_pool import ThreadPool
 from utils.indicators_utils import ChoiceField, InputField
 from utils import utils
 
@@ -18,12 +19,24 @@ class IndicatorSettingsDialogWindow(
 
         # Constant
         self._current_indicator = None
+        self._optimized_indicator = None
+        self._optimization = None
         self.signals = EventHandler()
+        self.thread_pool = ThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
 
         # Signals
         self.pub_cancel.clicked.connect(self._on_canceled)
         self.pub_ok.clicked.connect(self._on_ok)
         self.pub_reset.clicked.connect(self._on_reset)
+        self.pub_optimize.clicked.connect(self._on_optimize_clicked)
+        self.tbw_optimization.itemDoubleClicked.connect(
+            self._on_optimization_chosen
+        )
+        self.thread_pool.signals.sig_thread_result.connect(self._on_optimized)
+        self.thread_pool.signals.sig_thread_post.connect(
+            self._on_optimization_finished
+        )
 
     @property
     def indicator(self):
@@ -46,22 +59,36 @@ class IndicatorSettingsDialogWindow(
         self.build_settings(indicator=indicator)
         super(IndicatorSettingsDialogWindow, self).show()
 
-    def build_settings(self, indicator):
+    def build_settings(self, indicator, values=None):
         """Build settings widget with all parameters of the indicator
 
         :param indicator: The indicator
         :type indicator: Indicator
+        :param values: The values displayed instead of the values of the
+        fields, by attribute name, they are set on the fields on OK,
+        defaults to None
+        :type values: dict, optional
         """
+        values = values or {}
         self.lst_inputs.clear()
         self.lst_styles.clear()
+        if indicator is not self._current_indicator:
+            self.tbw_optimization.clear()
+            self.tbw_optimization.setRowCount(0)
+            self.tbw_optimization.setColumnCount(0)
         self._current_indicator = indicator
+        self.pub_optimize.setEnabled(
+            bool(indicator.strategy_name) and not self._optimized_indicator
+        )
         for _field in indicator.fields:
             # TODO Refacto this
             if isinstance(_field, InputField):
                 if _field.value is not None:
                     item = QtWidgets.QListWidgetItem()
                     self.lst_inputs.addItem(item)
-                    wgt_input = IndicatorInputSettingWidget(field=_field)
+                    wgt_input = IndicatorInputSettingWidget(
+                        field=_field, value=values.get(_field.attribute_name)
+                    )
                     item.setSizeHint(wgt_input.sizeHint())
                     self.lst_inputs.setItemWidget(item, wgt_input)
 
@@ -82,6 +109,31 @@ class IndicatorSettingsDialogWindow(
             else:
                 ...
 
+    def build_optimization(self, table, rows=20):
+        """Build the table of the best combinations of an optimization
+
+        :param table: The combinations ranked by their metric
+        :type table: pd.DataFrame
+        :param rows: The number of combinations displayed, defaults to 20
+        :type rows: int, optional
+        """
+        self._optimization = table.head(rows)
+        self.tbw_optimization.clear()
+        self.tbw_optimization.setRowCount(len(self._optimization))
+        self.tbw_optimization.setColumnCount(len(table.columns))
+        self.tbw_optimization.setHorizontalHeaderLabels(list(table.columns))
+        for row, values in enumerate(self._optimization.itertuples(False)):
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem("{:.4g}".format(value))
+                self.tbw_optimization.setItem(row, column, item)
+        self.tbw_optimization.resizeColumnsToContents()
+
+    def apply_inputs(self):
+        """Set the values displayed by the input widgets on the fields"""
+        for row in range(self.lst_inputs.count()):
+            widget = self.lst_inputs.itemWidget(self.lst_inputs.item(row))
+            widget.apply()
+
     def reset_settings_default(self):
         """Reset all fields to default values"""
         for field in self.indicator.fields:
@@ -97,9 +149,84 @@ class IndicatorSettingsDialogWindow(
     @QtCore.Slot()
     def _on_ok(self):
         """Called on clicked on OK button"""
+        self.apply_inputs()
         self.signals.sig_indicator_settings_validated.emit(self.indicator)
         self.close()
 
+    @QtCore.Slot()
+    def _on_optimize_clicked(self):
+        """Called on clicked on Optimize button, the strategy of the
+        indicator is backtested in the thread pool"""
+        main_window = utils.get_main_window_instance()
+        values = main_window.wgt_graph.graph.values if main_window else None
+        if values is None or not self.indicator.strategy_name:
+            return
+        self._optimized_indicator = self.indicator
+        self.pub_optimize.setEnabled(False)
+        self.lab_optimization.setText("Optimization in progress...")
+        self.thread_pool.execution(
+            function=self.indicator.optimize, values=values, apply=False
+        )
+
+    @QtCore.Slot(object)
+    def _on_optimized(self, table):
+        """Called when the optimization is done, the best parameters are
+        displayed. They are set on the indicator on OK, nothing is changed
+        if the dialog has been cancelled or shows another indicator.
+
+        :param table: The combinations ranked by their metric
+        :type table: pd.DataFrame
+        """
+        indicator = self._optimized_indicator
+        if table is None or table.empty or indicator is not self.indicator:
+            return
+        self.build_optimization(table)
+        self.tbw_optimization.selectRow(0)
+        self.build_settings(
+            indicator=indicator,
+            values=self._get_field_values(table.iloc[0].to_dict()),
+        )
+
+    @QtCore.Slot()
+    def _on_optimization_finished(self):
+        """Called when the optimization is done or failed"""
+        self._optimized_indicator = None
+        self.lab_optimization.setText(
+            "Backtest the strategy around the current values"
+        )
+        if self.indicator:
+            self.pub_optimize.setEnabled(bool(self.indicator.strategy_name))
+
+    @QtCore.Slot(object)
+    def _on_optimization_chosen(self, item: QtWidgets.QTableWidgetItem):
+        """Called on double click on a combination, its parameters are set
+        on the indicator and the indicator is drawn again
+
+        :param item: The clicked item
+        :type item: QtWidgets.QTableWidgetItem
+        """
+        parameters = self._optimization.iloc[item.row()].to_dict()
+        self.apply_inputs()
+        self.indicator.set_strategy_parameters(parameters)
+        self.build_settings(indicator=self.indicator)
+        self.signals.sig_indicator_settings_validated.emit(self.indicator)
+
+    def _get_field_values(self, parameters: dict) -> dict:
+        """Return the values of the fields of the current indicator for the
+        parameters of its strategy
+
+        :param parameters: The value of each parameter
+        :type parameters: dict
+        :return: The value of each field, by attribute name
+        :rtype: dict
+        """
+        strategy_fields = self.indicator.strategy_fields
+        return {
+            attribute_name: parameters[parameter]
+            for attribute_name, parameter in strategy_fields.items()
+            if parameter in parameters
+        }
+
     @QtCore.Slot()
     def _on_reset(self):
         """Called on clicked on Reset settings button"""
@@ -113,7 +240,7 @@ class IndicatorSettingsDialogWindow(
 class IndicatorInputSettingWidget(
     QtWidgets.QWidget, Ui_IndicatorInputSettingWidget
 ):
-    def __init__(self, field, parent=None):
+    def __init__(self, field, parent=None, value=None):
         super(IndicatorInputSettingWidget, self).__init__(parent)
 
         self.setupUi(self)
@@ -121,16 +248,20 @@ class IndicatorInputSettingWidget(
         # Constans
         self._field = field
 
-        # Init Ui from field values
+        # Init Ui from field values, or from the given value
         self.lab_field_name.setText(self._field.attribute_name)
 
         if self._field.value_type is int:
-            self.spi_value_int.setValue(self._field.value)
+            if value is None:
+                value = self._field.value
+            self.spi_value_int.setValue(int(value))
             self.spi_value_double.hide()
             self.cob_value_list.hide()
         elif self._field.value_type is float:
+            if value is None:
+                value = self._field.value
             self.spi_value_int.hide()
-            self.spi_value_double.setValue(self._field.value)
+            self.spi_value_double.setValue(float(value))
             self.cob_value_list.hide()
         elif self._field.value_type in [list, tuple]:
             self.spi_value_int.hide()
@@ -145,6 +276,15 @@ class IndicatorInputSettingWidget(
             self._on_value_choice_changed
         )
 
+    def apply(self):
+        """Set the displayed value on the field"""
+        if self._field.value_type is int:
+            self._field.value = self.spi_value_int.value()
+        elif self._field.value_type is float:
+            self._field.value = self.spi_value_double.value()
+        elif self._field.value_type in [list, tuple]:
+            self._field.current = self.cob_value_list.currentText()
+
     @QtCore.Slot(int)
     def _on_value_changed(self, value):
         """Called on value changed in the spinbox
@@ -1,3 +1,4 @@
+import os
 import json
 from PySide2 import QtGui, QtCore, QtWidgets
 
@@ -12,6 +13,9 @@ from libs.widgets.pushbutton import (
 from ui import indicators_widget
 from utils.indicators_utils import Indicator
 
+# Time in ms to wait after the last change of a file before reloading it
+RELOAD_DELAY = 200
+
 
 class IndicatorsWidget(
     QtWidgets.QWidget, indicators_widget.Ui_IndicatorsWidget
@@ -33,10 +37,22 @@ class IndicatorsWidget(
         # Init customs signals
         self.signals = EventHandler()
 
+        # Watch the files of the add-ons, the changed modules are reloaded
+        # once the files have been saved (see RELOAD_DELAY)
+        self._changed_files = set()
+        self._plugin_files = {}
+        self._file_watcher = QtCore.QFileSystemWatcher(self)
+        self._reload_timer = QtCore.QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(RELOAD_DELAY)
+
         self.tab_indicators.set_header()
         self.build_indicators()
+        self.watch_plugins()
 
         # Signals
+        self._file_watcher.fileChanged.connect(self._on_plugin_file_changed)
+        self._reload_timer.timeout.connect(self._on_reload_timeout)
         self.lie_indicators_search.textChanged.connect(
             self.tab_indicators.search_items
         )
@@ -76,6 +92,68 @@ class IndicatorsWidget(
         """Reload all indicators"""
         self._indicators_collection.reload_plugins()
         self.build_indicators()
+        self.watch_plugins()
+
+    def watch_plugins(self):
+        """Watch the files of the modules of the indicators"""
+        files = self._file_watcher.files()
+        if files:
+            self._file_watcher.removePaths(files)
+        self._plugin_files = self._indicators_collection.get_module_files()
+        if self._plugin_files:
+            self._file_watcher.addPaths(list(self._plugin_files))
+
+    def reload_module(self, module: str):
+        """Reload the module of indicators, its enabled indicators are
+        drawn again with the new code and the others are not touched
+
+        :param module: The full name of the module
+        :type module: str
+        """
+        replaced = self._indicators_collection.reload_module(module)
+        if not replaced:
+            return
+        for old, new in replaced:
+            if old is not None and old.enabled:
+                self.signals.sig_indicator_switched.emit(old, False)
+                if new is not None:
+                    self.signals.sig_indicator_switched.emit(new, True)
+            if (
+                old is not None
+                and old is self.indicator_settings_dialog.indicator
+                and self.indicator_settings_dialog.isVisible()
+            ):
+                if new is not None:
+                    self.indicator_settings_dialog.build_settings(new)
+                else:
+                    self.indicator_settings_dialog.close()
+
+        # A class has been added or removed, all the rows move
+        if any(old is None or new is None for old, new in replaced):
+            self.build_indicators()
+            return
+        for old, new in replaced:
+            self.replace_indicator_row(old, new)
+
+    def replace_indicator_row(self, old: Indicator, new: Indicator):
+        """Set the new indicator in the row of the old one, the state of the
+        buttons is kept
+
+        :param old: The replaced indicator
+        :type old: Indicator
+        :param new: The new indicator
+        :type new: Indicator
+        """
+        for row in range(self.tab_indicators.rowCount()):
+            active_button = self.tab_indicators.cellWidget(row, 2)
+            if active_button is None or active_button.indicator is not old:
+                continue
+            active_button.indicator = new
+            self.tab_indicators.cellWidget(row, 1).indicator = new
+            name_item = self.tab_indicators.item(row, 0)
+            name_item.setText(new.name)
+            name_item.setToolTip(new.description)
+            return
 
     @property
     def indicators(self) -> list:
@@ -86,6 +164,32 @@ class IndicatorsWidget(
         """
         return self._indicators_collection.plugins
 
+    @QtCore.Slot(str)
+    def _on_plugin_file_changed(self, path: str):
+        """Called when the file of a module of indicators changed, the
+        reload waits for the end of the saving
+
+        :param path: The file
+        :type path: str
+        """
+        self._changed_files.add(path)
+        self._reload_timer.start()
+
+    @QtCore.Slot()
+    def _on_reload_timeout(self):
+        """Called once the changed files have been saved, their modules are
+        reloaded"""
+        changed_files, self._changed_files = self._changed_files, set()
+        for path in changed_files:
+            # Editors which save in a new file remove the watched one
+            if path not in self._file_watcher.files():
+                if not os.path.exists(path):
+                    continue
+                self._file_watcher.addPath(path)
+            module = self._plugin_files.get(path)
+            if module:
+                self.reload_module(module)
+
     @QtCore.Slot(object)
     def _on_settings_clicked(self, indicator: Indicator):
         """Called when the setting button of an indicator is clicked
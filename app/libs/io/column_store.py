@@ -0,0 +1,122 @@
+"""Columnar file format for series of the same length (price histories).
+
+A file starts with a magic string, the size of a JSON header and the header
+itself, which describes the length of the series, the name, dtype and
+offset of each column and free attributes. Each column is then stored as a
+contiguous block aligned on 64 bytes, so it can be read zero-copy through
+a numpy.memmap.
+"""
+import os
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b"COLSTOR1"
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    """Return the first aligned offset after the given offset
+
+    :param offset: The offset to align
+    :type offset: int
+    :return: The aligned offset
+    :rtype: int
+    """
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_columns(path: str, columns: dict, attributes: dict = None):
+    """Write the columns in a file. The file is written next to the
+    destination then moved, so readers never see a partial file.
+
+    :param path: The path of the file
+    :type path: str
+    :param columns: The columns to write, all of the same length
+    :type columns: dict of np.array
+    :param attributes: Attributes saved in the header, defaults to None
+    :type attributes: dict, optional
+    :raises ValueError: If the columns don't have the same length
+    """
+    arrays = {
+        name: np.ascontiguousarray(values) for name, values in columns.items()
+    }
+    lengths = {len(values) for values in arrays.values()}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length")
+    length = lengths.pop() if lengths else 0
+
+    # The header size depends on the offsets, which depend on the header
+    # size. Reserve room for the offsets before computing them
+    header = {
+        "length": length,
+        "attributes": attributes or {},
+        "columns": [
+            {"name": name, "dtype": values.dtype.str, "offset": 0}
+            for name, values in arrays.items()
+        ],
+    }
+    reserved = len(json.dumps(header)) + 20 * len(arrays)
+    offset = _align(len(MAGIC) + 8 + reserved)
+    for column, values in zip(header["columns"], arrays.values()):
+        column["offset"] = offset
+        offset = _align(offset + values.nbytes)
+    header_data = json.dumps(header).encode("utf-8")
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_data)))
+        f.write(header_data)
+        for column, values in zip(header["columns"], arrays.values()):
+            f.seek(column["offset"])
+            f.write(values.tobytes())
+        f.truncate(offset)
+    os.replace(temp_path, path)
+
+
+def read_header(path: str) -> dict:
+    """Read the header of the file
+
+    :param path: The path of the file
+    :type path: str
+    :raises ValueError: If the file is not a column store
+    :return: The header
+    :rtype: dict
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("%s is not a column store" % path)
+        (size,) = struct.unpack("<Q", f.read(8))
+        return json.loads(f.read(size).decode("utf-8"))
+
+
+def read_columns(path: str) -> tuple:
+    """Read the columns of the file. Columns are read-only views on a
+    memory map of the file, nothing is copied until they are used.
+
+    :param path: The path of the file
+    :type path: str
+    :return: The columns and the attributes
+    :rtype: tuple (dict of np.array, dict)
+    """
+    header = read_header(path)
+    length = header["length"]
+    if not length:
+        columns = {
+            column["name"]: np.empty(0, dtype=column["dtype"])
+            for column in header["columns"]
+        }
+        return columns, header["attributes"]
+
+    memory_map = np.memmap(path, dtype=np.uint8, mode="r")
+    columns = {}
+    for column in header["columns"]:
+        columns[column["name"]] = np.frombuffer(
+            memory_map,
+            dtype=np.dtype(column["dtype"]),
+            count=length,
+            offset=column["offset"],
+        )
+    return columns, header["attributes"]
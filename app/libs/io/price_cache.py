@@ -0,0 +1,292 @@
+import os
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from libs.io import column_store
+
+
+class PriceCache(object):
+    """Local store for the price history of tickers.
+
+    Every ticker and interval is kept in its own columnar file under the
+    APP_HOME (see column_store): the timestamps as int64 epoch seconds and
+    each column of the history as a contiguous array. When a history is
+    requested, the stored bars are served directly and only the bars after
+    the last stored one are downloaded. The requested start of the stored
+    history is kept in the header of the file, the history is downloaded
+    again only when an earlier start is requested.
+    """
+
+    def __init__(self, max_age=60):
+        """Create the price cache
+
+        :param max_age: Number of seconds during which a stored history is
+        served without asking the API for new bars, defaults to 60
+        :type max_age: int, optional
+        """
+        # Constants
+        self._app_home = os.environ.get("APP_HOME")
+        self._cache_path = os.path.join(self._app_home, "cache", "prices")
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        self._file_locks = {}
+
+    def get_history(self, ticker: str, interval="1d", start="2018-01-01"):
+        """Get the history of the ticker, from the cache when possible.
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param interval: The interval of bars, defaults to "1d"
+        :type interval: str, optional
+        :param start: The first date of the history, defaults to "2018-01-01"
+        :type start: str, optional
+        :return: The history of the ticker
+        :rtype: pd.DataFrame
+        """
+        with self._get_file_lock(ticker=ticker, interval=interval):
+            cached, attributes = self._load(ticker=ticker, interval=interval)
+            stored_start = attributes.get("start")
+            saved_start = start
+            if cached is None or cached.empty or stored_start is None:
+                data = self._fetch(ticker, interval=interval, start=start)
+            elif self._to_timestamp(start, cached.index) < self._to_timestamp(
+                stored_start, cached.index
+            ):
+                # The stored history doesn't go back far enough
+                data = self._fetch(ticker, interval=interval, start=start)
+            elif self._is_fresh(ticker=ticker, interval=interval):
+                data = cached
+            else:
+                # Download from the last stored bar, it may have been
+                # stored before the close of the market
+                tail = self._fetch(
+                    ticker, interval=interval, start=cached.index[-1]
+                )
+                data = self._merge(cached, tail)
+                if data is cached:
+                    # No new bar, the stored history is up to date
+                    self._touch(ticker=ticker, interval=interval)
+                saved_start = stored_start
+
+            if data is None or data.empty:
+                return cached if cached is not None else pd.DataFrame()
+            if data is not cached:
+                self.save(
+                    ticker=ticker,
+                    interval=interval,
+                    data=data,
+                    start=saved_start,
+                )
+
+        return data.loc[data.index >= self._to_timestamp(start, data.index)]
+
+    def load(self, ticker: str, interval="1d"):
+        """Load the stored history of the ticker
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param interval: The interval of bars, defaults to "1d"
+        :type interval: str, optional
+        :return: The stored history, None if nothing is stored
+        :rtype: pd.DataFrame
+        """
+        return self._load(ticker=ticker, interval=interval)[0]
+
+    def _load(self, ticker: str, interval: str):
+        """Load the stored history of the ticker and the attributes of its
+        file
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param interval: The interval of bars
+        :type interval: str
+        :return: The stored history, None if nothing is stored, and the
+        attributes
+        :rtype: tuple (pd.DataFrame, dict)
+        """
+        path = self._get_path(ticker=ticker, interval=interval)
+        if not os.path.exists(path):
+            return None, {}
+        try:
+            columns, attributes = column_store.read_columns(path)
+        except Exception as error:
+            print(error)
+            return None, {}
+        index = pd.to_datetime(columns.pop("timestamp"), unit="s", utc=True)
+        tz = attributes.get("tz")
+        index = index.tz_convert(tz) if tz else index.tz_localize(None)
+        index.name = attributes.get("index_name")
+        # Copy the columns, so the file is not kept mapped by the frame and
+        # can be replaced by the next save
+        data = pd.DataFrame(
+            {name: np.array(values) for name, values in columns.items()},
+            index=index,
+        )
+        return data, attributes
+
+    def save(self, ticker: str, interval: str, data, start=None):
+        """Store the history of the ticker
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param interval: The interval of bars
+        :type interval: str
+        :param data: The history to store
+        :type data: pd.DataFrame
+        :param start: The requested first date of the history, defaults to
+        the first bar
+        :type start: str or pd.Timestamp, optional
+        """
+        path = self._get_path(ticker=ticker, interval=interval)
+        if not os.path.exists(self._cache_path):
+            try:
+                os.makedirs(self._cache_path)
+            except Exception as error:
+                print(error)
+                return
+        index = data.index
+        utc_index = index.tz_convert(None) if index.tz is not None else index
+        seconds = utc_index.to_numpy().astype("datetime64[s]")
+        columns = {"timestamp": seconds.astype(np.int64)}
+        for name in data.columns:
+            values = data[name].to_numpy()
+            if values.dtype.kind in "biuf":
+                columns[name] = values
+        if start is None and len(index):
+            start = index[0]
+        attributes = {
+            "tz": str(index.tz) if index.tz is not None else None,
+            "index_name": index.name,
+            "start": (
+                pd.Timestamp(start).isoformat() if start is not None else None
+            ),
+        }
+        try:
+            column_store.write_columns(path, columns, attributes=attributes)
+        except Exception as error:
+            print(error)
+
+    def clear(self, ticker: str, interval="1d"):
+        """Remove the stored history of the ticker
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param interval: The interval of bars, defaults to "1d"
+        :type interval: str, optional
+        """
+        path = self._get_path(ticker=ticker, interval=interval)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _fetch(self, ticker: str, interval: str, start):
+        """Download the history of the ticker from the API
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param interval: The interval of bars
+        :type interval: str
+        :param start: The first date to download
+        :type start: str or pd.Timestamp
+        :return: The downloaded history
+        :rtype: pd.DataFrame
+        """
+        try:
+            return yf.Ticker(ticker).history(interval=interval, start=start)
+        except Exception as error:
+            print(error)
+            return None
+
+    def _merge(self, cached, tail):
+        """Append the downloaded bars to the stored history. The bars which
+        are in both keep the downloaded values.
+
+        :param cached: The stored history
+        :type cached: pd.DataFrame
+        :param tail: The downloaded bars
+        :type tail: pd.DataFrame
+        :return: The merged history
+        :rtype: pd.DataFrame
+        """
+        if tail is None or tail.empty:
+            return cached
+        data = pd.concat([cached, tail])
+        data = data[~data.index.duplicated(keep="last")]
+        return data.sort_index()
+
+    def _touch(self, ticker: str, interval: str):
+        """Mark the stored history as written now, when no bar has been
+        downloaded after it
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param interval: The interval of bars
+        :type interval: str
+        """
+        try:
+            os.utime(self._get_path(ticker=ticker, interval=interval))
+        except Exception as error:
+            print(error)
+
+    def _is_fresh(self, ticker: str, interval: str) -> bool:
+        """Check if the stored history has been written recently
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param interval: The interval of bars
+        :type interval: str
+        :return: True if the history is younger than the max age
+        :rtype: bool
+        """
+        path = self._get_path(ticker=ticker, interval=interval)
+        return time.time() - os.path.getmtime(path) < self._max_age
+
+    def _get_file_lock(self, ticker: str, interval: str):
+        """Return the lock of the file which stores the ticker history, so
+        several tickers can be fetched at the same time
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param interval: The interval of bars
+        :type interval: str
+        :return: The lock
+        :rtype: threading.Lock
+        """
+        path = self._get_path(ticker=ticker, interval=interval)
+        with self._lock:
+            return self._file_locks.setdefault(path, threading.Lock())
+
+    def _get_path(self, ticker: str, interval: str) -> str:
+        """Return the path of the file which stores the ticker history
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param interval: The interval of bars
+        :type interval: str
+        :return: The path of the file
+        :rtype: str
+        """
+        name = "{ticker}_{interval}.ohlcv".format(
+            ticker=ticker.upper().replace(os.sep, "_"), interval=interval
+        )
+        return os.path.join(self._cache_path, name)
+
+    @staticmethod
+    def _to_timestamp(date, index):
+        """Convert the date to a timestamp comparable with the index
+
+        :param date: The date to convert
+        :type date: str or pd.Timestamp
+        :param index: The index to compare with
+        :type index: pd.DatetimeIndex
+        :return: The converted date
+        :rtype: pd.Timestamp
+        """
+        timestamp = pd.Timestamp(date)
+        tz = getattr(index, "tz", None)
+        if timestamp.tzinfo is None and tz is not None:
+            timestamp = timestamp.tz_localize(tz)
+        return timestamp
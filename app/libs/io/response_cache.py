@@ -0,0 +1,283 @@
+import os
+import copy
+import time
+import pickle
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+
+# Fraction of the disk limit kept by an eviction, so the directory is only
+# listed again after many new entries
+DISK_EVICTION_RATIO = 0.9
+
+
+class ResponseCache(object):
+    """Cache for the results of web requests.
+
+    Each entry expires after the time to live given for its endpoint. The
+    most recent entries are kept in memory and every entry is also written
+    under the APP_HOME, so it survives a restart of the application. Both
+    stores are bounded, the least recently used entries are evicted first.
+    The number of files on disk is counted once then kept up to date, the
+    directory is only listed when the limit is exceeded.
+    """
+
+    def __init__(self, max_entries=256, max_disk_entries=4096):
+        """Create the cache
+
+        :param max_entries: Max number of entries kept in memory,
+        defaults to 256
+        :type max_entries: int, optional
+        :param max_disk_entries: Max number of entries kept on disk,
+        defaults to 4096
+        :type max_disk_entries: int, optional
+        """
+        # Constants
+        self._max_entries = max_entries
+        self._max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # The number of files in the directory of the disk cache, None until
+        # the directory is listed
+        self._disk_path = None
+        self._disk_entries = None
+
+    @property
+    def cache_path(self) -> str:
+        """Return the directory of the disk cache. It is read when needed
+        because the APP_HOME is set after modules are imported.
+
+        :return: The directory, None if the APP_HOME is not set
+        :rtype: str
+        """
+        app_home = os.environ.get("APP_HOME")
+        if not app_home:
+            return None
+        return os.path.join(app_home, "cache", "responses")
+
+    def cached(self, endpoint: str, ttl: int):
+        """Decorator which caches the results of the decorated function
+
+        :param endpoint: The name of the endpoint, part of the cache key
+        :type endpoint: str
+        :param ttl: The time to live of results in seconds
+        :type ttl: int
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = "{endpoint}:{args}:{kwargs}".format(
+                    endpoint=endpoint,
+                    args=repr(args),
+                    kwargs=repr(sorted(kwargs.items())),
+                )
+                found, value = self.get(key)
+                if found:
+                    return value
+                value = func(*args, **kwargs)
+                self.set(key, value, ttl=ttl)
+                return copy.deepcopy(value)
+
+            return wrapper
+
+        return decorator
+
+    def get(self, key: str):
+        """Get the entry of the given key
+
+        :param key: The key of the entry
+        :type key: str
+        :return: A tuple (found, value)
+        :rtype: tuple
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                return True, copy.deepcopy(entry[1])
+            self._entries.pop(key, None)
+
+        entry = self._read(key)
+        if not entry or entry[0] <= now:
+            return False, None
+        with self._lock:
+            self._store(key, entry)
+        return True, copy.deepcopy(entry[1])
+
+    def set(self, key: str, value, ttl: int):
+        """Set the entry of the given key
+
+        :param key: The key of the entry
+        :type key: str
+        :param value: The value to cache
+        :type value: object
+        :param ttl: The time to live of the entry in seconds
+        :type ttl: int
+        """
+        entry = (time.time() + ttl, value)
+        with self._lock:
+            self._store(key, entry)
+        self._write(key, entry)
+
+    def clear(self):
+        """Remove all entries, in memory and on disk"""
+        with self._lock:
+            self._entries.clear()
+        cache_path = self.cache_path
+        if not cache_path or not os.path.exists(cache_path):
+            return
+        for name in os.listdir(cache_path):
+            try:
+                os.remove(os.path.join(cache_path, name))
+            except Exception as error:
+                print(error)
+        with self._lock:
+            self._disk_entries = None
+
+    def _store(self, key: str, entry: tuple):
+        """Store the entry in memory, the lock must be held
+
+        :param key: The key of the entry
+        :type key: str
+        :param entry: The expiration time and the value
+        :type entry: tuple
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_path(self, key: str) -> str:
+        """Return the path of the file which stores the entry
+
+        :param key: The key of the entry
+        :type key: str
+        :return: The path, None if there is no disk cache
+        :rtype: str
+        """
+        cache_path = self.cache_path
+        if not cache_path:
+            return None
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".pkl"
+        return os.path.join(cache_path, name)
+
+    def _read(self, key: str) -> tuple:
+        """Read the entry from the disk
+
+        :param key: The key of the entry
+        :type key: str
+        :return: The expiration time and the value, None if not found
+        :rtype: tuple
+        """
+        path = self._get_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception as error:
+            print(error)
+            return None
+        try:
+            if entry[0] <= time.time():
+                os.remove(path)
+                self._count_disk_entries(os.path.dirname(path), -1)
+                return None
+            # Mark the entry as recently used for the eviction
+            os.utime(path)
+        except OSError as error:
+            print(error)
+        return entry
+
+    def _write(self, key: str, entry: tuple):
+        """Write the entry on the disk
+
+        :param key: The key of the entry
+        :type key: str
+        :param entry: The expiration time and the value
+        :type entry: tuple
+        """
+        path = self._get_path(key)
+        if not path:
+            return
+        if not os.path.exists(os.path.dirname(path)):
+            try:
+                os.makedirs(os.path.dirname(path))
+            except Exception as error:
+                print(error)
+                return
+        temp_path = "{path}.{id}.tmp".format(
+            path=path, id=threading.get_ident()
+        )
+        created = not os.path.exists(path)
+        try:
+            with open(temp_path, "wb") as f:
+                pickle.dump(entry, f)
+            os.replace(temp_path, path)
+        except Exception as error:
+            print(error)
+            return
+        if created:
+            self._count_disk_entries(os.path.dirname(path), 1)
+
+    def _count_disk_entries(self, cache_path: str, count: int):
+        """Update the number of files of the disk cache, the directory is
+        listed the first time. The least recently used files are evicted
+        when there are too many.
+
+        :param cache_path: The directory of the disk cache
+        :type cache_path: str
+        :param count: The number of added files, negative for removed ones
+        :type count: int
+        """
+        with self._lock:
+            if self._disk_entries is None or self._disk_path != cache_path:
+                self._disk_path = cache_path
+                self._disk_entries = len(self._list_disk(cache_path))
+            else:
+                self._disk_entries += count
+            evict = self._disk_entries > self._max_disk_entries
+        if evict:
+            self._evict_disk(cache_path)
+
+    def _evict_disk(self, cache_path: str):
+        """Remove the least recently used files above the disk limit, down
+        to DISK_EVICTION_RATIO of the limit
+
+        :param cache_path: The directory of the disk cache
+        :type cache_path: str
+        """
+        paths = self._list_disk(cache_path)
+        kept = int(self._max_disk_entries * DISK_EVICTION_RATIO)
+        if len(paths) > kept:
+            paths.sort(key=os.path.getmtime)
+            for path in paths[: len(paths) - kept]:
+                try:
+                    os.remove(path)
+                except Exception as error:
+                    print(error)
+        with self._lock:
+            if self._disk_path == cache_path:
+                self._disk_entries = len(self._list_disk(cache_path))
+
+    @staticmethod
+    def _list_disk(cache_path: str) -> list:
+        """Return the files of the entries of the disk cache
+
+        :param cache_path: The directory of the disk cache
+        :type cache_path: str
+        :return: The paths of the files
+        :rtype: list
+        """
+        try:
+            names = os.listdir(cache_path)
+        except OSError:
+            return []
+        return [
+            os.path.join(cache_path, name)
+            for name in names
+            if name.endswith(".pkl")
+        ]
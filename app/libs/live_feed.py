@@ -0,0 +1,150 @@
+import pandas as pd
+from PySide2 import QtCore
+
+from libs.events_handler import EventHandler
+from libs.thread_pool import ThreadPool
+from libs.yahoo_fin import stock_info
+
+
+class LiveFeed(QtCore.QObject):
+    """Live quote of the displayed ticker.
+
+    The quote is polled on its own thread pool (so the busy indicator of the
+    application is not shown at each poll), and turned into the daily bar
+    of the quote. Bars are emitted at most once per frame budget: when
+    several quotes arrive during a frame, only the last one is emitted.
+    """
+
+    def __init__(self, parent=None, interval=5000, frame_budget=100):
+        """Create the live feed
+
+        :param parent: The parent object, defaults to None
+        :type parent: QtCore.QObject, optional
+        :param interval: Milliseconds between two polls, defaults to 5000
+        :type interval: int, optional
+        :param frame_budget: Min milliseconds between two emitted bars,
+        defaults to 100
+        :type frame_budget: int, optional
+        """
+        super(LiveFeed, self).__init__(parent)
+
+        # Constants
+        self.signals = EventHandler()
+        self._ticker = None
+        self._pending = None
+        self._fetching = False
+
+        self._thread_pool = ThreadPool()
+        self._thread_pool.setMaxThreadCount(1)
+
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.setInterval(interval)
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(frame_budget)
+
+        # Signals
+        self._poll_timer.timeout.connect(self._poll)
+        self._flush_timer.timeout.connect(self._flush)
+        self.signals.sig_live_quote_fetched.connect(self._on_quote_fetched)
+
+    @property
+    def ticker(self) -> str:
+        """Return the ticker of the feed
+
+        :return: The ticker, None if the feed is stopped
+        :rtype: str
+        """
+        return self._ticker
+
+    def start(self, ticker: str):
+        """Start polling the quote of the ticker, the feed is restarted if
+        it was already running
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        """
+        self._ticker = ticker
+        self._pending = None
+        self._poll()
+        self._poll_timer.start()
+
+    def stop(self):
+        """Stop the feed, quotes still in flight are ignored"""
+        self._ticker = None
+        self._pending = None
+        self._poll_timer.stop()
+        self._flush_timer.stop()
+
+    def _poll(self):
+        """Fetch the quote on the thread pool, unless the previous fetch is
+        still running"""
+        if self._fetching or not self._ticker:
+            return
+        self._fetching = True
+        self._thread_pool.execution(function=self._fetch, ticker=self._ticker)
+
+    def _fetch(self, ticker: str):
+        """Fetch the quote of the ticker, called from the thread pool
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        """
+        quote = None
+        try:
+            quote = stock_info.get_quote_data(ticker)
+        except Exception as error:
+            print(error)
+        self.signals.sig_live_quote_fetched.emit(ticker, quote)
+
+    @QtCore.Slot(str, object)
+    def _on_quote_fetched(self, ticker: str, quote: dict):
+        """Called when a quote has been fetched, the bar is kept until the
+        end of the frame
+
+        :param ticker: The name of the ticker
+        :type ticker: str
+        :param quote: The quote, None if the fetch failed
+        :type quote: dict
+        """
+        self._fetching = False
+        if ticker != self._ticker or not quote:
+            return
+        bar = get_bar_from_quote(quote)
+        if bar is None:
+            return
+        self._pending = bar
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self):
+        """Emit the last bar received during the frame"""
+        bar, self._pending = self._pending, None
+        if bar is not None:
+            self.signals.sig_live_bar_updated.emit(bar)
+
+
+def get_bar_from_quote(quote: dict) -> dict:
+    """Return the daily bar of the quote
+
+    :param quote: The quote
+    :type quote: dict
+    :return: The bar with the keys time (the day of the quote in the
+    timezone of the exchange), Open, High, Low, Close and Volume, None if
+    the quote has no price
+    :rtype: dict
+    """
+    price = quote.get("regularMarketPrice")
+    market_time = quote.get("regularMarketTime")
+    if price is None or market_time is None:
+        return None
+    time = pd.Timestamp(market_time, unit="s", tz="UTC")
+    time = time.tz_convert(quote.get("exchangeTimezoneName", "UTC"))
+    return {
+        "time": time.floor("d"),
+        "Open": quote.get("regularMarketOpen", price),
+        "High": quote.get("regularMarketDayHigh", price),
+        "Low": quote.get("regularMarketDayLow", price),
+        "Close": price,
+        "Volume": quote.get("regularMarketVolume", 0),
+    }
@@ -1,6 +1,107 @@
 import os
+import sys
+import json
 import inspect
 import pkgutil
+import importlib.util
+
+
+class LazyPlugin(object):
+    """Stand-in for a plugin whose module is not imported yet.
+
+    The name and the description come from the manifest of the plugins, they
+    are only displayed. The module is imported and the plugin created the
+    first time anything else is asked (an indicator is enabled or its
+    settings are opened), then the proxy forwards everything to it.
+    """
+
+    # The attributes read from the manifest until the plugin is loaded
+    _display_attributes = ("name", "description")
+
+    def __init__(self, module: str, class_name: str, name: str, **kwargs):
+        """Create the proxy
+
+        :param module: The module of the plugin class
+        :type module: str
+        :param class_name: The name of the plugin class
+        :type class_name: str
+        :param name: The name of the plugin
+        :type name: str
+
+        kwargs parameters:
+
+        :param description: The description of the plugin
+        :type description: str
+        :param fields: The specifications of the fields of the plugin
+        :type fields: list of dict
+        """
+        # Constants
+        self.__dict__["_module"] = module
+        self.__dict__["_class_name"] = class_name
+        self.__dict__["_manifest"] = {
+            "name": name,
+            "description": kwargs.get("description", ""),
+            "fields": kwargs.get("fields", []),
+        }
+        self.__dict__["_plugin"] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Return True if the plugin has been created
+
+        :return: The state of the plugin
+        :rtype: bool
+        """
+        return self._plugin is not None
+
+    @property
+    def plugin(self):
+        """Return the plugin, its module is imported the first time
+
+        :return: The plugin
+        :rtype: object
+        """
+        return self.load()
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the plugin is enabled, a plugin which is not
+        loaded is not enabled
+
+        :return: The state of the plugin
+        :rtype: bool
+        """
+        return self.loaded and self._plugin.enabled
+
+    def load(self):
+        """Import the module and create the plugin, if it is not done yet
+
+        :return: The plugin
+        :rtype: object
+        """
+        if self._plugin is None:
+            module = importlib.import_module(self._module)
+            self.__dict__["_plugin"] = getattr(module, self._class_name)()
+        return self._plugin
+
+    def __getattr__(self, name):
+        # Only called for the attributes which are not on the proxy
+        if name.startswith("__") or "_plugin" not in self.__dict__:
+            raise AttributeError(name)
+        if self._plugin is None and name in self._display_attributes:
+            return self._manifest[name]
+        return getattr(self.load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.plugin, name, value)
+
+    def __repr__(self):
+        return "<%s %s.%s @0x%08x>" % (
+            __class__.__name__,
+            self._module,
+            self._class_name,
+            id(self),
+        )
 
 
 class PluginCollection(object):
@@ -10,10 +111,13 @@ class PluginCollection(object):
 
     def __init__(self, plugin_package, plugin_class):
         """Constructor that initiates the reading of all available plugins
-        when an instance of the PluginCollection object is created
+        when an instance of the PluginCollection object is created. The
+        plugins of the modules which did not change since the last reading
+        are LazyPlugin, their modules are imported when they are used.
         """
         self.plugins = []
         self.plugin_class = plugin_class
+        self.manifest = {}
 
         self.plugin_package = plugin_package
         self.reload_plugins()
@@ -26,7 +130,61 @@ class PluginCollection(object):
         """
         self.plugins = []
         self.seen_paths = []
+        self.manifest = self.load_manifest()
+        modules = dict(self.manifest)
         self.walk_package(self.plugin_package)
+        if self.manifest != modules:
+            self.save_manifest()
+
+    @property
+    def manifest_path(self) -> str:
+        """Return the file of the manifest of the plugins. It is read when
+        needed because the APP_HOME is set after modules are imported.
+
+        :return: The file, None if the APP_HOME is not set
+        :rtype: str
+        """
+        app_home = os.environ.get("APP_HOME")
+        if not app_home:
+            return None
+        return os.path.join(app_home, "plugins", "manifest.json")
+
+    def load_manifest(self) -> dict:
+        """Load the manifest of the plugins, the description of the plugins of
+        each module with the modification time of its file
+
+        :return: The manifest, empty if there is no valid manifest
+        :rtype: dict
+        """
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+        except Exception as error:
+            print(error)
+            return {}
+        if manifest.get("plugin_class") != self._get_class_path():
+            return {}
+        return manifest.get("modules", {})
+
+    def save_manifest(self):
+        """Save the manifest of the plugins"""
+        if not self.manifest_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            with open(self.manifest_path, "w") as f:
+                json.dump(
+                    {
+                        "plugin_class": self._get_class_path(),
+                        "modules": self.manifest,
+                    },
+                    f,
+                    indent=4,
+                )
+        except Exception as error:
+            print(error)
 
     def disable_plugin_manager(self, disable):
         """This method disable/enable the plugin manager
@@ -52,18 +210,19 @@ class PluginCollection(object):
             imported_package.__path__, imported_package.__name__ + "."
         ):
             if not ispkg:
+                mtime = self._get_module_mtime(pluginname)
+                cached = self.manifest.get(pluginname)
+                if mtime and cached and cached["mtime"] == mtime:
+                    self.plugins.extend(
+                        LazyPlugin(**plugin) for plugin in cached["plugins"]
+                    )
+                    continue
                 plugin_module = __import__(pluginname, fromlist=["blah"])
-                clsmembers = inspect.getmembers(plugin_module, inspect.isclass)
-                for (_, c) in clsmembers:
-                    # Only add classes that are a sub class of Plugin,
-                    # but NOT Plugin itself
-                    if issubclass(c, self.plugin_class) & (
-                        c is not self.plugin_class
-                    ):
-                        print(
-                            f"Found plugin class: {c.__module__}.{c.__name__}"
-                        )
-                        self.plugins.append(c())
+                plugins = [
+                    c() for c in self._get_plugin_classes(plugin_module)
+                ]
+                self.plugins.extend(plugins)
+                self._update_manifest(pluginname, plugins, mtime=mtime)
 
         # Now that we have looked at all the modules in the current package,
         # start looking recursively for additional modules in sub packages
@@ -88,3 +247,227 @@ class PluginCollection(object):
                 # apply the walk_package method recursively
                 for child_pkg in child_pkgs:
                     self.walk_package(package + "." + child_pkg)
+
+    def get_module_files(self) -> dict:
+        """Return the files of the modules of plugins
+
+        :return: The full name of the module of each file
+        :rtype: dict
+        """
+        files = {}
+        for module in self.manifest:
+            path = self._get_module_file(module)
+            if path:
+                files[path] = module
+        return files
+
+    def reload_module(self, module: str) -> list:
+        """Reload the module and replace its plugins by new instances at the
+        same place, the values of their fields are kept. The other plugins
+        are not touched.
+
+        :param module: The full name of the module
+        :type module: str
+        :return: Each replaced plugin with its new instance, the replaced
+        plugin is None for a new plugin class and the new instance is None
+        for a removed one. Empty if the module can't be reloaded.
+        :rtype: list of tuple
+        """
+        try:
+            if module in sys.modules:
+                plugin_module = importlib.reload(sys.modules[module])
+            else:
+                plugin_module = importlib.import_module(module)
+        except Exception as error:
+            print(error)
+            return []
+
+        olds = {
+            self._get_plugin_path(plugin)[1]: plugin
+            for plugin in self.plugins
+            if self._get_plugin_path(plugin)[0] == module
+        }
+        news = {
+            c.__name__: c()
+            for c in self._get_plugin_classes(plugin_module)
+            if c.__module__ == module
+        }
+        for name, plugin in news.items():
+            if name in olds:
+                self._copy_fields(olds[name], plugin)
+
+        # The new plugins take the place of the old ones
+        positions = [
+            position
+            for position, plugin in enumerate(self.plugins)
+            if any(plugin is old for old in olds.values())
+        ]
+        position = positions[0] if positions else len(self.plugins)
+        self.plugins = [
+            plugin
+            for plugin in self.plugins
+            if not any(plugin is old for old in olds.values())
+        ]
+        self.plugins[position:position] = list(news.values())
+        self._update_manifest(
+            module, list(news.values()), mtime=self._get_module_mtime(module)
+        )
+        self.save_manifest()
+
+        return [
+            (olds.get(name), news.get(name))
+            for name in list(olds)
+            + [name for name in news if name not in olds]
+        ]
+
+    def _get_plugin_classes(self, plugin_module) -> list:
+        """Return the plugin classes of the module
+
+        :param plugin_module: The module
+        :type plugin_module: module
+        :return: The classes
+        :rtype: list
+        """
+        classes = []
+        clsmembers = inspect.getmembers(plugin_module, inspect.isclass)
+        for _, c in clsmembers:
+            # Only add classes that are a sub class of Plugin,
+            # but NOT Plugin itself
+            if issubclass(c, self.plugin_class) & (c is not self.plugin_class):
+                print(f"Found plugin class: {c.__module__}.{c.__name__}")
+                classes.append(c)
+        return classes
+
+    def _update_manifest(self, module: str, plugins: list, mtime=None):
+        """Set the plugins of the module in the manifest
+
+        :param module: The full name of the module
+        :type module: str
+        :param plugins: The plugins of the module
+        :type plugins: list
+        :param mtime: The modification time of the module file, the module
+        is not in the manifest without it, defaults to None
+        :type mtime: float, optional
+        """
+        if not mtime:
+            self.manifest.pop(module, None)
+            return
+        self.manifest[module] = {
+            "mtime": mtime,
+            "plugins": [
+                self._get_plugin_manifest(plugin) for plugin in plugins
+            ],
+        }
+
+    @staticmethod
+    def _get_plugin_path(plugin) -> tuple:
+        """Return the module and the class name of the plugin, without
+        loading a LazyPlugin
+
+        :param plugin: The plugin
+        :type plugin: object
+        :return: The full name of the module and the name of the class
+        :rtype: tuple
+        """
+        if isinstance(plugin, LazyPlugin):
+            return plugin._module, plugin._class_name
+        return plugin.__class__.__module__, plugin.__class__.__name__
+
+    @staticmethod
+    def _copy_fields(old, new):
+        """Copy the values of the fields of the old plugin to the fields of
+        the same name of the new one, and their styles
+
+        :param old: The replaced plugin
+        :type old: object
+        :param new: The new plugin
+        :type new: object
+        """
+        if isinstance(old, LazyPlugin) and not old.loaded:
+            return
+        for field in old.fields:
+            new_field = new.get_field(field.attribute_name)
+            if new_field is None or type(new_field) is not type(field):
+                continue
+            for attribute in (
+                "value",
+                "current",
+                "color",
+                "width",
+                "line_style",
+            ):
+                if hasattr(field, attribute):
+                    setattr(new_field, attribute, getattr(field, attribute))
+
+    def _get_class_path(self) -> str:
+        """Return the full name of the plugin class, the manifest of another
+        plugin class is ignored
+
+        :return: The module and the name of the class
+        :rtype: str
+        """
+        return "{module}.{name}".format(
+            module=self.plugin_class.__module__,
+            name=self.plugin_class.__name__,
+        )
+
+    def _get_module_mtime(self, module: str) -> float:
+        """Return the modification time of the file of the module, without
+        importing it
+
+        :param module: The full name of the module
+        :type module: str
+        :return: The modification time, None if the file is not found
+        :rtype: float
+        """
+        path = self._get_module_file(module)
+        if not path:
+            return None
+        try:
+            return os.path.getmtime(path)
+        except Exception as error:
+            print(error)
+            return None
+
+    @staticmethod
+    def _get_module_file(module: str) -> str:
+        """Return the file of the module, without importing it
+
+        :param module: The full name of the module
+        :type module: str
+        :return: The file, None if the module is not found
+        :rtype: str
+        """
+        try:
+            return importlib.util.find_spec(module).origin
+        except Exception as error:
+            print(error)
+            return None
+
+    def _get_plugin_manifest(self, plugin) -> dict:
+        """Return the description of the plugin stored in the manifest
+
+        :param plugin: The plugin
+        :type plugin: object
+        :return: The arguments of the LazyPlugin of the plugin
+        :rtype: dict
+        """
+        fields = []
+        for field in getattr(plugin, "fields", []):
+            value = getattr(field, "value", getattr(field, "current", None))
+            fields.append(
+                {
+                    "attribute_name": field.attribute_name,
+                    "kind": field.__class__.__name__,
+                    "value": (
+                        value if isinstance(value, (int, float, str)) else None
+                    ),
+                }
+            )
+        return {
+            "module": plugin.__class__.__module__,
+            "class_name": plugin.__class__.__name__,
+            "name": plugin.name,
+            "description": plugin.description,
+            "fields": fields,
+        }
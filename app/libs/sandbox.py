@@ -0,0 +1,230 @@
+import os
+import copy
+import importlib
+import threading
+import multiprocessing
+from concurrent import futures
+from multiprocessing import shared_memory
+
+import numpy as np
+from PySide2 import QtCore
+
+# The modules of indicators imported by the worker process, with the
+# modification time of their file, see _get_indicator_class
+_modules = {}
+
+
+class Sandbox(QtCore.QObject):
+    """Run the compute step of indicators in worker processes.
+
+    The columns of the quotation are copied once into shared memory blocks,
+    the worker process reads them from there, calls the compute classmethod
+    of the indicator and sends back its result arrays, which are drawn by
+    the GUI thread. A compute which takes longer than the timeout is
+    abandoned and the worker processes are restarted, so a slow or stuck
+    indicator never blocks the application.
+    """
+
+    def __init__(self, parent=None, max_workers=None, timeout=30):
+        """Create the sandbox, the processes are started on the first run
+
+        :param parent: The parent object, defaults to None
+        :type parent: QtCore.QObject, optional
+        :param max_workers: The number of processes, defaults to None (the
+        number of processors)
+        :type max_workers: int, optional
+        :param timeout: Max time in seconds of a compute, defaults to 30
+        :type timeout: int, optional
+        """
+        super(Sandbox, self).__init__(parent)
+
+        # Constants
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def compute(
+        self, indicator, values: dict, parameters: dict, previous=None
+    ) -> dict:
+        """Compute the indicator in a worker process and wait for its
+        results, it must not be called from the GUI thread
+
+        :param indicator: The indicator, it must implement compute
+        :type indicator: Indicator
+        :param values: The columns of the quotation (see Indicator.inputs)
+        :type values: dict of np.array
+        :param parameters: The values of the fields of the indicator
+        :type parameters: dict
+        :param previous: The results continued by compute_update, defaults
+        to None (compute all bars)
+        :type previous: dict, optional
+        :raises TimeoutError: If the compute takes longer than the timeout
+        :return: The results of the compute
+        :rtype: dict
+        """
+        # The class is read on the indicator, compute is a classmethod
+        indicator_class = indicator.compute.__self__
+        blocks = []
+        try:
+            arrays = {}
+            for name, value in values.items():
+                value = np.ascontiguousarray(value)
+                block = shared_memory.SharedMemory(
+                    create=True, size=max(value.nbytes, 1)
+                )
+                blocks.append(block)
+                shared = np.ndarray(value.shape, value.dtype, buffer=block.buf)
+                shared[:] = value
+                del shared
+                arrays[name] = (block.name, value.shape, value.dtype.str)
+
+            executor = self._get_executor()
+            future = executor.submit(
+                _compute,
+                indicator_class.__module__,
+                indicator_class.__name__,
+                arrays,
+                parameters,
+                previous,
+            )
+            try:
+                return future.result(timeout=self._timeout)
+            except futures.TimeoutError:
+                # The stuck process can only be killed, with the others
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = None
+                _terminate(executor)
+                raise TimeoutError(
+                    "{name} took more than {timeout} s".format(
+                        name=indicator.name, timeout=self._timeout
+                    )
+                )
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            _terminate(executor)
+
+    def _get_executor(self) -> futures.ProcessPoolExecutor:
+        """Return the pool of worker processes, created on the first call.
+        The processes are spawned, they don't inherit the state of Qt. The
+        start of the processes is waited here, it is not part of the timeout
+        of a compute.
+
+        :return: The pool
+        :rtype: futures.ProcessPoolExecutor
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = futures.ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._executor.submit(_ready).result()
+            return self._executor
+
+
+def _terminate(executor: futures.ProcessPoolExecutor):
+    """Stop the processes of the pool without waiting for their jobs
+
+    :param executor: The pool
+    :type executor: futures.ProcessPoolExecutor
+    """
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def _ready() -> bool:
+    """Return True once a worker process is started
+
+    :return: True
+    :rtype: bool
+    """
+    return True
+
+
+def _compute(
+    module: str, class_name: str, arrays: dict, parameters: dict, previous
+):
+    """Compute the indicator, called in a worker process
+
+    :param module: The module of the class of the indicator
+    :type module: str
+    :param class_name: The name of the class of the indicator
+    :type class_name: str
+    :param arrays: The shared memory block, the shape and the type of each
+    column of the quotation
+    :type arrays: dict of tuple
+    :param parameters: The values of the fields of the indicator
+    :type parameters: dict
+    :param previous: The results continued by compute_update, None to
+    compute all bars
+    :type previous: dict
+    :return: The results of the compute
+    :rtype: dict
+    """
+    blocks = {
+        name: shared_memory.SharedMemory(name=block_name)
+        for name, (block_name, _, _) in arrays.items()
+    }
+    try:
+        values = {
+            name: np.ndarray(shape, dtype, buffer=blocks[name].buf)
+            for name, (_, shape, dtype) in arrays.items()
+        }
+        indicator_class = _get_indicator_class(module, class_name)
+        if previous is not None:
+            results = indicator_class.compute_update(
+                values, parameters, previous
+            )
+        else:
+            results = indicator_class.compute(values, parameters)
+        # The results must not keep the shared memory alive, the states
+        # may hold views of the values
+        results = {
+            name: (
+                np.array(value)
+                if isinstance(value, np.ndarray)
+                else copy.deepcopy(value)
+            )
+            for name, value in (results or {}).items()
+        }
+        values = None
+    finally:
+        for block in blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                # The arrays are still referenced by the traceback of an
+                # error, the block is closed when they are released
+                pass
+    return results
+
+
+def _get_indicator_class(module: str, class_name: str):
+    """Return the class of the indicator, its module is reloaded when its
+    file changed (see IndicatorsWidget.reload_module)
+
+    :param module: The module of the class
+    :type module: str
+    :param class_name: The name of the class
+    :type class_name: str
+    :return: The class
+    :rtype: type
+    """
+    imported = importlib.import_module(module)
+    mtime = os.path.getmtime(imported.__file__)
+    if _modules.setdefault(module, mtime) != mtime:
+        imported = importlib.reload(imported)
+        _modules[module] = mtime
+    return getattr(imported, class_name)
@@ -0,0 +1,311 @@
+from PySide2 import QtCore
+
+from libs.events_handler import EventHandler
+from libs.thread_pool import ThreadPool
+
+# Priorities of the tasks, the highest are started first
+PRIORITY_PREFETCH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_VISIBLE = 2
+
+# The scheduler shared by the application, see get_scheduler
+_scheduler = None
+
+
+def get_scheduler():
+    """Return the scheduler of the application, created on the first call
+
+    :return: The scheduler
+    :rtype: Scheduler
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = Scheduler()
+    return _scheduler
+
+
+class Task(object):
+    """Handle of a function submitted to the Scheduler.
+
+    The callbacks are called in the GUI thread with the result of the
+    function, or with its error. A cancelled task never calls them, a task
+    which is not started yet is removed from the pool and a running one can
+    stop early by reading its cancelled attribute (see Scheduler.submit).
+    """
+
+    def __init__(self, function, kwargs, key=None, priority=PRIORITY_NORMAL):
+        """Create the task
+
+        :param function: The function to call
+        :type function: function
+        :param kwargs: The arguments of the function
+        :type kwargs: dict
+        :param key: The key of identical tasks, defaults to None
+        :type key: hashable, optional
+        :param priority: The priority of the task, defaults to
+        PRIORITY_NORMAL
+        :type priority: int, optional
+        """
+        # Constants
+        self.function = function
+        self.kwargs = kwargs
+        self.key = key
+        self.priority = priority
+        self.group = None
+        self.cancelled = False
+        self.done = False
+        self.result = None
+        self.error = None
+
+        self._scheduler = None
+        self._runnable = None
+        self._callbacks = []
+        self._done_callbacks = []
+
+    def add_callbacks(self, callback=None, error_callback=None):
+        """Add callbacks called when the task is done
+
+        :param callback: Called with the result of the function, defaults to
+        None
+        :type callback: function, optional
+        :param error_callback: Called with the error of the function,
+        defaults to None
+        :type error_callback: function, optional
+        """
+        if callback or error_callback:
+            self._callbacks.append((callback, error_callback))
+
+    def add_done_callback(self, callback):
+        """Add a callback called with the task when it is done, failed or
+        cancelled
+
+        :param callback: The callback
+        :type callback: function
+        """
+        self._done_callbacks.append(callback)
+
+    def cancel(self):
+        """Cancel the task"""
+        if self._scheduler is not None:
+            self._scheduler.cancel(self)
+
+    def _finish(self):
+        """Call the callbacks of the task"""
+        for callback, error_callback in self._callbacks:
+            if self.error is None and callback:
+                callback(self.result)
+            elif self.error is not None and error_callback:
+                error_callback(self.error)
+        for callback in self._done_callbacks:
+            callback(self)
+        self._callbacks = []
+        self._done_callbacks = []
+
+    def __repr__(self):
+        return "<%s %s @0x%08x>" % (__class__.__name__, self.key, id(self))
+
+
+class Scheduler(QtCore.QObject):
+    """Run tasks in a thread pool, by priority.
+
+    Each submitted function gets a Task. The identical requests (same key)
+    which are in flight share the same task, the tasks of a group can be
+    cancelled at once (the downloads of the previous ticker when another one
+    is selected) and the results are given to the callbacks of each task in
+    the GUI thread.
+    """
+
+    def __init__(self, parent=None, max_threads=None):
+        """Create the scheduler
+
+        :param parent: The parent object, defaults to None
+        :type parent: QtCore.QObject, optional
+        :param max_threads: The number of threads, defaults to None (the
+        number of processors, 4 at least as the tasks mostly wait for the
+        network)
+        :type max_threads: int, optional
+        """
+        super(Scheduler, self).__init__(parent)
+
+        # Constants
+        self.signals = EventHandler()
+        self._tasks = []
+
+        self._thread_pool = ThreadPool()
+        self._thread_pool.setMaxThreadCount(
+            max_threads or max(QtCore.QThread.idealThreadCount(), 4)
+        )
+
+        # Signals
+        self.signals.sig_task_finished.connect(self._on_task_finished)
+
+    def submit(
+        self,
+        function,
+        key=None,
+        priority=PRIORITY_NORMAL,
+        group=None,
+        callback=None,
+        error_callback=None,
+        pass_task=False,
+        **kwargs
+    ) -> Task:
+        """Run the function in the thread pool
+
+        :param function: The function to call
+        :type function: function
+        :param key: The key of the request, a task in flight with the same
+        key is returned instead of running the function again (it takes the
+        priority and the group of the request when they are higher),
+        defaults to None (no deduplication)
+        :type key: hashable, optional
+        :param priority: The priority of the task, defaults to
+        PRIORITY_NORMAL
+        :type priority: int, optional
+        :param group: The group of the task (see cancel_group), defaults to
+        None
+        :type group: str, optional
+        :param callback: Called with the result, defaults to None
+        :type callback: function, optional
+        :param error_callback: Called with the error, defaults to None
+        :type error_callback: function, optional
+        :param pass_task: Give the task to the function as its task argument,
+        so it can stop when it is cancelled, defaults to False
+        :type pass_task: bool, optional
+        :return: The task
+        :rtype: Task
+        """
+        task = self.get_task(key) if key is not None else None
+        if task is not None:
+            task.add_callbacks(callback, error_callback)
+            # The most urgent request decides, a prefetched history becomes
+            # a download of the visible ticker
+            if priority > task.priority:
+                self._set_priority(task, priority)
+                task.group = group or task.group
+            return task
+
+        task = Task(function, kwargs, key=key, priority=priority)
+        task.group = group
+        task.add_callbacks(callback, error_callback)
+        if pass_task:
+            task.kwargs["task"] = task
+        task._scheduler = self
+        task._runnable = TaskRunnable(self, task)
+        self._tasks.append(task)
+        self._thread_pool.start(task._runnable, task.priority)
+        return task
+
+    def get_task(self, key):
+        """Return the task of the key which is in flight
+
+        :param key: The key of the task
+        :type key: hashable
+        :return: The task, None if there is no task of the key
+        :rtype: Task
+        """
+        for task in self._tasks:
+            if task.key == key:
+                return task
+        return None
+
+    def tasks(self, group=None) -> list:
+        """Return the tasks in flight
+
+        :param group: Only the tasks of the group, defaults to None (all)
+        :type group: str, optional
+        :return: The tasks
+        :rtype: list of Task
+        """
+        return [task for task in self._tasks if group in (None, task.group)]
+
+    def cancel(self, task: Task):
+        """Cancel the task, it is removed from the pool if it is not started
+        and its result is ignored otherwise. Must be called from the GUI
+        thread.
+
+        :param task: The task
+        :type task: Task
+        """
+        if task.done or task.cancelled:
+            return
+        task.cancelled = True
+        self._thread_pool.tryTake(task._runnable)
+        self._remove(task)
+        task._callbacks = []
+        task._finish()
+
+    def cancel_group(self, group: str, keep=()):
+        """Cancel the tasks of the group
+
+        :param group: The group
+        :type group: str
+        :param keep: The tasks of the group which are kept, defaults to ()
+        :type keep: list of Task, optional
+        """
+        for task in self.tasks(group=group):
+            if not any(task is kept for kept in keep):
+                self.cancel(task)
+
+    def clear(self):
+        """Cancel all the tasks"""
+        for task in list(self._tasks):
+            self.cancel(task)
+
+    def _set_priority(self, task: Task, priority: int):
+        """Change the priority of a task, a started task is not changed
+
+        :param task: The task
+        :type task: Task
+        :param priority: The new priority
+        :type priority: int
+        """
+        if self._thread_pool.tryTake(task._runnable):
+            task.priority = priority
+            self._thread_pool.start(task._runnable, task.priority)
+
+    def _remove(self, task: Task):
+        """Remove the task from the tasks in flight
+
+        :param task: The task
+        :type task: Task
+        """
+        self._tasks = [other for other in self._tasks if other is not task]
+
+    @QtCore.Slot(object)
+    def _on_task_finished(self, task: Task):
+        """Called when the function of a task returned or failed
+
+        :param task: The task
+        :type task: Task
+        """
+        if task.cancelled:
+            return
+        task.done = True
+        self._remove(task)
+        task._runnable = None
+        task._finish()
+
+
+class TaskRunnable(QtCore.QRunnable):
+    """Runnable of a Task, it is kept by the task so it can be taken back
+    from the pool"""
+
+    def __init__(self, scheduler: Scheduler, task: Task):
+        super(TaskRunnable, self).__init__()
+        self.setAutoDelete(False)
+
+        # Constants
+        self.scheduler = scheduler
+        self.task = task
+
+    def run(self):
+        task = self.task
+        if task.cancelled:
+            return
+        try:
+            task.result = task.function(**task.kwargs)
+        except Exception as error:
+            print(error)
+            task.error = error
+        self.scheduler.signals.sig_task_finished.emit(task)
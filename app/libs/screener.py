@@ -0,0 +1,154 @@
+from PySide2 import QtCore
+
+from libs.engine import conditions
+from libs.engine.panel import Panel
+from libs.events_handler import EventHandler
+from libs.thread_pool import ThreadPool
+
+
+class Screener(QtCore.QObject):
+    """Screen many tickers against conditions of the engine.
+
+    The tickers are split in chunks, each chunk is a job of a bounded thread
+    pool: the histories are read from the price cache (and downloaded when
+    they are missing), then the conditions are evaluated on the whole chunk
+    at once. The indicators of each ticker are computed on its own bars
+    (see Panel.compacted), so a ticker matches whatever the calendars of
+    the other tickers of its chunk. The matching tickers are emitted as soon
+    as their chunk is done, the jobs of a stopped screening are dropped.
+    """
+
+    def __init__(self, price_cache, parent=None, max_workers=8, chunk_size=10):
+        """Create the screener
+
+        :param price_cache: The price cache of the application
+        :type price_cache: PriceCache
+        :param parent: The parent object, defaults to None
+        :type parent: QtCore.QObject, optional
+        :param max_workers: The number of threads, defaults to 8
+        :type max_workers: int, optional
+        :param chunk_size: The number of tickers of a job, defaults to 10
+        :type chunk_size: int, optional
+        """
+        super(Screener, self).__init__(parent)
+
+        # Constants
+        self.signals = EventHandler()
+        self._price_cache = price_cache
+        self._chunk_size = chunk_size
+        self._generation = 0
+        self._total = 0
+        self._done = 0
+
+        self._thread_pool = ThreadPool()
+        self._thread_pool.setMaxThreadCount(max_workers)
+
+        # Signals
+        self.signals.sig_screener_chunk_screened.connect(
+            self._on_chunk_screened
+        )
+
+    @property
+    def running(self) -> bool:
+        """Return True while a screening is running
+
+        :return: The state of the screener
+        :rtype: bool
+        """
+        return self._done < self._total
+
+    def start(self, tickers: list, names: list, start="2018-01-01"):
+        """Screen the tickers, the previous screening is stopped
+
+        :param tickers: The names of the tickers
+        :type tickers: list
+        :param names: The names of the conditions, a ticker must match all of
+        them
+        :type names: list
+        :param start: The first date of histories, defaults to "2018-01-01"
+        :type start: str, optional
+        """
+        self.stop()
+        self._total = len(tickers)
+        self._done = 0
+        self.signals.sig_screener_progress.emit(0, self._total)
+        if not tickers:
+            self.signals.sig_screener_finished.emit()
+            return
+        for position in range(0, len(tickers), self._chunk_size):
+            self._thread_pool.execution(
+                function=self._screen,
+                generation=self._generation,
+                tickers=tickers[position : position + self._chunk_size],
+                names=names,
+                start=start,
+            )
+
+    def stop(self):
+        """Stop the screening, the jobs which are not started are removed
+        and the results of the running ones are ignored"""
+        self._generation += 1
+        self._thread_pool.clear()
+        self._total = self._done = 0
+
+    def _screen(self, generation: int, tickers: list, names: list, start):
+        """Screen a chunk of tickers, called from the thread pool
+
+        :param generation: The screening of the job
+        :type generation: int
+        :param tickers: The names of the tickers
+        :type tickers: list
+        :param names: The names of the conditions
+        :type names: list
+        :param start: The first date of histories
+        :type start: str
+        """
+        histories = {}
+        for ticker in tickers:
+            if generation != self._generation:
+                return
+            try:
+                histories[ticker] = self._price_cache.get_history(
+                    ticker=ticker, interval="1d", start=start
+                )
+            except Exception as error:
+                print(error)
+
+        matches = []
+        try:
+            panel = Panel.from_histories(histories)
+            if len(panel):
+                table = conditions.screen(panel, names)
+                matches = [
+                    {
+                        "ticker": ticker,
+                        "date": row["date"],
+                        "close": row["Close"],
+                    }
+                    for ticker, row in table.iterrows()
+                ]
+        except Exception as error:
+            print(error)
+        self.signals.sig_screener_chunk_screened.emit(
+            generation, len(tickers), matches
+        )
+
+    @QtCore.Slot(int, int, object)
+    def _on_chunk_screened(self, generation: int, count: int, matches: list):
+        """Called when a chunk has been screened
+
+        :param generation: The screening of the chunk
+        :type generation: int
+        :param count: The number of tickers of the chunk
+        :type count: int
+        :param matches: The matching tickers with their last date and close
+        :type matches: list of dict
+        """
+        if generation != self._generation:
+            return
+        for match in matches:
+            self.signals.sig_screener_matched.emit(match)
+        self._done += count
+        self.signals.sig_screener_progress.emit(self._done, self._total)
+        if self._done >= self._total:
+            self.signals.sig_screener_finished.emit()
@@ -0,0 +1,134 @@
+from PySide2 import QtCore, QtWidgets
+
+from libs.engine import conditions
+from libs.events_handler import EventHandler
+from libs.screener import Screener
+from libs.widgets.tablewidgetitem import TableWidgetItem
+from ui import screener_dialog
+
+
+class ScreenerDialogWindow(
+    QtWidgets.QDialog, screener_dialog.Ui_ScreenerDialogWindow
+):
+    def __init__(self, parent=None, tickers={}, price_cache=None):
+        super(ScreenerDialogWindow, self).__init__(parent=parent)
+
+        self.setWindowFlags(QtCore.Qt.Window)
+        self.setupUi(self)
+
+        # Constants
+        self.tickers = tickers
+        self.signal = EventHandler()
+        self.screener = Screener(price_cache=price_cache, parent=self)
+
+        # Build widgets data
+        self.build_conditions()
+
+        # Signals
+        self.pub_start.clicked.connect(self._on_start_clicked)
+        self.pub_close.clicked.connect(self.close)
+        self.tbw_results.itemDoubleClicked.connect(self.choose_ticker)
+        self.screener.signals.sig_screener_matched.connect(self.add_result)
+        self.screener.signals.sig_screener_progress.connect(self._on_progress)
+        self.screener.signals.sig_screener_finished.connect(self._on_finished)
+
+    def build_conditions(self):
+        """Build the list of conditions, the first one is checked"""
+        for position, name in enumerate(conditions.CONDITIONS):
+            item = QtWidgets.QListWidgetItem(name, self.lsw_conditions)
+            item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+            item.setCheckState(
+                QtCore.Qt.Checked if not position else QtCore.Qt.Unchecked
+            )
+
+    def get_checked_conditions(self) -> list:
+        """Return the names of the checked conditions
+
+        :return: The names of the conditions
+        :rtype: list
+        """
+        items = [
+            self.lsw_conditions.item(row)
+            for row in range(self.lsw_conditions.count())
+        ]
+        return [
+            item.text()
+            for item in items
+            if item.checkState() == QtCore.Qt.Checked
+        ]
+
+    def get_filtered_tickers(self) -> list:
+        """Return the tickers whose symbol or company contains the filter
+
+        :return: The names of the tickers
+        :rtype: list
+        """
+        text = self.lie_filter.text().strip().lower()
+        return [
+            ticker
+            for ticker, company in self.tickers.items()
+            if text in ticker.lower() or text in company.lower()
+        ]
+
+    def add_result(self, match: dict):
+        """Add a matching ticker to the results
+
+        :param match: The ticker with the date and the close of its last bar
+        :type match: dict
+        """
+        ticker = match["ticker"]
+        texts = (
+            ticker,
+            self.tickers.get(ticker, ""),
+            match["date"].strftime("%Y-%m-%d"),
+            "{:.2f}".format(match["close"]),
+        )
+        row = self.tbw_results.rowCount()
+        self.tbw_results.insertRow(row)
+        for column, text in enumerate(texts):
+            item = TableWidgetItem(text=text, ticker=ticker)
+            self.tbw_results.setItem(row, column, item)
+
+    def choose_ticker(self, item: QtWidgets.QTableWidgetItem):
+        """Double click on a result, the ticker is displayed
+
+        :param item: The clicked item
+        :type item: TableWidgetItem
+        """
+        self.signal.sig_ticker_choosen.emit(item.ticker)
+
+    def closeEvent(self, event):
+        self.screener.stop()
+        self._on_finished()
+        super(ScreenerDialogWindow, self).closeEvent(event)
+
+    @QtCore.Slot()
+    def _on_start_clicked(self):
+        """Start the screening, or stop the running one"""
+        if self.screener.running:
+            self.screener.stop()
+            self._on_finished()
+            return
+        names = self.get_checked_conditions()
+        if not names:
+            return
+        self.tbw_results.setRowCount(0)
+        self.pub_start.setText("Stop")
+        self.screener.start(tickers=self.get_filtered_tickers(), names=names)
+
+    @QtCore.Slot(int, int)
+    def _on_progress(self, done: int, total: int):
+        """Called when tickers have been screened
+
+        :param done: The number of screened tickers
+        :type done: int
+        :param total: The number of tickers to screen
+        :type total: int
+        """
+        self.prb_progress.setMaximum(total)
+        self.prb_progress.setValue(done)
+
+    @QtCore.Slot()
+    def _on_finished(self):
+        """Called when the screening is finished or stopped"""
+        self.pub_start.setText("Start")
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from .stock_info import _read_html, get_request_timeout
+
 try:
     from requests_html import HTMLSession
 except Exception:
@@ -38,7 +40,7 @@ def get_options_chain(ticker, date=None, raw=True):
 
     site = build_options_url(ticker, date)
 
-    tables = pd.read_html(site)
+    tables = _read_html(site)
 
     if len(tables) == 1:
         calls = tables[0].copy()
@@ -104,7 +106,7 @@ def get_expiration_dates(ticker):
     site = build_options_url(ticker)
 
     session = HTMLSession()
-    resp = session.get(site)
+    resp = session.get(site, timeout=get_request_timeout())
 
     html = resp.html.raw_html.decode()
 
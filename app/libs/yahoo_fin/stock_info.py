@@ -5,6 +5,13 @@ import io
 import re
 import json
 import datetime
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from requests.adapters import HTTPAdapter
+
+from libs.io.response_cache import ResponseCache
 
 try:
     from requests_html import HTMLSession
@@ -22,6 +29,77 @@ except Exception:
 
 base_url = "https://query1.finance.yahoo.com/v8/finance/chart/"
 
+# requests give up when the server does not answer for this number of
+# seconds, see request_timeout
+default_request_timeout = 30
+
+_local = threading.local()
+
+
+def get_request_timeout():
+
+    """Returns the timeout of the requests made by the current thread"""
+
+    return getattr(_local, "timeout", default_request_timeout)
+
+
+@contextlib.contextmanager
+def request_timeout(timeout):
+
+    """Context manager bounding the requests made by the current thread
+    inside it, so a caller waiting for a blocking function (see
+    stock_info_async) knows the thread is freed shortly after it gives up.
+
+    @param: timeout, in seconds, for the connection and each read
+    """
+
+    previous = get_request_timeout()
+    _local.timeout = timeout
+
+    try:
+        yield
+    finally:
+        _local.timeout = previous
+
+
+class _TimeoutSession(requests.Session):
+
+    """Session applying the timeout of the current thread to each request
+    made without an explicit one"""
+
+    def request(self, method, url, **kwargs):
+
+        kwargs.setdefault("timeout", get_request_timeout())
+
+        return super(_TimeoutSession, self).request(method, url, **kwargs)
+
+
+def _read_html(site, **kwargs):
+
+    """Reads the tables of a page downloaded by the pooled session, so the
+    request is bounded by the timeout of the current thread"""
+
+    resp = session.get(site)
+
+    return pd.read_html(io.StringIO(resp.text), **kwargs)
+
+
+# one pooled session shared by all requests, so connections are reused
+# instead of opening a new TCP / TLS connection on every call
+session = _TimeoutSession()
+session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
+# scraped pages are cached, each endpoint with its own time to live
+# (in seconds): statements change quarterly, holders rarely
+cache = ResponseCache()
+cache_ttl = {
+    "quote_table": 60,
+    "stats": 60 * 60,
+    "statements": 24 * 60 * 60,
+    "holders": 24 * 60 * 60,
+    "analysts": 6 * 60 * 60,
+}
+
 
 def build_url(ticker, start_date=None, end_date=None, interval="1d"):
 
@@ -91,7 +169,7 @@ def get_data(
 
     # build and connect to URL
     site, params = build_url(ticker, start_date, end_date, interval)
-    resp = requests.get(site, params=params)
+    resp = session.get(site, params=params)
 
     if not resp.ok:
         raise AssertionError(resp.json())
@@ -112,7 +190,7 @@ def get_data(
             "adjclose"
         ][0]["adjclose"]
         frame.index = pd.to_datetime(temp_time, unit="s")
-        frame.index = frame.index.map(lambda dt: dt.floor("d"))
+        frame.index = frame.index.floor("d")
         frame = frame[["open", "high", "low", "close", "adjclose", "volume"]]
 
     else:
@@ -129,6 +207,121 @@ def get_data(
     return frame
 
 
+def get_data_batch(
+    tickers,
+    start_date=None,
+    end_date=None,
+    index_as_date=True,
+    interval="1d",
+    max_workers=8,
+    long_format=False,
+):
+    """Downloads historical stock price data of several tickers concurrently
+    over the pooled session.  Returns a dictionary of data frames keyed by
+    ticker, or a single long-format data frame (one row per ticker and date)
+    if long_format is True.  Tickers which fail to download are left out.
+
+    @param: tickers
+    @param: start_date = None
+    @param: end_date = None
+    @param: index_as_date = True
+    @param: interval = "1d"
+    @param: max_workers = 8
+    @param: long_format = False
+    """
+
+    frames = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                get_data,
+                ticker,
+                start_date=start_date,
+                end_date=end_date,
+                index_as_date=index_as_date,
+                interval=interval,
+            ): ticker
+            for ticker in tickers
+        }
+
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                frames[ticker] = future.result()
+            except Exception as error:
+                print("{0}: {1}".format(ticker, error))
+
+    # keep the order of the input tickers
+    frames = {ticker: frames[ticker] for ticker in tickers if ticker in frames}
+
+    if long_format:
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames.values())
+
+    return frames
+
+
+def update_data(frame, ticker=None, end_date=None, interval="1d"):
+    """Updates a data frame previously returned by get_data.  Only the bars
+    from the last timestamp of the frame onwards are downloaded, the last
+    bar is refreshed (it may have been fetched during the session) and the
+    new ones are appended.  Returns the updated data frame.
+
+    @param: frame
+    @param: ticker = None (read from the "ticker" column when None, it is
+            required when the frame is empty)
+    @param: end_date = None
+    @param: interval = "1d"
+    """
+
+    index_as_date = "date" not in frame.columns
+
+    if frame.empty:
+        if ticker is None:
+            raise ValueError("ticker is required to update an empty frame")
+
+        return get_data(
+            ticker,
+            end_date=end_date,
+            index_as_date=index_as_date,
+            interval=interval,
+        )
+
+    if ticker is None:
+        ticker = frame["ticker"].iloc[-1]
+
+    dates = frame.index if index_as_date else pd.DatetimeIndex(frame["date"])
+    last_date = dates[-1]
+
+    try:
+        new_bars = get_data(
+            ticker,
+            start_date=last_date,
+            end_date=end_date,
+            index_as_date=True,
+            interval=interval,
+        )
+    except (KeyError, IndexError, ValueError):
+        # no bar since the last timestamp, the chart has no timestamp or
+        # quote for the range
+        return frame
+
+    if new_bars.empty:
+        return frame
+
+    # keep the stored bars which are not downloaded again
+    kept = frame[dates < new_bars.index[0]]
+
+    if not index_as_date:
+        new_bars = new_bars.reset_index()
+        new_bars.rename(columns={"index": "date"}, inplace=True)
+        return pd.concat([kept, new_bars], ignore_index=True)
+
+    return pd.concat([kept, new_bars])
+
+
 def tickers_sp500(include_company_data=False):
     """Downloads list of tickers currently listed in the S&P 500 """
     # get list of all S&P 500 stocks
@@ -331,6 +524,7 @@ def tickers_ftse250(include_company_data=False):
     return sorted(table.Ticker.tolist())
 
 
+@cache.cached("get_quote_table", ttl=cache_ttl["quote_table"])
 def get_quote_table(ticker, dict_result=True):
 
     """Scrapes data elements found on Yahoo Finance's quote page
@@ -342,7 +536,7 @@ def get_quote_table(ticker, dict_result=True):
 
     site = "https://finance.yahoo.com/quote/" + ticker + "?p=" + ticker
 
-    tables = pd.read_html(site)
+    tables = _read_html(site)
 
     data = tables[0].append(tables[1])
 
@@ -369,6 +563,7 @@ def get_quote_table(ticker, dict_result=True):
     return data
 
 
+@cache.cached("get_stats", ttl=cache_ttl["stats"])
 def get_stats(ticker):
 
     """Scrapes information from the statistics tab on Yahoo Finance
@@ -384,7 +579,7 @@ def get_stats(ticker):
         + ticker
     )
 
-    tables = pd.read_html(stats_site)
+    tables = _read_html(stats_site)
 
     tables = [table for table in tables[1:] if table.shape[1] == 2]
 
@@ -399,6 +594,7 @@ def get_stats(ticker):
     return table
 
 
+@cache.cached("get_stats_valuation", ttl=cache_ttl["stats"])
 def get_stats_valuation(ticker):
 
     """Scrapes Valuation Measures table from the statistics tab on Yahoo Finance
@@ -414,7 +610,7 @@ def get_stats_valuation(ticker):
         + ticker
     )
 
-    tables = pd.read_html(stats_site)
+    tables = _read_html(stats_site)
 
     tables = [
         table
@@ -427,26 +623,56 @@ def get_stats_valuation(ticker):
     return table
 
 
-def _parse_json(url):
-    html = requests.get(url=url).text
+def _normalize_json_object(obj):
 
-    json_str = (
-        html.split("root.App.main =")[1]
-        .split("(this)")[0]
-        .split(";\n}")[0]
-        .strip()
-    )
-    data = json.loads(json_str)["context"]["dispatcher"]["stores"][
-        "QuoteSummaryStore"
-    ]
+    """Object hook for the page JSON: empty objects become None and the
+    {"raw": ..., "fmt": ...} objects are replaced by their raw value"""
+
+    if not obj:
+        return None
+
+    if next(iter(obj)) == "raw":
+        return obj["raw"]
+
+    return obj
+
+
+_app_main_marker = "root.App.main ="
+_whitespace = re.compile(r"\s*")
+_json_decoder = json.JSONDecoder()
+_normalized_json_decoder = json.JSONDecoder(
+    object_hook=_normalize_json_object
+)
+
+
+def _extract_app_main(html, store=None, normalize=True):
+
+    """Decodes the root.App.main JSON embedded in a Yahoo Finance page, or
+    only the given store of its dispatcher.  The page is scanned once up to
+    the JSON and the decoder stops at the end of the object, so the rest of
+    the page is never read.  With normalize, the values are normalized by
+    _normalize_json_object while decoding."""
+
+    start = html.index(_app_main_marker) + len(_app_main_marker)
 
-    # return data
-    new_data = json.dumps(data).replace("{}", "null")
-    new_data = re.sub(r"\{[\'|\"]raw[\'|\"]:(.*?),(.*?)\}", r"\1", new_data)
+    if store is not None:
+        key = '"%s":' % store
+        start = html.index(key, start) + len(key)
 
-    json_info = json.loads(new_data)
+    start = _whitespace.match(html, start).end()
 
-    return json_info
+    decoder = _normalized_json_decoder if normalize else _json_decoder
+
+    data, _ = decoder.raw_decode(html, start)
+
+    return data
+
+
+@cache.cached("_parse_json", ttl=cache_ttl["statements"])
+def _parse_json(url):
+    html = session.get(url=url).text
+
+    return _extract_app_main(html, store="QuoteSummaryStore")
 
 
 def _parse_table(json_info):
@@ -593,6 +819,7 @@ def get_financials(ticker, yearly=True, quarterly=True):
     return result
 
 
+@cache.cached("get_holders", ttl=cache_ttl["holders"])
 def get_holders(ticker):
 
     """Scrapes the Holders page from Yahoo Finance for an input ticker
@@ -604,7 +831,7 @@ def get_holders(ticker):
         "https://finance.yahoo.com/quote/" + ticker + "/holders?p=" + ticker
     )
 
-    tables = pd.read_html(holders_site, header=0)
+    tables = _read_html(holders_site, header=0)
 
     table_names = [
         "Major Holders",
@@ -618,6 +845,7 @@ def get_holders(ticker):
     return table_mapper
 
 
+@cache.cached("get_analysts_info", ttl=cache_ttl["analysts"])
 def get_analysts_info(ticker):
 
     """Scrapes the Analysts page from Yahoo Finance for an input ticker
@@ -629,7 +857,7 @@ def get_analysts_info(ticker):
         "https://finance.yahoo.com/quote/" + ticker + "/analysts?p=" + ticker
     )
 
-    tables = pd.read_html(analysts_site, header=0)
+    tables = _read_html(analysts_site, header=0)
 
     table_names = [table.columns[0] for table in tables]
 
@@ -750,7 +978,7 @@ def get_dividends(ticker, start_date=None, end_date=None, index_as_date=True):
 
     # build and connect to URL
     site, params = build_url(ticker, start_date, end_date, "1d")
-    resp = requests.get(site, params=params)
+    resp = session.get(site, params=params)
 
     if not resp.ok:
         raise AssertionError(resp.json())
@@ -770,7 +998,7 @@ def get_dividends(ticker, start_date=None, end_date=None, index_as_date=True):
     frame = frame.transpose()
 
     frame.index = pd.to_datetime(frame.index, unit="s")
-    frame.index = frame.index.map(lambda dt: dt.floor("d"))
+    frame.index = frame.index.floor("d")
 
     # sort in chronological order
     frame = frame.sort_index()
@@ -800,7 +1028,7 @@ def get_splits(ticker, start_date=None, end_date=None, index_as_date=True):
 
     # build and connect to URL
     site, params = build_url(ticker, start_date, end_date, "1d")
-    resp = requests.get(site, params=params)
+    resp = session.get(site, params=params)
 
     if not resp.ok:
         raise AssertionError(resp.json())
@@ -820,7 +1048,7 @@ def get_splits(ticker, start_date=None, end_date=None, index_as_date=True):
     frame = frame.transpose()
 
     frame.index = pd.to_datetime(frame.index, unit="s")
-    frame.index = frame.index.map(lambda dt: dt.floor("d"))
+    frame.index = frame.index.floor("d")
 
     # sort in to chronological order
     frame = frame.sort_index()
@@ -871,19 +1099,11 @@ def get_earnings(ticker):
 
 ### Earnings functions
 def _parse_earnings_json(url):
-    resp = requests.get(url)
+    resp = session.get(url)
 
     content = resp.content.decode(encoding="utf-8", errors="strict")
 
-    page_data = [
-        row
-        for row in content.split("\n")
-        if row.startswith("root.App.main = ")
-    ][0][:-1]
-
-    page_data = page_data.split("root.App.main = ", 1)[1]
-
-    return json.loads(page_data)
+    return _extract_app_main(content, normalize=False)
 
 
 def get_next_earnings_date(ticker):
@@ -1031,7 +1251,7 @@ def get_quote_data(ticker):
         "https://query1.finance.yahoo.com/v7/finance/quote?symbols=" + ticker
     )
 
-    resp = requests.get(site)
+    resp = session.get(site)
 
     if not resp.ok:
         raise AssertionError(
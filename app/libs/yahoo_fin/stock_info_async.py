@@ -0,0 +1,182 @@
+"""Asyncio versions of the stock_info and options functions.
+
+Every coroutine takes the same parameters as its blocking counterpart plus
+an optional timeout (in seconds), so a screen can gather many of them:
+
+    quote, stats = await asyncio.gather(
+        get_quote_table("AAPL"), get_stats("AAPL")
+    )
+
+The requests themselves still go through the blocking functions, run on a
+shared thread pool.  The number of requests in flight is limited per host,
+a slot is only freed when its thread is done, and the timeout is also given
+to the requests of the thread (see stock_info.request_timeout) so a thread
+given up on is freed shortly after.
+"""
+
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from . import options
+from . import stock_info
+
+
+chart_host = "query1.finance.yahoo.com"
+quote_host = "finance.yahoo.com"
+
+host_limits = {chart_host: 8, quote_host: 4}
+default_timeout = 30
+
+_executor = ThreadPoolExecutor(max_workers=sum(host_limits.values()))
+
+# runs the coroutines of blocking callers which are inside an event loop,
+# apart from _executor so they never wait for a thread they hold
+_runner = ThreadPoolExecutor(max_workers=2)
+
+# semaphores are bound to the event loop which created them
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore(host):
+
+    loop = asyncio.get_running_loop()
+    semaphores = _semaphores.setdefault(loop, {})
+
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(host_limits.get(host, 4))
+
+    return semaphores[host]
+
+
+def _call(func, timeout, args, kwargs):
+
+    """Calls the blocking function with the timeout of its requests, in a
+    thread of the pool"""
+
+    with stock_info.request_timeout(timeout):
+        return func(*args, **kwargs)
+
+
+def _release(semaphore, future):
+
+    """Frees the slot of the host once the thread is done, and retrieves the
+    error of a call which was given up on"""
+
+    semaphore.release()
+
+    if not future.cancelled():
+        future.exception()
+
+
+async def _run(host, func, *args, timeout=None, **kwargs):
+
+    """Runs the blocking function on the thread pool once a slot is
+    available for the host.  Raises asyncio.TimeoutError if the result is
+    not available after timeout seconds, the slot is kept until the thread
+    is done."""
+
+    if timeout is None:
+        timeout = default_timeout
+
+    loop = asyncio.get_running_loop()
+    call = functools.partial(_call, func, timeout, args, kwargs)
+
+    semaphore = _get_semaphore(host)
+    await semaphore.acquire()
+
+    future = loop.run_in_executor(_executor, call)
+    future.add_done_callback(functools.partial(_release, semaphore))
+
+    # the future is shielded, giving up must not mark it as done while the
+    # thread is still running
+    return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+
+def run_sync(coroutine):
+
+    """Runs the coroutine to completion and returns its result, for blocking
+    code.  When the current thread already runs an event loop, the
+    coroutine runs on its own loop in another thread, which is waited for.
+
+    @param: coroutine
+    """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    return _runner.submit(asyncio.run, coroutine).result()
+
+
+def _coroutine(func, host):
+
+    @functools.wraps(func)
+    async def wrapper(*args, timeout=None, **kwargs):
+        return await _run(host, func, *args, timeout=timeout, **kwargs)
+
+    return wrapper
+
+
+# prices, from the chart API
+get_data = _coroutine(stock_info.get_data, chart_host)
+update_data = _coroutine(stock_info.update_data, chart_host)
+get_live_price = _coroutine(stock_info.get_live_price, chart_host)
+get_dividends = _coroutine(stock_info.get_dividends, chart_host)
+get_splits = _coroutine(stock_info.get_splits, chart_host)
+get_quote_data = _coroutine(stock_info.get_quote_data, chart_host)
+
+# scraped pages
+get_quote_table = _coroutine(stock_info.get_quote_table, quote_host)
+get_stats = _coroutine(stock_info.get_stats, quote_host)
+get_stats_valuation = _coroutine(stock_info.get_stats_valuation, quote_host)
+get_income_statement = _coroutine(stock_info.get_income_statement, quote_host)
+get_balance_sheet = _coroutine(stock_info.get_balance_sheet, quote_host)
+get_cash_flow = _coroutine(stock_info.get_cash_flow, quote_host)
+get_financials = _coroutine(stock_info.get_financials, quote_host)
+get_holders = _coroutine(stock_info.get_holders, quote_host)
+get_analysts_info = _coroutine(stock_info.get_analysts_info, quote_host)
+get_earnings = _coroutine(stock_info.get_earnings, quote_host)
+get_next_earnings_date = _coroutine(
+    stock_info.get_next_earnings_date, quote_host
+)
+get_earnings_history = _coroutine(stock_info.get_earnings_history, quote_host)
+
+# options
+get_options_chain = _coroutine(options.get_options_chain, quote_host)
+get_calls = _coroutine(options.get_calls, quote_host)
+get_puts = _coroutine(options.get_puts, quote_host)
+get_expiration_dates = _coroutine(options.get_expiration_dates, quote_host)
+
+
+async def get_financial_bundle(ticker, timeout=None):
+
+    """Fetches everything needed by the fundamental analysis of a ticker.
+    The financials page is downloaded and parsed once for the yearly income
+    statement, balance sheet and cash flow, while the quote table, stats,
+    dividends and price history are fetched concurrently.  Returns a
+    dictionary of results.
+
+    @param: ticker
+    @param: timeout = None
+    """
+
+    financials, quote_table, stats, dividends, history = await asyncio.gather(
+        get_financials(ticker, yearly=True, quarterly=False, timeout=timeout),
+        get_quote_table(ticker, timeout=timeout),
+        get_stats(ticker, timeout=timeout),
+        get_dividends(ticker, timeout=timeout),
+        get_data(ticker, interval="1d", timeout=timeout),
+    )
+
+    return {
+        "income_statement": financials["yearly_income_statement"],
+        "balance_sheet": financials["yearly_balance_sheet"],
+        "cash_flow": financials["yearly_cash_flow"],
+        "quote_table": quote_table,
+        "stats": stats,
+        "dividends": dividends,
+        "history": history,
+    }
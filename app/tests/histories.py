@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+
+def get_history(days, seed=0, last_move=0.0) -> pd.DataFrame:
+    """Return a random walk history on the days
+
+    :param days: The days of the bars
+    :type days: pd.DatetimeIndex
+    :param seed: The seed of the walk, defaults to 0
+    :type seed: int, optional
+    :param last_move: The relative move of the last close, defaults to 0.0
+    :type last_move: float, optional
+    :return: The history
+    :rtype: pd.DataFrame
+    """
+    random = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(random.normal(0, 0.01, len(days))))
+    close[-1] *= 1 + last_move
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": np.full(len(days), 1000.0),
+        },
+        index=days,
+    )
+
+
+def get_calendars(start="2020-01-01", end="2021-12-31") -> dict:
+    """Return the trading days of a US and of a Paris exchange, each one
+    with holidays the other one doesn't have
+
+    :param start: The first day, defaults to "2020-01-01"
+    :type start: str, optional
+    :param end: The last day, defaults to "2021-12-31"
+    :type end: str, optional
+    :return: The days of each exchange
+    :rtype: dict of pd.DatetimeIndex
+    """
+    days = pd.bdate_range(start, end)
+    return {
+        "us": days[np.arange(len(days)) % 23 != 5],
+        "paris": days[np.arange(len(days)) % 17 != 3],
+    }
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from histories import get_history
+
+pytest.importorskip("PySide2")
+pytest.importorskip("pyqtgraph")
+
+from add_ons.indicators.bollinger_bands import BollingerBands  # noqa: E402
+from add_ons.indicators.macd import MACD  # noqa: E402
+from add_ons.indicators.mma import MMA, GuppyMMA  # noqa: E402
+from add_ons.indicators.rsi import RSI  # noqa: E402
+from add_ons.indicators.volumes import Volumes  # noqa: E402
+
+INDICATORS = (BollingerBands, MACD, MMA, GuppyMMA, RSI, Volumes)
+
+
+def _get_values(indicator, history, start=0):
+    return {
+        column: history[column].to_numpy(float)[start:]
+        for column in indicator.inputs
+    }
+
+
+def _assert_results_equal(results, expected):
+    for name, value in expected.items():
+        if isinstance(value, np.ndarray):
+            np.testing.assert_allclose(results[name], value, err_msg=name)
+
+
+@pytest.mark.parametrize("indicator_class", INDICATORS)
+def test_compute_update(indicator_class):
+    indicator = indicator_class()
+    parameters = indicator.parameters()
+    history = get_history(pd.bdate_range("2020-01-01", periods=300))
+    results = indicator.compute(
+        _get_values(indicator, history.iloc[:250]), parameters
+    )
+    # The last bar changes, then bars are appended one by one
+    changed = history.iloc[:250].copy()
+    changed.iloc[-1] *= 1.05
+    for length in (250, 251, 252, 260, 300):
+        values = history.iloc[:length] if length > 250 else changed
+        previous = results
+        results = indicator.compute_update(
+            _get_values(indicator, values, previous["committed"]),
+            parameters,
+            previous,
+        )
+        assert results["committed"] == length - 1
+        _assert_results_equal(
+            results,
+            indicator.compute(_get_values(indicator, values), parameters),
+        )
+    # The previous results are not modified
+    _assert_results_equal(
+        previous,
+        indicator.compute(
+            _get_values(indicator, history.iloc[:260]), parameters
+        ),
+    )
@@ -0,0 +1,73 @@
+import numpy as np
+
+from libs.engine import batch, indicators
+from libs.engine.panel import Panel
+
+from histories import get_calendars, get_history
+
+INDICATORS = ["rsi", "macd", "bollinger", "zig_zag"]
+
+
+def _get_histories():
+    calendars = get_calendars()
+    return {
+        "AAPL": get_history(calendars["us"], seed=1),
+        "MSFT": get_history(calendars["us"][100:], seed=2),
+        "AI.PA": get_history(calendars["paris"], seed=3),
+        "ASML.AS": get_history(calendars["paris"][:-7], seed=4),
+    }
+
+
+def test_compact_expand():
+    panel = Panel.from_histories(_get_histories())
+    close = panel["Close"]
+    compacted = panel.compact(close)
+    for row, ticker in enumerate(panel.tickers):
+        count = panel.bars[row].sum()
+        np.testing.assert_array_equal(
+            compacted[row, :count], close[row, panel.bars[row]]
+        )
+        assert np.isnan(compacted[row, count:]).all()
+    np.testing.assert_array_equal(panel.expand(compacted), close)
+
+
+def test_panel_equals_single_history():
+    histories = _get_histories()
+    panel = Panel.from_histories(histories)
+    results = batch.evaluate(panel, INDICATORS)
+    for row, ticker in enumerate(panel.tickers):
+        alone = Panel.from_histories({ticker: histories[ticker]})
+        expected = batch.evaluate(alone, INDICATORS)
+        for name, outputs in expected.items():
+            for output, values in outputs.items():
+                np.testing.assert_allclose(
+                    results[name][output][row, panel.bars[row]],
+                    values[0],
+                    err_msg="{}.{} of {}".format(name, output, ticker),
+                )
+                outside = results[name][output][row, ~panel.bars[row]]
+                assert not np.nan_to_num(outside).any()
+
+
+def test_panel_equals_indicators():
+    histories = _get_histories()
+    panel = Panel.from_histories(histories)
+    results = batch.evaluate(panel, INDICATORS)
+    for row, ticker in enumerate(panel.tickers):
+        close = histories[ticker]["Close"].to_numpy()
+        bars = panel.bars[row]
+        np.testing.assert_allclose(
+            results["rsi"]["rsi"][row, bars], indicators.get_rsi(close)
+        )
+        middle, upper, lower = indicators.bollinger_bands(close)
+        np.testing.assert_allclose(
+            results["bollinger"]["middle"][row, bars], middle
+        )
+        np.testing.assert_allclose(
+            results["bollinger"]["lower"][row, bars], lower
+        )
+        _, _, macd = indicators.get_macd(close)
+        np.testing.assert_allclose(results["macd"]["macd"][row, bars], macd)
+        # The last value is known on the last bar of each ticker
+        last = panel.last_positions()[row]
+        assert not np.isnan(results["bollinger"]["upper"][row, last])
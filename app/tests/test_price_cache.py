@@ -0,0 +1,50 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from histories import get_history
+
+pytest.importorskip("yfinance")
+
+from libs.io.price_cache import PriceCache  # noqa: E402
+
+
+@pytest.fixture
+def price_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_HOME", str(tmp_path))
+    history = get_history(pd.bdate_range("2018-01-02", "2018-03-30"))
+    price_cache = PriceCache(max_age=60)
+    fetches = []
+
+    def fetch(ticker, interval, start):
+        fetches.append(pd.Timestamp(start))
+        return history.loc[history.index >= pd.Timestamp(start)]
+
+    monkeypatch.setattr(price_cache, "_fetch", fetch)
+    return price_cache, fetches
+
+
+def test_first_bar_after_start(price_cache):
+    price_cache, fetches = price_cache
+    for _ in range(3):
+        data = price_cache.get_history("AI.PA", start="2018-01-01")
+        assert data.index[0] == pd.Timestamp("2018-01-02")
+    assert len(fetches) == 1
+    # An earlier start downloads the history again
+    price_cache.get_history("AI.PA", start="2017-06-01")
+    assert fetches[-1] == pd.Timestamp("2017-06-01")
+    assert len(fetches) == 2
+
+
+def test_no_new_bar_refreshes_cache(price_cache):
+    price_cache, fetches = price_cache
+    price_cache.get_history("AI.PA")
+    path = price_cache._get_path(ticker="AI.PA", interval="1d")
+    past = time.time() - 3600
+    os.utime(path, (past, past))
+    price_cache.get_history("AI.PA")
+    assert fetches[-1] == pd.Timestamp("2018-03-30")
+    price_cache.get_history("AI.PA")
+    assert len(fetches) == 2
@@ -0,0 +1,70 @@
+import pytest
+
+from libs.engine import conditions
+from libs.engine.panel import Panel
+
+from histories import get_calendars, get_history
+
+
+def _get_histories():
+    calendars = get_calendars()
+    return {
+        "AAPL": get_history(calendars["us"], seed=1, last_move=-0.2),
+        "MSFT": get_history(calendars["us"], seed=2, last_move=0.2),
+        "AI.PA": get_history(calendars["paris"], seed=3, last_move=-0.2),
+        "ASML.AS": get_history(calendars["paris"][:-3], seed=4),
+        "MC.PA": get_history(calendars["paris"], seed=5, last_move=0.2),
+    }
+
+
+class PriceCache(object):
+    def __init__(self, histories):
+        self.histories = histories
+
+    def get_history(self, ticker, interval="1d", start="2018-01-01"):
+        return self.histories[ticker]
+
+
+def test_screen_mixed_calendars():
+    histories = _get_histories()
+    panel = Panel.from_histories(histories)
+    for name in conditions.CONDITIONS:
+        table = conditions.screen(panel, [name])
+        alone = [
+            ticker
+            for ticker, data in histories.items()
+            if len(
+                conditions.screen(Panel.from_histories({ticker: data}), [name])
+            )
+        ]
+        assert list(table.index) == alone, name
+    # The moves of the last closes are seen whatever the calendar
+    for name, expected in (
+        ("Close below the lower Bollinger band", ["AAPL", "AI.PA"]),
+        ("Close above the upper Bollinger band", ["MSFT", "MC.PA"]),
+    ):
+        assert list(conditions.screen(panel, [name]).index) == expected
+
+
+def test_screener_chunk_mixed_calendars():
+    pytest.importorskip("PySide2")
+    from libs.screener import Screener
+
+    histories = _get_histories()
+    screener = Screener(price_cache=PriceCache(histories))
+    matches = []
+    screener.signals.sig_screener_chunk_screened.connect(
+        lambda generation, count, chunk: matches.append(chunk)
+    )
+    for name in conditions.CONDITIONS:
+        matches.clear()
+        screener._screen(
+            screener._generation, list(histories), [name], "2018-01-01"
+        )
+        for ticker in histories:
+            screener._screen(
+                screener._generation, [ticker], [name], "2018-01-01"
+            )
+        chunk = [match["ticker"] for match in matches[0]]
+        alone = [match["ticker"] for found in matches[1:] for match in found]
+        assert chunk == alone, name
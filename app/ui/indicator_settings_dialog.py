@@ -44,6 +44,39 @@ class Ui_IndicatorSettingsDialogWindow(object):
         self.verticalLayout_2.addWidget(self.lst_styles)
 
         self.tab_settings.addTab(self.wgt_settings_styles, "")
+        self.wgt_settings_optimization = QWidget()
+        self.wgt_settings_optimization.setObjectName(
+            u"wgt_settings_optimization"
+        )
+        self.verticalLayout_4 = QVBoxLayout(self.wgt_settings_optimization)
+        self.verticalLayout_4.setObjectName(u"verticalLayout_4")
+        self.horizontalLayout_2 = QHBoxLayout()
+        self.horizontalLayout_2.setObjectName(u"horizontalLayout_2")
+        self.lab_optimization = QLabel(self.wgt_settings_optimization)
+        self.lab_optimization.setObjectName(u"lab_optimization")
+
+        self.horizontalLayout_2.addWidget(self.lab_optimization)
+
+        self.pub_optimize = QPushButton(self.wgt_settings_optimization)
+        self.pub_optimize.setObjectName(u"pub_optimize")
+
+        self.horizontalLayout_2.addWidget(self.pub_optimize)
+
+        self.verticalLayout_4.addLayout(self.horizontalLayout_2)
+
+        self.tbw_optimization = QTableWidget(self.wgt_settings_optimization)
+        self.tbw_optimization.setObjectName(u"tbw_optimization")
+        self.tbw_optimization.setEditTriggers(
+            QAbstractItemView.NoEditTriggers
+        )
+        self.tbw_optimization.setSelectionBehavior(
+            QAbstractItemView.SelectRows
+        )
+        self.tbw_optimization.verticalHeader().setVisible(False)
+
+        self.verticalLayout_4.addWidget(self.tbw_optimization)
+
+        self.tab_settings.addTab(self.wgt_settings_optimization, "")
 
         self.verticalLayout.addWidget(self.tab_settings)
 
@@ -102,6 +135,24 @@ class Ui_IndicatorSettingsDialogWindow(object):
                 "IndicatorSettingsDialogWindow", u"Style", None
             ),
         )
+        self.lab_optimization.setText(
+            QCoreApplication.translate(
+                "IndicatorSettingsDialogWindow",
+                u"Backtest the strategy around the current values",
+                None,
+            )
+        )
+        self.pub_optimize.setText(
+            QCoreApplication.translate(
+                "IndicatorSettingsDialogWindow", u"Optimize", None
+            )
+        )
+        self.tab_settings.setTabText(
+            self.tab_settings.indexOf(self.wgt_settings_optimization),
+            QCoreApplication.translate(
+                "IndicatorSettingsDialogWindow", u"Optimization", None
+            ),
+        )
         self.pub_reset.setText(
             QCoreApplication.translate(
                 "IndicatorSettingsDialogWindow", u"Reset values", None
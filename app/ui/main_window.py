@@ -32,6 +32,14 @@ class Ui_MainWindow(object):
         self.action_reload_indicators.setObjectName(
             u"action_reload_indicators"
         )
+        self.action_live_mode = QAction(MainWindow)
+        self.action_live_mode.setObjectName(u"action_live_mode")
+        self.action_live_mode.setCheckable(True)
+        self.action_screener = QAction(MainWindow)
+        self.action_screener.setObjectName(u"action_screener")
+        self.action_sandbox = QAction(MainWindow)
+        self.action_sandbox.setObjectName(u"action_sandbox")
+        self.action_sandbox.setCheckable(True)
         self.centralwidget = QWidget(MainWindow)
         self.centralwidget.setObjectName(u"centralwidget")
         self.verticalLayout = QVBoxLayout(self.centralwidget)
@@ -143,6 +151,9 @@ class Ui_MainWindow(object):
 
         self.menubar.addAction(self.menuOptions.menuAction())
         self.menuOptions.addAction(self.action_reload_indicators)
+        self.menuOptions.addAction(self.action_live_mode)
+        self.menuOptions.addAction(self.action_screener)
+        self.menuOptions.addAction(self.action_sandbox)
 
         self.retranslateUi(MainWindow)
 
@@ -161,6 +172,17 @@ class Ui_MainWindow(object):
                 "MainWindow", u"Reload Indicators", None
             )
         )
+        self.action_live_mode.setText(
+            QCoreApplication.translate("MainWindow", u"Live Mode", None)
+        )
+        self.action_screener.setText(
+            QCoreApplication.translate("MainWindow", u"Screener", None)
+        )
+        self.action_sandbox.setText(
+            QCoreApplication.translate(
+                "MainWindow", u"Compute Indicators In Processes", None
+            )
+        )
         self.pub_go_welcome.setText("")
         self.pub_go_graph.setText("")
         self.menuOptions.setTitle(
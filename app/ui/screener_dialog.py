@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'screener_dialog.ui'
+##
+## Created by: Qt User Interface Compiler version 5.15.2
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide2.QtCore import *
+from PySide2.QtGui import *
+from PySide2.QtWidgets import *
+
+from libs.widgets.tablewidget import TableWidget
+
+import resources_rc
+
+
+class Ui_ScreenerDialogWindow(object):
+    def setupUi(self, ScreenerDialogWindow):
+        if not ScreenerDialogWindow.objectName():
+            ScreenerDialogWindow.setObjectName("ScreenerDialogWindow")
+        ScreenerDialogWindow.resize(500, 500)
+        self.verticalLayout = QVBoxLayout(ScreenerDialogWindow)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontalLayout = QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.label = QLabel(ScreenerDialogWindow)
+        self.label.setObjectName("label")
+
+        self.horizontalLayout.addWidget(self.label)
+
+        self.horizontalSpacer = QSpacerItem(
+            40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum
+        )
+
+        self.horizontalLayout.addItem(self.horizontalSpacer)
+
+        self.pub_close = QPushButton(ScreenerDialogWindow)
+        self.pub_close.setObjectName("pub_close")
+        self.pub_close.setMinimumSize(QSize(24, 24))
+        self.pub_close.setMaximumSize(QSize(24, 24))
+        self.pub_close.setCursor(QCursor(Qt.PointingHandCursor))
+        icon = QIcon()
+        icon.addFile(":/svg/times.svg", QSize(), QIcon.Normal, QIcon.Off)
+        self.pub_close.setIcon(icon)
+        self.pub_close.setFlat(True)
+
+        self.horizontalLayout.addWidget(self.pub_close)
+
+        self.verticalLayout.addLayout(self.horizontalLayout)
+
+        self.horizontalLayout_2 = QHBoxLayout()
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.lie_filter = QLineEdit(ScreenerDialogWindow)
+        self.lie_filter.setObjectName("lie_filter")
+
+        self.horizontalLayout_2.addWidget(self.lie_filter)
+
+        self.pub_start = QPushButton(ScreenerDialogWindow)
+        self.pub_start.setObjectName("pub_start")
+        self.pub_start.setCursor(QCursor(Qt.PointingHandCursor))
+
+        self.horizontalLayout_2.addWidget(self.pub_start)
+
+        self.verticalLayout.addLayout(self.horizontalLayout_2)
+
+        self.lsw_conditions = QListWidget(ScreenerDialogWindow)
+        self.lsw_conditions.setObjectName("lsw_conditions")
+        self.lsw_conditions.setMaximumSize(QSize(16777215, 120))
+
+        self.verticalLayout.addWidget(self.lsw_conditions)
+
+        self.prb_progress = QProgressBar(ScreenerDialogWindow)
+        self.prb_progress.setObjectName("prb_progress")
+        self.prb_progress.setValue(0)
+
+        self.verticalLayout.addWidget(self.prb_progress)
+
+        self.tbw_results = TableWidget(ScreenerDialogWindow)
+        if self.tbw_results.columnCount() < 4:
+            self.tbw_results.setColumnCount(4)
+        __qtablewidgetitem = QTableWidgetItem()
+        self.tbw_results.setHorizontalHeaderItem(0, __qtablewidgetitem)
+        __qtablewidgetitem1 = QTableWidgetItem()
+        self.tbw_results.setHorizontalHeaderItem(1, __qtablewidgetitem1)
+        __qtablewidgetitem2 = QTableWidgetItem()
+        self.tbw_results.setHorizontalHeaderItem(2, __qtablewidgetitem2)
+        __qtablewidgetitem3 = QTableWidgetItem()
+        self.tbw_results.setHorizontalHeaderItem(3, __qtablewidgetitem3)
+        self.tbw_results.setObjectName("tbw_results")
+        self.tbw_results.viewport().setProperty(
+            "cursor", QCursor(Qt.PointingHandCursor)
+        )
+        self.tbw_results.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tbw_results.setAlternatingRowColors(True)
+        self.tbw_results.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tbw_results.horizontalHeader().setStretchLastSection(True)
+        self.tbw_results.verticalHeader().setVisible(False)
+
+        self.verticalLayout.addWidget(self.tbw_results)
+
+        self.retranslateUi(ScreenerDialogWindow)
+
+        QMetaObject.connectSlotsByName(ScreenerDialogWindow)
+
+    # setupUi
+
+    def retranslateUi(self, ScreenerDialogWindow):
+        ScreenerDialogWindow.setWindowTitle(
+            QCoreApplication.translate(
+                "ScreenerDialogWindow", "Screener", None
+            )
+        )
+        self.label.setText(
+            QCoreApplication.translate(
+                "ScreenerDialogWindow", "Screener", None
+            )
+        )
+        self.pub_close.setText("")
+        self.lie_filter.setPlaceholderText(
+            QCoreApplication.translate(
+                "ScreenerDialogWindow", "Filter tickers or companies", None
+            )
+        )
+        self.pub_start.setText(
+            QCoreApplication.translate("ScreenerDialogWindow", "Start", None)
+        )
+        self.prb_progress.setFormat(
+            QCoreApplication.translate("ScreenerDialogWindow", "%v / %m", None)
+        )
+        ___qtablewidgetitem = self.tbw_results.horizontalHeaderItem(0)
+        ___qtablewidgetitem.setText(
+            QCoreApplication.translate("ScreenerDialogWindow", "Ticker", None)
+        )
+        ___qtablewidgetitem1 = self.tbw_results.horizontalHeaderItem(1)
+        ___qtablewidgetitem1.setText(
+            QCoreApplication.translate("ScreenerDialogWindow", "Company", None)
+        )
+        ___qtablewidgetitem2 = self.tbw_results.horizontalHeaderItem(2)
+        ___qtablewidgetitem2.setText(
+            QCoreApplication.translate("ScreenerDialogWindow", "Date", None)
+        )
+        ___qtablewidgetitem3 = self.tbw_results.horizontalHeaderItem(3)
+        ___qtablewidgetitem3.setText(
+            QCoreApplication.translate("ScreenerDialogWindow", "Close", None)
+        )
+
+    # retranslateUi
@@ -1,3 +1,4 @@
+import numpy as np
 from PySide2 import QtCore, QtGui
 
 
@@ -252,12 +253,29 @@ class InputField(Field):
 class Indicator(object):
     """Base class that each indicator must inherit from. Within this class
     you must define the methods that all of your plugins must implement
+
+    An indicator can split its work in two: compute, which only takes the
+    arrays of the quotation and the values of the fields and returns arrays,
+    so it can run in another process (see libs.sandbox), and render, which
+    draws the results in the graph. An indicator which keeps a rolling state
+    can also implement compute_update, which continues its last results
+    with the new bars of the quotation.
     """
 
+    # The columns of the quotation given to compute
+    inputs = ("Open", "High", "Low", "Close")
+
     def __init__(self):
         self.name = "Indicator"
         self.description = "Indicator description"
         self.enabled = False
+        # The strategy of the indicator (see libs.engine.strategies) and its
+        # parameters, as {attribute name of the field: name of the parameter}
+        self.strategy_name = None
+        self.strategy_fields = {}
+
+        # The results of compute which are rendered, see set_results
+        self.results = None
 
         self._fields = []
         self._plots = []
@@ -313,17 +331,304 @@ class Indicator(object):
         for arg in args:
             self.register_plot(plot=arg)
 
+    @property
+    def computed(self) -> bool:
+        """Return True if the indicator implements compute and render
+
+        :return: The indicator has a compute step
+        :rtype: bool
+        """
+        return type(self).compute.__func__ is not Indicator.compute.__func__
+
+    @property
+    def updatable(self) -> bool:
+        """Return True if the indicator implements compute_update
+
+        :return: The indicator can continue its results
+        :rtype: bool
+        """
+        return (
+            type(self).compute_update.__func__
+            is not Indicator.compute_update.__func__
+        )
+
+    def can_update(self, start: int) -> bool:
+        """Check if the rendered results can be continued after the bars
+        of the quotation changed from the position
+
+        :param start: The position of the first changed bar
+        :type start: int
+        :return: True if compute_update can be used
+        :rtype: bool
+        """
+        return (
+            self.updatable
+            and self.results is not None
+            and start >= self.results["committed"]
+        )
+
+    @classmethod
+    def compute(cls, values: dict, parameters: dict) -> dict:
+        """The method that plugins with a compute step implement. It must
+        only use its arguments, it is called in another process by the
+        sandbox.
+
+        :param values: The columns of the quotation listed in inputs
+        :type values: dict of np.array
+        :param parameters: The values of the fields (see parameters)
+        :type parameters: dict
+        :return: The results drawn by render
+        :rtype: dict of np.array
+        """
+        return None
+
+    @classmethod
+    def compute_update(
+        cls, values: dict, parameters: dict, previous: dict
+    ) -> dict:
+        """The method that plugins with a rolling state implement. It
+        continues the results of a previous compute with the bars from the
+        position previous["committed"], the bars before it are in the states
+        kept in the results. Like compute, it must only use its arguments
+        and it must not modify the previous results.
+
+        :param values: The columns listed in inputs, from the committed
+        position
+        :type values: dict of np.array
+        :param parameters: The values of the fields (see parameters)
+        :type parameters: dict
+        :param previous: The results of the previous compute, with the
+        number of bars kept in their states under "committed"
+        :type previous: dict
+        :return: The results of all bars, drawn by render
+        :rtype: dict
+        """
+        return None
+
+    def parameters(self) -> dict:
+        """Return the values of the fields given to compute
+
+        :return: The value of each field, by attribute name
+        :rtype: dict
+        """
+        parameters = {}
+        for field in self._fields:
+            if isinstance(field, ChoiceField):
+                parameters[field.attribute_name] = field.current
+            elif field.value is not None:
+                parameters[field.attribute_name] = field.value
+        return parameters
+
+    def get_inputs(self, graph_view, start=0) -> dict:
+        """Return a copy of the columns of the quotation given to compute,
+        the quotation can change while they are computed in another thread
+
+        :param graph_view: The graph view
+        :type graph_view: GraphView
+        :param start: The position of the first bar, defaults to 0
+        :type start: int, optional
+        :return: The columns listed in inputs
+        :rtype: dict of np.array
+        """
+        return {
+            column: np.array(graph_view.dataset[column][start:], dtype=float)
+            for column in self.inputs
+        }
+
+    def set_results(self, graph_view, results: dict):
+        """Keep the results of compute and render them, it is called in the
+        GUI thread
+
+        :param graph_view: The graph view
+        :type graph_view: GraphView
+        :param results: The results of compute
+        :type results: dict
+        """
+        self.results = results
+        self.render(graph_view, results)
+
+    def render(self, graph_view, results: dict):
+        """The method that plugins with a compute step implement. It draws
+        the results of compute, it is called in the GUI thread. The plugins
+        with compute_update are not removed before their next results are
+        rendered, their plots are updated with setData.
+
+        :param graph_view: The graph view
+        :type graph_view: GraphView
+        :param results: The results of compute
+        :type results: dict of np.array
+        """
+        pass
+
     def create_indicator(self, graph_view, *args, **kwargs):
         """The method that we expect all plugins to implement. This is the
-        method that our framework will call to draw the indicator
+        method that our framework will call to draw the indicator. The
+        plugins with a compute step are computed and rendered here.
         """
         self.enabled = True
+        if not self.computed:
+            return
+        results = self.compute(self.get_inputs(graph_view), self.parameters())
+        self.set_results(graph_view, results)
+
+    def update_indicator(self, graph_view, start: int, *args, **kwargs):
+        """The method that our framework will call when bars have been
+        appended to the quotation, or when its last bars changed. By default
+        the indicator is removed and created again. The plugins with a
+        compute step are not updated here, see compute_update.
+
+        :param graph_view: The graph view
+        :type graph_view: GraphView
+        :param start: The position of the first changed bar
+        :type start: int
+        """
+        self.remove_indicator(graph_view)
+        self.create_indicator(graph_view)
+
+    def strategy(self, values):
+        """Return the entries and exits of the strategy with the current
+        settings of the indicator. By default the registered strategy named
+        strategy_name is used, plugins can override it.
+
+        :param values: The values, with a Close column
+        :type values: pd.DataFrame or Dataset
+        :return: The entries and the exits, None if the indicator has no
+        strategy
+        :rtype: tuple (np.array of bool, np.array of bool)
+        """
+        if not self.strategy_name:
+            return None
+        # The engine is only imported by the indicators with a strategy
+        from libs.engine import strategies
+
+        return strategies.get_signals(
+            self.strategy_name, values, **self.get_strategy_parameters()
+        )
+
+    def get_strategy_parameters(self) -> dict:
+        """Return the parameters of the strategy from the fields
+
+        :return: The value of each parameter
+        :rtype: dict
+        """
+        return {
+            parameter: self.get_field(attribute_name).value
+            for attribute_name, parameter in self.strategy_fields.items()
+        }
+
+    def set_strategy_parameters(self, parameters: dict):
+        """Set the fields from parameters of the strategy
+
+        :param parameters: The value of each parameter, the unknown ones are
+        ignored
+        :type parameters: dict
+        """
+        for attribute_name, parameter in self.strategy_fields.items():
+            if parameter not in parameters:
+                continue
+            field = self.get_field(attribute_name)
+            field.set_value(field.value_type(parameters[parameter]))
+
+    def get_search_space(self) -> dict:
+        """Return the values tried for each parameter of the strategy by the
+        optimization, from half to twice the current value of its field
+
+        :return: The values of each parameter
+        :rtype: dict of list
+        """
+        space = {}
+        for attribute_name, parameter in self.strategy_fields.items():
+            value = int(self.get_field(attribute_name).value)
+            space[parameter] = list(range(max(2, value // 2), value * 2 + 1))
+        return space
+
+    def optimize(
+        self,
+        values,
+        space=None,
+        method="grid",
+        count=1000,
+        metric="sharpe",
+        max_workers=None,
+        apply=True,
+    ):
+        """Backtest the strategy of the indicator with each combination of
+        parameters (see libs.engine.optimizer)
+
+        :param values: The values, with a Close column
+        :type values: pd.DataFrame or Dataset
+        :param space: The values to try for each parameter, defaults to None
+        (see get_search_space)
+        :type space: dict of list, optional
+        :param method: "grid" or "random", defaults to "grid"
+        :type method: str, optional
+        :param count: The number of combinations of the random search,
+        defaults to 1000
+        :type count: int, optional
+        :param metric: The statistic used to rank the combinations, defaults
+        to "sharpe"
+        :type metric: str, optional
+        :param max_workers: The number of processes, defaults to None
+        :type max_workers: int, optional
+        :param apply: Set the fields to the best combination, defaults to
+        True
+        :type apply: bool, optional
+        :return: The combinations ranked by the metric, None if the indicator
+        has no strategy
+        :rtype: pd.DataFrame
+        """
+        if not self.strategy_name:
+            return None
+        from libs.engine import optimizer
+
+        table = optimizer.optimize(
+            self.strategy_name,
+            values,
+            space or self.get_search_space(),
+            method=method,
+            count=count,
+            metric=metric,
+            max_workers=max_workers,
+        )
+        if apply and not table.empty:
+            self.set_strategy_parameters(table.iloc[0].to_dict())
+        return table
+
+    def backtest(self, values, fees=0.001, short=False, index=None):
+        """Backtest the strategy of the indicator on the values
+
+        :param values: The values, with a Close column
+        :type values: pd.DataFrame or Dataset
+        :param fees: The fees of a trade, as a fraction of its amount,
+        defaults to 0.001
+        :type fees: float, optional
+        :param short: Go short on exits, defaults to False
+        :type short: bool, optional
+        :param index: The dates of the bars, defaults to None
+        :type index: pd.DatetimeIndex, optional
+        :return: The result of the backtest, None if the indicator has no
+        strategy
+        :rtype: BacktestResult
+        """
+        signals = self.strategy(values)
+        if signals is None:
+            return None
+        entries, exits = signals
+        from libs.engine.backtest import backtest, get_positions
+
+        return backtest(
+            np.asarray(values["Close"], dtype=float),
+            get_positions(entries, exits, short=short),
+            fees=fees,
+            index=index,
+        )
 
     def remove_indicator(self, graph_view, *args, **kwargs):
         """The method that we expect all plugins to implement. This is the
         method that our framework will call to remove the indicator
         """
         self.enabled = False
+        self.results = None
         if not self._plots:
             return
         # Remove all plots
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+from scipy import signal
+
+
+class EwmState(object):
+    """Streaming exponentially weighted mean.
+
+    The result is the same as pd.Series.ewm(...).mean() (adjust=True,
+    ignore_na=False) computed on all values seen by the state, but values
+    can be given in several chunks: the state keeps the weighted sums of the
+    values and of the weights, NaN values only make the weights decay.
+
+    The values may have several dimensions (e.g. tickers x time), the mean
+    is computed along the last axis.
+    """
+
+    def __init__(self, com=None, span=None, alpha=None):
+        """Create the state, one of com, span or alpha must be given
+
+        :param com: The center of mass, alpha = 1 / (1 + com)
+        :type com: float, optional
+        :param span: The span, alpha = 2 / (span + 1)
+        :type span: float, optional
+        :param alpha: The smoothing factor
+        :type alpha: float, optional
+        :raises ValueError: If no parameter is given
+        """
+        if alpha is None and com is not None:
+            alpha = 1.0 / (1.0 + com)
+        if alpha is None and span is not None:
+            alpha = 2.0 / (span + 1.0)
+        if alpha is None:
+            raise ValueError("One of com, span or alpha must be given")
+
+        # Constants
+        self.alpha = alpha
+        self._numerator = 0.0
+        self._denominator = 0.0
+
+    def update(self, values, commit=None) -> np.ndarray:
+        """Compute the mean for the given values, which follow the values
+        already seen
+
+        :param values: The new values
+        :type values: np.array
+        :param commit: The number of values kept in the state, the next
+        values are computed but will be given again, defaults to all
+        :type commit: int, optional
+        :return: The mean at each new value
+        :rtype: np.array
+        """
+        values = np.asarray(values, dtype=float)
+        length = values.shape[-1] if values.ndim else 0
+        if commit is None:
+            commit = length
+        if not length:
+            return values
+
+        decay = 1.0 - self.alpha
+        shape = values.shape[:-1]
+        valid = ~np.isnan(values)
+        if valid.all():
+            # Without NaN, the sum of the weights has a closed form, it
+            # reaches 1 / alpha once the decay of the first weight is below
+            # the float precision
+            head = length
+            if 0.0 < decay < 1.0:
+                head = min(head, int(np.log(1e-18) / np.log(decay)) + 1)
+            powers = decay ** np.arange(1, head + 1)
+            denominator = np.full(values.shape, 1.0 / self.alpha)
+            denominator[..., :head] = (
+                np.expand_dims(self._denominator, -1) * powers
+                + (1.0 - powers) / self.alpha
+            )
+        else:
+            values = np.where(valid, values, 0.0)
+            denominator, _ = signal.lfilter(
+                [1.0],
+                [1.0, -decay],
+                valid.astype(float),
+                zi=self._get_zi(self._denominator, decay, shape),
+            )
+        numerator, _ = signal.lfilter(
+            [1.0],
+            [1.0, -decay],
+            values,
+            zi=self._get_zi(self._numerator, decay, shape),
+        )
+        if commit > 0:
+            self._numerator = numerator[..., commit - 1]
+            self._denominator = denominator[..., commit - 1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = numerator / denominator
+        mean[denominator == 0] = np.nan
+        return mean
+
+    @staticmethod
+    def _get_zi(total, decay, shape) -> np.ndarray:
+        """Return the initial conditions of lfilter for a kept sum
+
+        :param total: The kept sum, a scalar or one per row of values
+        :type total: float or np.array
+        :param decay: The decay of the weights
+        :type decay: float
+        :param shape: The shape of the values without their last axis
+        :type shape: tuple
+        :return: The initial conditions
+        :rtype: np.array
+        """
+        return (decay * np.broadcast_to(total, shape))[..., None]
+
+
+def ema(values, com=None, span=None, alpha=None) -> np.ndarray:
+    """Exponential moving average computed recursively, in O(n). Use an
+    EwmState to continue it when new values arrive.
+
+    :param values: The values
+    :type values: np.array
+    :param com: The center of mass, alpha = 1 / (1 + com)
+    :type com: float, optional
+    :param span: The span, alpha = 2 / (span + 1)
+    :type span: float, optional
+    :param alpha: The smoothing factor
+    :type alpha: float, optional
+    :return: The moving average
+    :rtype: np.array
+    """
+    return EwmState(com=com, span=span, alpha=alpha).update(values)
+
+
+class RollingWindowState(object):
+    """Streaming rolling mean and standard deviation.
+
+    The result is the same as pd.Series.rolling(window) computed on all
+    values seen by the state, only the last values of the window are kept
+    between two chunks.
+    """
+
+    def __init__(self, window):
+        """Create the state
+
+        :param window: The length of the window
+        :type window: int
+        """
+        # Constants
+        self.window = window
+        self._tail = np.empty(0)
+
+    def update(self, values, commit=None) -> tuple:
+        """Compute the rolling mean and standard deviation for the given
+        values, which follow the values already seen
+
+        :param values: The new values
+        :type values: np.array
+        :param commit: The number of values kept in the state, the next
+        values are computed but will be given again, defaults to all
+        :type commit: int, optional
+        :return: The mean and the standard deviation at each new value
+        :rtype: tuple (np.array, np.array)
+        """
+        values = np.asarray(values, dtype=float)
+        if commit is None:
+            commit = len(values)
+
+        data = np.concatenate((self._tail, values))
+        rolling = pd.Series(data).rolling(window=self.window)
+        mean = rolling.mean().to_numpy()[len(self._tail) :]
+        std = rolling.std().to_numpy()[len(self._tail) :]
+
+        if commit > 0:
+            kept = data[: len(self._tail) + commit]
+            self._tail = kept[max(len(kept) - self.window + 1, 0) :]
+        return mean, std
@@ -197,6 +197,22 @@ def convert_date_to_timestamp(data):
     return final
 
 
+def index_to_timestamps(index) -> np.ndarray:
+    """Convert a datetime index to epoch seconds, without creating a Python
+    object per date
+
+    :param index: The index to convert
+    :type index: pd.DatetimeIndex
+    :return: The epoch seconds
+    :rtype: np.array of float64
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert(None)
+    nanoseconds = index.to_numpy().astype("datetime64[ns]").view(np.int64)
+    return nanoseconds / 1e9
+
+
 def convert_timestamp_to_date(timestamp: int) -> object:
     """Convert a timestamp to a datetime object
 
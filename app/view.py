@@ -10,9 +10,14 @@ from resources.style import style
 from libs.events_handler import EventHandler
 from libs.tickers_dialog import TickersDialogWindow
 from libs.widgets.busywidget import BusyIndicator
-from libs.thread_pool import ThreadPool
 from libs.graph.candlestick import CandlestickItem
+from libs.indicator_computer import IndicatorComputer
 from libs.io.favorite_settings import FavoritesManager
+from libs.io.price_cache import PriceCache
+from libs.live_feed import LiveFeed
+from libs.sandbox import Sandbox
+from libs.scheduler import PRIORITY_PREFETCH, PRIORITY_VISIBLE, get_scheduler
+from libs.screener_dialog import ScreenerDialogWindow
 
 from ui import main_window
 
@@ -26,6 +31,8 @@ class MainWindow(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
     def __init__(self, parent=None, data=None):
         super(MainWindow, self).__init__(parent=parent)
 
+        # The widgets read the APP_HOME when they are created
+        self._init_app_home()
         self.setupUi(self)
         self.setWindowState(QtCore.Qt.WindowMaximized)
 
@@ -34,18 +41,29 @@ class MainWindow(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
         self.tool_bar.init_toolbar()
 
         # Load all components
-        self._init_app_home()
         self.tickers_dialog = TickersDialogWindow(parent=self, tickers=data)
         self.busy_indicator = BusyIndicator(parent=self)
-        self.thread_pool = ThreadPool()
+        self.scheduler = get_scheduler()
         self.signals = EventHandler()
         self.favorites_manager = FavoritesManager(parent=self)
+        self.price_cache = PriceCache()
+        self.live_feed = LiveFeed(parent=self)
+        self.sandbox = Sandbox(parent=self)
+        self.indicator_computer = IndicatorComputer(
+            parent=self, sandbox=self.sandbox, scheduler=self.scheduler
+        )
+        self.screener_dialog = ScreenerDialogWindow(
+            parent=self, tickers=data, price_cache=self.price_cache
+        )
 
         # Signals
         self.lie_ticker.mousePressEvent = self.tickers_dialog.show
         self.tickers_dialog.signal.sig_ticker_choosen.connect(
             self._on_ticker_selected
         )
+        self.screener_dialog.signal.sig_ticker_choosen.connect(
+            self._on_ticker_selected
+        )
         self.tickers_dialog.signal.sig_ticker_added_favorite.connect(
             self.favorites_manager._on_add_ticker_favorite
         )
@@ -71,18 +89,20 @@ class MainWindow(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
         self.signals.sig_ticker_articles_fetched.connect(
             self.wgt_articles.get_articles
         )
-        self.thread_pool.signals.sig_thread_pre.connect(
-            self.busy_indicator.show
-        )
-        self.thread_pool.signals.sig_thread_post.connect(
-            self.busy_indicator.hide
-        )
         self.wgt_indicators.signals.sig_indicator_switched.connect(
             self._on_indicator_switched
         )
         self.action_reload_indicators.triggered.connect(
             self.wgt_indicators.reload_indicators
         )
+        self.action_live_mode.toggled.connect(self._on_live_mode_toggled)
+        self.action_screener.triggered.connect(self.screener_dialog.show)
+        self.live_feed.signals.sig_live_bar_updated.connect(
+            self._on_live_bar_updated
+        )
+        self.indicator_computer.signals.sig_indicator_computed.connect(
+            self._on_indicator_computed
+        )
         self.tool_bar.signals.sig_action_triggered.connect(
             self._on_action_triggered
         )
@@ -92,6 +112,9 @@ class MainWindow(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
         self.favorites_manager.signals.sig_favorite_loaded.connect(
             self.tickers_dialog._on_favorite_loaded
         )
+        self.favorites_manager.signals.sig_favorite_loaded.connect(
+            self._on_favorite_loaded
+        )
 
         self.pub_go_welcome.clicked.connect(self.stw_main.slide_in_prev)
         self.pub_go_graph.clicked.connect(self.stw_main.slide_in_next)
@@ -110,12 +133,45 @@ class MainWindow(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
                 print(error)
         os.environ["APP_HOME"] = app_home
 
-    def _retrieve_data(self):
-        """Retrieve data from the API"""
-        ticker = yf.Ticker(self.lie_ticker.text())
-        self.signals.sig_ticker_infos_fetched.emit(ticker.info)
-        data = ticker.history(period="1y", interval="1d", start="2018-01-01")
-        self.signals.sig_ticker_data_fetched.emit(data)
+    def _retrieve_infos(self, ticker_name: str) -> dict:
+        """Retrieve the informations about the ticker from the API, called
+        from the scheduler
+
+        :param ticker_name: The name of the ticker
+        :type ticker_name: str
+        :return: The informations
+        :rtype: dict
+        """
+        return yf.Ticker(ticker_name).info
+
+    def _retrieve_history(self, ticker_name: str, priority: int, **kwargs):
+        """Retrieve the history of the ticker in the scheduler, it comes from
+        the local cache when it is available. The identical requests share
+        the same download.
+
+        :param ticker_name: The name of the ticker
+        :type ticker_name: str
+        :param priority: The priority of the download
+        :type priority: int
+        :return: The task of the download
+        :rtype: Task
+
+        kwargs parameters:
+
+        :param group: The group of the task
+        :type group: str
+        :param callback: Called with the history
+        :type callback: function
+        """
+        return self.scheduler.submit(
+            self.price_cache.get_history,
+            key=("history", ticker_name),
+            priority=priority,
+            ticker=ticker_name,
+            interval="1d",
+            start="2018-01-01",
+            **kwargs
+        )
 
     @QtCore.Slot(object)
     def _on_process_ticker_data(self, data):
@@ -124,16 +180,107 @@ class MainWindow(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
         :param data: The data of the ticker
         :type data: panda dataframe
         """
-        self.wgt_graph.graph.plot_quotation(data)
+        graph = self.wgt_graph.graph
+        # Only the new bars are computed when the data extends the plotted
+        # quotation
+        start = graph.update_quotation(data)
+        if start is not None:
+            self._update_indicators(start=start)
+        else:
+            graph.plot_quotation(data)
+            for indicator in self.wgt_indicators.indicators:
+                if not indicator.enabled:
+                    continue
+                # Remove indicator
+                indicator.remove_indicator(graph_view=graph)
+                # Re create indicator
+                self._create_indicator(indicator)
+        if self.action_live_mode.isChecked():
+            self.live_feed.start(ticker=self.lie_ticker.text())
+        if self.stw_main.currentIndex() == 0:
+            self.stw_main.slide_in_next()
+
+    def _update_indicators(self, start: int):
+        """Update all enabled indicators after a change of the quotation
+
+        :param start: The position of the first changed bar
+        :type start: int
+        """
         for indicator in self.wgt_indicators.indicators:
             if not indicator.enabled:
                 continue
-            # Remove indicator
-            indicator.remove_indicator(graph_view=self.wgt_graph.graph)
-            # Re create indicator
-            indicator.create_indicator(graph_view=self.wgt_graph.graph)
-        if self.stw_main.currentIndex() == 0:
-            self.stw_main.slide_in_next()
+            if indicator.computed:
+                # The indicators with compute_update keep their plots, they
+                # are updated when the next results are rendered
+                if not indicator.updatable:
+                    indicator.remove_indicator(graph_view=self.wgt_graph.graph)
+                self._create_indicator(indicator, start=start)
+                continue
+            indicator.update_indicator(
+                graph_view=self.wgt_graph.graph, start=start
+            )
+
+    def _create_indicator(self, indicator, start=None):
+        """Draw the indicator, the indicators with a compute step are
+        computed out of the GUI thread (in the sandbox when it is enabled)
+        and drawn when their results are available
+
+        :param indicator: The indicator
+        :type indicator: Indicator
+        :param start: The position of the first changed bar of the
+        quotation, defaults to None (all bars are computed)
+        :type start: int, optional
+        """
+        graph = self.wgt_graph.graph
+        if not indicator.computed:
+            indicator.create_indicator(graph_view=graph)
+            return
+        indicator.enabled = True
+        self.indicator_computer.compute(
+            indicator=indicator,
+            graph_view=graph,
+            sandboxed=self.action_sandbox.isChecked(),
+            start=start,
+        )
+
+    @QtCore.Slot(object, object)
+    def _on_indicator_computed(self, indicator, results: dict):
+        """Called when an indicator has been computed
+
+        :param indicator: The indicator
+        :type indicator: Indicator
+        :param results: The results of its compute
+        :type results: dict
+        """
+        # The indicator has been disabled during the compute
+        if not indicator.enabled:
+            return
+        indicator.set_results(graph_view=self.wgt_graph.graph, results=results)
+
+    @QtCore.Slot(bool)
+    def _on_live_mode_toggled(self, state: bool):
+        """Callback on live mode switched from the menu
+
+        :param state: True if the live mode is enabled
+        :type state: bool
+        """
+        if state and self.wgt_graph.graph.values is not None:
+            self.live_feed.start(ticker=self.lie_ticker.text())
+        else:
+            self.live_feed.stop()
+
+    @QtCore.Slot(object)
+    def _on_live_bar_updated(self, bar: dict):
+        """Called when the live feed has a new bar, only the last candle
+        and the last values of indicators are updated
+
+        :param bar: The bar of the last quote
+        :type bar: dict
+        """
+        start = self.wgt_graph.graph.update_last_bar(bar)
+        if start is None:
+            return
+        self._update_indicators(start=start)
 
     @QtCore.Slot(str)
     def _on_ticker_selected(self, ticker_name: str):
@@ -143,7 +290,54 @@ class MainWindow(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
         :type ticker_name: str
         """
         self.lie_ticker.setText(ticker_name)
-        self.thread_pool.execution(function=self._retrieve_data)
+        tasks = [
+            self.scheduler.submit(
+                self._retrieve_infos,
+                key=("infos", ticker_name),
+                priority=PRIORITY_VISIBLE,
+                group="ticker",
+                callback=self.signals.sig_ticker_infos_fetched.emit,
+                ticker_name=ticker_name,
+            ),
+            self._retrieve_history(
+                ticker_name=ticker_name,
+                priority=PRIORITY_VISIBLE,
+                group="ticker",
+                callback=self.signals.sig_ticker_data_fetched.emit,
+            ),
+        ]
+        # The downloads of the previous ticker are not wanted anymore
+        self.scheduler.cancel_group("ticker", keep=tasks)
+        for task in tasks:
+            task.add_done_callback(self._on_ticker_task_done)
+        self.busy_indicator.show()
+
+    def _on_ticker_task_done(self, task):
+        """Called when a download of the selected ticker is done, failed or
+        cancelled
+
+        :param task: The task of the download
+        :type task: Task
+        """
+        if not self.scheduler.tasks(group="ticker"):
+            self.busy_indicator.hide()
+
+    @QtCore.Slot(list)
+    def _on_favorite_loaded(self, favorites: list):
+        """Called when the favorites are loaded, their histories are
+        downloaded in the background so they are in the cache when they are
+        selected
+
+        :param favorites: The favorites
+        :type favorites: list of dict
+        """
+        for favorite in favorites:
+            if favorite.get("ticker"):
+                self._retrieve_history(
+                    ticker_name=favorite["ticker"],
+                    priority=PRIORITY_PREFETCH,
+                    group="prefetch",
+                )
 
     @QtCore.Slot(object, bool)
     def _on_indicator_switched(self, indicator: object, state: bool):
@@ -153,8 +347,9 @@ class MainWindow(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
         :type indicator: dict
         """
         if state:
-            indicator.create_indicator(graph_view=self.wgt_graph.graph)
+            self._create_indicator(indicator)
         else:
+            self.indicator_computer.cancel(indicator)
             indicator.remove_indicator(graph_view=self.wgt_graph.graph)
 
     @QtCore.Slot(str)
@@ -178,3 +373,5 @@ class MainWindow(QtWidgets.QMainWindow, main_window.Ui_MainWindow):
 
     def closeEvent(self, event):
         self.favorites_manager.save_favorites()
+        self.scheduler.clear()
+        self.sandbox.shutdown()